@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+투명도가 있는 UI 이미지용 무손실/팔레트 인코딩
+
+compress_image는 RGBA를 흰 배경에 합성해서 JPEG로 저장하므로,
+ui/continue_to.png 같은 투명 UI 조각에는 쓸 수 없다. 여기서는 투명도를
+유지하는 후보를 모두 만들어 보고 가장 작은 것을 고른다.
+
+    png8                팔레트(최대 256색) PNG, 디더링 선택 가능
+    png                 RGBA PNG, 최대 압축(compress_level=9 + optimize)
+    webp-lossless       WebP 무손실 (method=6)
+    webp-near-lossless  RGB 하위 비트를 반올림한 뒤 WebP 무손실
+
+Pillow는 WebP near-lossless 옵션을 노출하지 않으므로, libwebp의
+near-lossless 전처리처럼 색 채널 하위 비트를 미리 줄이고 무손실로 저장한다
+(알파 채널은 그대로 둔다).
+
+Pillow의 RGBA 팔레트 양자화(FASTOCTREE)는 디더링을 지원하지 않는다.
+알파가 0/255뿐인 이미지는 RGB를 디더링 양자화한 뒤 투명 인덱스를 따로 두고,
+반투명 픽셀이 있으면 디더링 없이 양자화한다.
+
+사용법:
+    from alpha_encode import encode_transparent, has_transparency
+
+    if has_transparency(img):
+        name, data, sizes = encode_transparent(img, colors=256, dither=True)
+"""
+
+import io
+
+from PIL import Image
+
+# 후보 이름 -> 확장자
+CANDIDATE_EXTENSIONS = {
+    'png8': 'png',
+    'png': 'png',
+    'webp-lossless': 'webp',
+    'webp-near-lossless': 'webp',
+}
+
+DEFAULT_CANDIDATES = tuple(CANDIDATE_EXTENSIONS)
+
+# near-lossless에서 반올림할 색 채널 하위 비트 수
+NEAR_LOSSLESS_BITS = 2
+
+
+def has_transparency(img):
+    """실제로 투명/반투명 픽셀이 있는지 확인 (알파 채널이 있어도 전부 불투명이면 False)"""
+    if img.mode == 'P' and 'transparency' in img.info:
+        img = img.convert('RGBA')
+    if img.mode not in ('RGBA', 'LA'):
+        return False
+    return img.getchannel('A').getextrema()[0] < 255
+
+
+def _save(img, fmt, **params):
+    buffer = io.BytesIO()
+    img.save(buffer, fmt, **params)
+    return buffer.getvalue()
+
+
+def _is_binary_alpha(alpha):
+    """알파가 0과 255로만 이루어졌는지 확인"""
+    histogram = alpha.histogram()
+    return sum(histogram[1:255]) == 0
+
+
+def quantize_rgba(img, colors=256, dither=True):
+    """
+    RGBA를 팔레트 이미지(P + transparency)로 양자화
+
+    알파가 0/255뿐이면 RGB를 디더링 양자화하고 투명 픽셀은 별도 인덱스로,
+    반투명 픽셀이 있으면 FASTOCTREE로 RGBA 팔레트를 만든다 (디더링 없음).
+    """
+    alpha = img.getchannel('A')
+    if not _is_binary_alpha(alpha):
+        return img.quantize(colors, method=Image.Quantize.FASTOCTREE)
+
+    rgb = img.convert('RGB')
+    palette_image = rgb.quantize(colors - 1, method=Image.Quantize.MEDIANCUT)
+    paletted = rgb.quantize(
+        palette=palette_image,
+        dither=Image.Dither.FLOYDSTEINBERG if dither else Image.Dither.NONE)
+
+    # 팔레트 끝에 투명 인덱스 하나 추가
+    palette = palette_image.getpalette()[:3 * (colors - 1)]
+    transparent_index = len(palette) // 3
+    paletted.putpalette(palette + [0, 0, 0])
+    paletted.paste(transparent_index, mask=alpha.point(lambda a: 255 if a == 0 else 0))
+    paletted.info['transparency'] = transparent_index
+    return paletted
+
+
+def near_lossless(img, bits=NEAR_LOSSLESS_BITS):
+    """색 채널 하위 bits비트를 반올림해서 없애기 (알파는 유지)"""
+    step = 1 << bits
+    table = [min(255, (value + step // 2) // step * step) for value in range(256)]
+    *colors, alpha = img.split()
+    return Image.merge(img.mode, [channel.point(table) for channel in colors] + [alpha])
+
+
+def encode_candidate(img, name, colors=256, dither=True):
+    """후보 하나 인코딩해서 bytes 반환"""
+    if name == 'png8':
+        # PNG 저장 시 info의 transparency가 tRNS로 기록됨
+        return _save(quantize_rgba(img, colors, dither), 'PNG', optimize=True)
+    if name == 'png':
+        return _save(img, 'PNG', optimize=True, compress_level=9)
+    if name == 'webp-lossless':
+        return _save(img, 'WEBP', lossless=True, quality=100, method=6)
+    if name == 'webp-near-lossless':
+        return _save(near_lossless(img), 'WEBP', lossless=True, quality=100, method=6)
+    raise ValueError(f"지원하지 않는 후보: {name}")
+
+
+def encode_transparent(img, colors=256, dither=True, candidates=DEFAULT_CANDIDATES):
+    """
+    투명도를 유지하는 후보를 모두 인코딩해서 가장 작은 것 선택
+
+    Args:
+        img: 투명도가 있는 이미지 (RGBA로 변환해서 사용)
+        colors: 팔레트 PNG 색 수 (2-256)
+        dither: 팔레트 양자화 시 디더링 여부
+        candidates: 시도할 후보 이름 목록
+
+    Returns:
+        (선택한 후보 이름, 인코딩된 bytes, {후보 이름: 바이트 수})
+    """
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')
+
+    encoded = {name: encode_candidate(img, name, colors, dither) for name in candidates}
+    best = min(encoded, key=lambda name: len(encoded[name]))
+    return best, encoded[best], {name: len(data) for name, data in encoded.items()}
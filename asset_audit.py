@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+로컬 에셋과 버킷 에셋의 용량 감사 보고서
+
+assets/images/와 assets/*.json이 가리키는 원격 이미지마다 아래 값을 계산하고,
+화면에 필요한 것보다 무거운 이미지를 예상 절약량 순으로 보여준다.
+
+    bytes              파일 크기
+    width, height      픽셀 크기
+    format, mode       실제 형식 (확장자가 아니라 파일 내용 기준)
+    decode_ms          전체 디코딩 시간 (draft 없이, 앱이 원본을 디코딩하는 비용)
+    display_pixels     화면 가로 display_width에 맞춰 표시될 때의 픽셀 수
+    bytes_per_pixel    bytes / display_pixels
+    estimated_bytes    표시 크기에서 기대하는 용량 (TARGET_BYTES_PER_PIXEL 기준)
+    estimated_savings  bytes - estimated_bytes (0 이상)
+
+보고서 JSON은 위치별로 정렬된 dict라서 릴리스마다 저장해 두고 diff하거나,
+--compare로 이전 보고서와 비교해서 커진/새로 생긴 에셋을 볼 수 있다.
+
+--unreferenced를 주면 참조된 URL이 있는 버킷 폴더의 나머지 객체도
+로컬 버킷 인덱스(bucket_index.py)에서 찾아 함께 검사한다.
+
+사용법:
+    python asset_audit.py --json reports/assets.json
+    python asset_audit.py --display-width 1440 --top 30
+    python asset_audit.py --json reports/new.json --compare reports/old.json
+"""
+
+import argparse
+import io
+import json
+import posixpath
+import time
+
+from PIL import Image
+
+from alpha_encode import has_transparency
+from asset_catalog import (DEFAULT_LOCAL_ROOT, DEFAULT_MANIFESTS, DEFAULT_WORKERS, display_name,
+                           load_references, map_assets, public_url, scan_local_assets,
+                           url_to_object)
+from bucket_index import DEFAULT_INDEX_PATH, get_objects, open_index
+
+# 기본 표시 가로 크기 (일반 휴대폰 전체 화면 가로 물리 픽셀)
+DEFAULT_DISPLAY_WIDTH = 1080
+
+# 표시 픽셀당 기대 용량 (bytes). 손실 압축 WebP/JPEG 품질 80 정도, 투명 이미지는 무손실 기준
+TARGET_BYTES_PER_PIXEL = 0.15
+TARGET_BYTES_PER_PIXEL_ALPHA = 0.6
+
+# 콘솔에 보여줄 상위 개수
+DEFAULT_TOP = 20
+
+
+def display_pixels(width, height, display_width=DEFAULT_DISPLAY_WIDTH):
+    """가로 display_width에 맞춰 표시될 때의 픽셀 수 (더 작으면 원래 크기)"""
+    if width <= display_width:
+        return width * height
+    return display_width * round(height * display_width / width)
+
+
+def measure_asset(location, data, display_width=DEFAULT_DISPLAY_WIDTH):
+    """이미지 bytes 하나의 감사 항목 (asset_catalog.map_assets의 handle)"""
+    with Image.open(io.BytesIO(data)) as img:
+        started = time.perf_counter()
+        img.load()
+        decode_ms = (time.perf_counter() - started) * 1000
+        width, height = img.size
+        transparent = has_transparency(img)
+        entry = {
+            'name': display_name(location),
+            'format': img.format,
+            'mode': img.mode,
+            'bytes': len(data),
+            'width': width,
+            'height': height,
+            'transparent': transparent,
+            'decode_ms': round(decode_ms, 1),
+        }
+
+    pixels = display_pixels(width, height, display_width)
+    target = TARGET_BYTES_PER_PIXEL_ALPHA if transparent else TARGET_BYTES_PER_PIXEL
+    estimated = int(pixels * target)
+    entry.update({
+        'display_pixels': pixels,
+        'bytes_per_pixel': round(len(data) / pixels, 3),
+        'oversize': round(width / display_width, 2),
+        'estimated_bytes': estimated,
+        'estimated_savings': max(0, len(data) - estimated),
+    })
+    return entry
+
+
+def unreferenced_urls(references, index_path=DEFAULT_INDEX_PATH):
+    """참조된 URL이 있는 버킷 폴더에서, 인덱스에만 있고 참조되지 않은 객체 URL 목록"""
+    folders = {}
+    referenced = set()
+    for url in references:
+        bucket_name, name = url_to_object(url)
+        if name:
+            folders.setdefault(bucket_name, set()).add(posixpath.dirname(name) + '/')
+            # URL 인코딩(%20 등)이 달라도 같은 객체로 보도록 객체 이름으로 비교
+            referenced.add((bucket_name, name))
+
+    conn = open_index(index_path)
+    try:
+        urls = []
+        for bucket_name, prefixes in folders.items():
+            for prefix in sorted(prefixes):
+                for name in get_objects(conn, prefix):
+                    # 하위 폴더는 그 폴더 prefix에서 따로 다룸
+                    if (bucket_name, name) not in referenced and '/' not in name[len(prefix):]:
+                        urls.append(public_url(bucket_name, name))
+        return urls
+    finally:
+        conn.close()
+
+
+def build_report(assets, references, display_width, errors):
+    """위치별 감사 항목을 보고서 dict로 (diff하기 쉽게 정렬)"""
+    for location, entry in assets.items():
+        entry['references'] = sorted(f"{manifest}:{group}"
+                                     for manifest, group in references.get(location, []))
+    return {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'display_width': display_width,
+        'total': {
+            'assets': len(assets),
+            'bytes': sum(entry['bytes'] for entry in assets.values()),
+            'estimated_savings': sum(entry['estimated_savings'] for entry in assets.values()),
+            'decode_ms': round(sum(entry['decode_ms'] for entry in assets.values()), 1),
+        },
+        'assets': {location: assets[location] for location in sorted(assets)},
+        'errors': {location: errors[location] for location in sorted(errors)},
+    }
+
+
+def print_report(report, top=DEFAULT_TOP):
+    """예상 절약량이 큰 순서로 출력"""
+    assets = report['assets']
+    ranked = sorted(assets.values(), key=lambda entry: -entry['estimated_savings'])
+
+    print(f"\n🏋️  절약 여지가 큰 에셋 (화면 가로 {report['display_width']}px 기준)")
+    print("=" * 80)
+    for index, entry in enumerate(ranked[:top], 1):
+        if not entry['estimated_savings']:
+            break
+        print(f"{index:3}. {entry['name']}")
+        print(f"     {entry['format']} {entry['width']}x{entry['height']}, "
+              f"{entry['bytes'] / 1024:.0f}KB, {entry['bytes_per_pixel']:.2f} B/px, "
+              f"디코딩 {entry['decode_ms']:.0f}ms -> 예상 절약 {entry['estimated_savings'] / 1024:.0f}KB")
+
+    formats = {}
+    for entry in assets.values():
+        count, size = formats.get(entry['format'], (0, 0))
+        formats[entry['format']] = (count + 1, size + entry['bytes'])
+    print("\n📦 형식별:")
+    for fmt, (count, size) in sorted(formats.items(), key=lambda item: -item[1][1]):
+        print(f"   {fmt}: {count}개, {size / 1024 / 1024:.1f}MB")
+
+    total = report['total']
+    print(f"\n📊 에셋 {total['assets']}개, {total['bytes'] / 1024 / 1024:.1f}MB, "
+          f"예상 절약 {total['estimated_savings'] / 1024 / 1024:.1f}MB, "
+          f"디코딩 합계 {total['decode_ms'] / 1000:.1f}s")
+    if report['errors']:
+        print(f"❌ 실패 {len(report['errors'])}개")
+
+
+def print_comparison(report, previous):
+    """이전 보고서와 비교해서 새로 생기거나 커진/작아진/사라진 에셋 출력"""
+    old, new = previous['assets'], report['assets']
+    added = sorted(set(new) - set(old))
+    removed = sorted(set(old) - set(new))
+    changed = sorted(
+        (new[location]['bytes'] - old[location]['bytes'], location)
+        for location in set(new) & set(old)
+        if new[location]['bytes'] != old[location]['bytes']
+    )
+
+    print(f"\n🔁 이전 보고서({previous['generated_at']})와 비교")
+    for location in added:
+        print(f"   ➕ {new[location]['name']} ({new[location]['bytes'] / 1024:.0f}KB)")
+    for location in removed:
+        print(f"   ➖ {old[location]['name']} ({old[location]['bytes'] / 1024:.0f}KB)")
+    for delta, location in sorted(changed, reverse=True):
+        print(f"   {'🔺' if delta > 0 else '🔻'} {new[location]['name']} ({delta / 1024:+.0f}KB)")
+    delta = report['total']['bytes'] - previous['total']['bytes']
+    print(f"   합계 {delta / 1024 / 1024:+.2f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬/버킷 에셋 용량 감사')
+    parser.add_argument('--manifests', default=DEFAULT_MANIFESTS,
+                        help=f'원격 URL 목록 JSON (기본값: {DEFAULT_MANIFESTS})')
+    parser.add_argument('--local', nargs='*', default=[DEFAULT_LOCAL_ROOT],
+                        help=f'로컬 에셋 폴더 (기본값: {DEFAULT_LOCAL_ROOT})')
+    parser.add_argument('--no-remote', action='store_true', help='원격 에셋은 검사하지 않음')
+    parser.add_argument('--unreferenced', action='store_true',
+                        help='참조된 버킷 폴더의 나머지 객체도 검사 (로컬 버킷 인덱스 사용)')
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH,
+                        help=f'버킷 인덱스 파일 (기본값: {DEFAULT_INDEX_PATH})')
+    parser.add_argument('--display-width', type=int, default=DEFAULT_DISPLAY_WIDTH,
+                        help=f'표시 가로 크기 (기본값: {DEFAULT_DISPLAY_WIDTH}px)')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP,
+                        help=f'출력할 상위 개수 (기본값: {DEFAULT_TOP})')
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'동시 다운로드/디코딩 수 (기본값: {DEFAULT_WORKERS})')
+    parser.add_argument('--json', help='보고서를 JSON으로 저장할 경로')
+    parser.add_argument('--compare', help='비교할 이전 보고서 JSON')
+    args = parser.parse_args()
+
+    started = time.time()
+    assets = {}
+    errors = {}
+    references = {}
+
+    def measure(location, data):
+        return measure_asset(location, data, args.display_width)
+
+    local_paths = [path for root in args.local for path in scan_local_assets(root)]
+    if local_paths:
+        print(f"📁 로컬 에셋 {len(local_paths)}개 검사 중...")
+        results, failed = map_assets(local_paths, measure, args.workers, remote=False)
+        assets.update(results)
+        errors.update(failed)
+
+    if not args.no_remote:
+        references = load_references(args.manifests)
+        urls = list(references)
+        if args.unreferenced:
+            extra = unreferenced_urls(references, args.index)
+            print(f"🗂️  참조되지 않은 버킷 객체 {len(extra)}개 추가")
+            urls += extra
+        print(f"🌐 원격 에셋 {len(urls)}개 내려받아 검사 중...")
+        results, failed = map_assets(urls, measure, args.workers)
+        assets.update(results)
+        errors.update(failed)
+
+    report = build_report(assets, references, args.display_width, errors)
+    print_report(report, args.top)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print_comparison(report, json.load(f))
+    print(f"⏱️  {time.time() - started:.1f}s")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"💾 보고서 저장됨: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
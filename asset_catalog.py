@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+로컬 에셋과 assets/*.json이 가리키는 원격 에셋 목록
+
+중복 탐지, 용량 감사처럼 "앱이 실제로 쓰는 이미지 전체"를 훑는 도구들이
+공통으로 사용한다. URL 목록 JSON({그룹: [url, ...]}, {폴더: {이름: url}} 등)을
+펼쳐서 URL마다 어느 파일의 어느 그룹에서 참조되는지 기록하고,
+원격 이미지는 스레드 풀로 동시에 내려받아 바로 처리한다.
+
+사용법:
+    from asset_catalog import load_references, map_assets, scan_local_assets
+
+    references = load_references()            # {url: [(manifest, group), ...]}
+    results, errors = map_assets(list(references), handle)  # handle(url, data) -> 결과
+"""
+
+import glob
+import json
+import os
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from urllib.parse import quote, unquote, urlparse
+
+from storage_retry import call_with_retry
+
+# 기본 URL 목록 파일
+DEFAULT_MANIFESTS = 'assets/*.json'
+
+# 기본 로컬 에셋 폴더
+DEFAULT_LOCAL_ROOT = 'assets/images'
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif')
+
+# 기본 동시 다운로드 수
+DEFAULT_WORKERS = 16
+
+# 다운로드 타임아웃(초)
+DOWNLOAD_TIMEOUT = 60
+
+PUBLIC_HOST = 'storage.googleapis.com'
+
+
+def walk_urls(value, group):
+    """중첩된 dict/list에서 (그룹 이름, url) 꺼내기"""
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield from walk_urls(child, f"{group}/{key}" if group else key)
+    elif isinstance(value, list):
+        for child in value:
+            yield from walk_urls(child, group)
+    elif isinstance(value, str) and value.startswith(('http://', 'https://')):
+        yield group, value
+
+
+def load_references(pattern=DEFAULT_MANIFESTS):
+    """
+    URL 목록 JSON 파일들을 읽어서 URL별 참조 위치 모으기
+
+    Returns:
+        {url: [(manifest 파일 경로, 그룹 이름), ...]}
+    """
+    references = {}
+    for manifest in sorted(glob.glob(pattern)):
+        with open(manifest, encoding='utf-8') as f:
+            data = json.load(f)
+        for group, url in walk_urls(data, ''):
+            references.setdefault(url, []).append((manifest, group))
+    return references
+
+
+def url_to_object(url):
+    """
+    공개 URL을 (버킷 이름, 객체 경로)로 변환
+
+    https://storage.googleapis.com/<버킷>/<경로> 형식이 아니면 (None, None)
+    """
+    parsed = urlparse(url)
+    if parsed.netloc != PUBLIC_HOST:
+        return None, None
+    bucket_name, _, name = parsed.path.lstrip('/').partition('/')
+    return bucket_name, unquote(name)
+
+
+def public_url(bucket_name, name):
+    """객체의 공개 URL (blob.public_url과 같은 인코딩)"""
+    return f"https://{PUBLIC_HOST}/{bucket_name}/{quote(name, safe='/~')}"
+
+
+def scan_local_assets(root=DEFAULT_LOCAL_ROOT):
+    """로컬 에셋 폴더의 이미지 파일 경로 목록"""
+    return sorted(
+        path for path in Path(root).rglob('*')
+        if path.is_file() and path.suffix.lower() in IMAGE_EXTENSIONS
+    )
+
+
+def _download(url):
+    with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+        return response.read()
+
+
+def download(url):
+    """URL 내용 전체를 내려받기 (429/5xx, 연결 오류는 재시도)"""
+    return call_with_retry(_download, url, op='download')
+
+
+def _run_remote(url, handle):
+    try:
+        return url, handle(url, download(url)), None
+    except Exception as e:
+        return url, None, str(e)
+
+
+def _run_local(path, handle):
+    try:
+        with open(path, 'rb') as f:
+            return str(path), handle(str(path), f.read()), None
+    except Exception as e:
+        return str(path), None, str(e)
+
+
+def map_assets(items, handle, workers=DEFAULT_WORKERS, remote=True):
+    """
+    에셋마다 내용을 읽어서 handle(위치, bytes)를 스레드 풀로 실행
+
+    내려받은 bytes는 handle이 끝나면 버려지므로 객체 수가 많아도
+    메모리에 전부 올리지 않는다.
+
+    Args:
+        items: URL 목록 (remote=True) 또는 로컬 경로 목록
+        handle: (위치, bytes) -> 결과
+        workers: 동시 작업 수
+
+    Returns:
+        {위치: 결과}, {위치: 오류 메시지}
+    """
+    run = _run_remote if remote else _run_local
+    results = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run, item, handle) for item in items]
+        for done, future in enumerate(as_completed(futures), 1):
+            location, result, error = future.result()
+            if error is None:
+                results[location] = result
+            else:
+                errors[location] = error
+                print(f"❌ {location}: {error}")
+            if done % 100 == 0:
+                print(f"   ... {done}/{len(futures)}")
+    return results, errors
+
+
+def display_name(location):
+    """보고서용 짧은 이름 (URL은 객체 경로, 로컬은 상대 경로)"""
+    _, name = url_to_object(location)
+    if name:
+        return name
+    if location.startswith(('http://', 'https://')):
+        return location
+    return os.path.relpath(location)
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+로컬 버킷 인덱스로 이미지 manifest 한 번에 만들기
+
+지금까지 URL 목록은 여러 곳에서 따로 만들어졌다.
+
+    image_urls.json              upload_new_images.py (images/ 바로 아래)
+    structured_image_urls.json   upload_structured_images.py (images/<폴더>/)
+    assets/*.json                카드/태그/운세 배경 URL 목록 (직접 관리)
+
+여기서는 로컬 버킷 인덱스(bucket_index.py)를 한 번 훑어서 위 두 설정 파일을
+다시 만들고, assets/*.json의 그룹까지 포함한 상세 manifest를 만든다.
+
+    assets/manifest/image_manifest.json
+    {
+      'bucket': ...,
+      'groups': {
+        'images/backgrounds': {'digest': ..., 'entries': [
+          {'name', 'path', 'url', 'bytes', 'width', 'height', 'md5',
+           'variants': [{'width', 'height', 'format', 'url', 'bytes'}],
+           'placeholder' (로컬 .placeholder.json이 있을 때)}, ...]},
+        'tag_image_urls/WoodEnergy': {...},
+      }
+    }
+
+크기/해상도가 manifest에 있으므로 앱은 HEAD 요청이나 getDownloadURL 없이
+레이아웃과 미리 받기를 할 수 있다.
+
+- 그룹마다 객체 이름/md5/generation으로 digest를 만들고, digest가 같은 그룹은
+  이전 manifest 내용을 그대로 둔다 (바뀐 그룹만 다시 계산)
+- 픽셀 크기는 인덱스 파일의 image_info 테이블에 md5와 함께 저장해서, 내용이
+  바뀐 객체만 확인한다. assets/ 아래 같은 파일(md5 일치)이 있으면 로컬에서 읽고,
+  없으면 앞부분만 Range 요청으로 받아 헤더에서 읽는다
+- compress_single_image.py --variants가 만든 <이름>_<가로>w.<확장자> 객체는
+  원본 항목의 variants로 들어간다
+- 내용 해시 이름(fingerprint.py)은 논리 이름마다 가장 최근 객체만 항목이 되고,
+  rewrite_fingerprinted_urls()는 assets/*.json의 URL을 새 해시 객체로 바꾼다
+
+사용법:
+    python asset_manifest.py
+    python asset_manifest.py --refresh        # 버킷 인덱스를 먼저 갱신
+    python asset_manifest.py --force          # 모든 그룹 다시 계산
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import posixpath
+import re
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+
+from asset_catalog import (DEFAULT_MANIFESTS, DEFAULT_WORKERS, DOWNLOAD_TIMEOUT, download,
+                           public_url, url_to_object, walk_urls)
+from bucket_index import DEFAULT_INDEX_PATH, get_objects, open_index, refresh_prefix
+from fingerprint import current_objects, logical_name
+from storage_retry import call_with_retry
+from storage_sync import file_md5_base64
+
+DEFAULT_BUCKET = 'innerfive.firebasestorage.app'
+
+# 상세 manifest (assets/*.json 패턴에 걸리지 않도록 하위 폴더)
+MANIFEST_PATH = 'assets/manifest/image_manifest.json'
+
+# 기존 설정 파일
+FLAT_CONFIG_PATH = 'image_urls.json'
+STRUCTURED_CONFIG_PATH = 'structured_image_urls.json'
+
+# 업로드 스크립트가 관리하는 prefix (이 아래 객체는 폴더 그룹이 됨)
+IMAGES_PREFIX = 'images/'
+
+# 로컬 에셋 폴더 (assets/images/... <-> images/...)
+LOCAL_ASSETS_ROOT = 'assets'
+
+# 픽셀 크기를 읽기 위해 받는 앞부분 크기
+PROBE_BYTES = 64 * 1024
+
+# compress_single_image.generate_variants 파일 이름 (<stem>_<width>w.<ext>)
+VARIANT_PATTERN = re.compile(r'^(?P<base>.+)_(?P<width>\d+)w\.(?P<ext>jpg|webp|avif)$')
+VARIANT_FORMATS = {'jpg': 'jpeg', 'webp': 'webp', 'avif': 'avif'}
+
+INFO_SCHEMA = """
+CREATE TABLE IF NOT EXISTS image_info (
+    name TEXT PRIMARY KEY,
+    md5 TEXT,
+    width INTEGER,
+    height INTEGER,
+    format TEXT
+);
+"""
+
+
+def object_stem(name):
+    """객체 이름에서 폴더, 확장자, 내용 해시를 뺀 이름"""
+    return posixpath.splitext(posixpath.basename(logical_name(name)))[0]
+
+
+def variant_key(name):
+    """변형을 원본에 연결하는 키 (논리 이름에서 확장자를 뺀 경로)"""
+    return posixpath.splitext(logical_name(name))[0]
+
+
+def split_variant(name):
+    """변형 객체면 (원본 이름(확장자 없음), 가로, 형식), 아니면 None"""
+    directory, filename = posixpath.split(logical_name(name))
+    match = VARIANT_PATTERN.match(filename)
+    if not match:
+        return None
+    return (posixpath.join(directory, match['base']), int(match['width']),
+            VARIANT_FORMATS[match['ext']])
+
+
+def collect_groups(objects, curated_pattern=DEFAULT_MANIFESTS):
+    """
+    인덱스 객체와 assets/*.json에서 그룹 목록 만들기
+
+    Returns:
+        ({그룹: [(항목 이름, 객체 이름 또는 None, URL), ...]},
+         {원본 이름(확장자 없음): [변형 객체 이름, ...]})
+    """
+    groups = {}
+    variants = {}
+    # 내용 해시 이름(fingerprint.py)은 논리 이름마다 가장 최근 객체만 사용
+    for logical, name in current_objects(objects).items():
+        variant = split_variant(logical)
+        if variant:
+            variants.setdefault(variant[0], []).append(name)
+            continue
+        if not logical.startswith(IMAGES_PREFIX):
+            continue
+        # images/a.jpg -> 'images', images/backgrounds/a.jpg -> 'images/backgrounds'
+        groups.setdefault(posixpath.dirname(logical), []).append((object_stem(name), name, None))
+
+    for manifest in sorted(Path().glob(curated_pattern)):
+        with open(manifest, encoding='utf-8') as f:
+            data = json.load(f)
+        for group, url in walk_urls(data, ''):
+            _, name = url_to_object(url)
+            members = groups.setdefault(f"{manifest.stem}/{group}", [])
+            members.append((object_stem(name) if name else url, name, url))
+    return groups, variants
+
+
+def group_digest(members, objects, variants):
+    """그룹 구성과 객체 내용(md5, generation)이 같으면 같은 값"""
+    state = []
+    for key, name, url in members:
+        names = [name, *sorted(variants.get(variant_key(name), []))] if name else []
+        state.append([key, url, [[n, objects[n]['md5'], objects[n]['generation']]
+                                 for n in names if n in objects]])
+    encoded = json.dumps(state, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def _fetch_prefix(url):
+    request = urllib.request.Request(url, headers={'Range': f'bytes=0-{PROBE_BYTES - 1}'})
+    with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as response:
+        return response.read()
+
+
+def _read_header(data):
+    with Image.open(io.BytesIO(data)) as img:
+        return img.width, img.height, img.format
+
+
+def probe_image(url):
+    """
+    원격 이미지의 (가로, 세로, 형식)
+
+    앞부분 PROBE_BYTES만 받아 헤더를 읽고, 헤더가 그 뒤에 있으면
+    (큰 EXIF 등) 전체를 받는다.
+    """
+    try:
+        return _read_header(call_with_retry(_fetch_prefix, url, op='probe'))
+    except (OSError, SyntaxError):
+        return _read_header(download(url))
+
+
+def local_image_info(name, md5):
+    """assets/ 아래에 내용이 같은 파일이 있으면 (가로, 세로, 형식), 없으면 None"""
+    path = Path(LOCAL_ASSETS_ROOT) / logical_name(name)
+    if not path.is_file() or file_md5_base64(path) != md5:
+        return None
+    with Image.open(path) as img:
+        return img.width, img.height, img.format
+
+
+def load_image_info(conn, names, objects, bucket_name, workers=DEFAULT_WORKERS):
+    """
+    객체들의 픽셀 크기 조회 (md5가 같으면 image_info 캐시 사용, 아니면 확인 후 저장)
+
+    Returns:
+        {객체 이름: {'width', 'height', 'format'}}
+    """
+    conn.executescript(INFO_SCHEMA)
+    cached = {
+        row['name']: row for row in conn.execute('SELECT * FROM image_info')
+    }
+    info = {}
+    missing = []
+    for name in names:
+        row = cached.get(name)
+        if row is not None and row['md5'] == objects[name]['md5']:
+            info[name] = {'width': row['width'], 'height': row['height'], 'format': row['format']}
+        else:
+            missing.append(name)
+
+    def probe(name):
+        try:
+            found = local_image_info(name, objects[name]['md5'])
+            return name, found or probe_image(public_url(bucket_name, name)), None
+        except Exception as e:
+            return name, None, str(e)
+
+    if missing:
+        print(f"📐 픽셀 크기 확인: {len(missing)}개")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(probe, missing))
+
+    with conn:
+        for name, found, error in results:
+            if error is not None:
+                print(f"❌ {name}: {error}")
+                continue
+            width, height, fmt = found
+            info[name] = {'width': width, 'height': height, 'format': fmt}
+            conn.execute(
+                'INSERT OR REPLACE INTO image_info (name, md5, width, height, format) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (name, objects[name]['md5'], width, height, fmt))
+    return info
+
+
+def local_placeholder(name):
+    """assets/ 아래 파일 옆에 compress_single_image가 만든 .placeholder.json이 있으면 읽기"""
+    path = (Path(LOCAL_ASSETS_ROOT) / logical_name(name)).with_suffix('.placeholder.json')
+    if not path.is_file():
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_entry(key, name, url, objects, variants, info, bucket_name):
+    """그룹 항목 하나 (인덱스에 없는 객체는 URL만)"""
+    if name not in objects:
+        return {'name': key, 'url': url, 'indexed': False}
+
+    size = info.get(name, {})
+    entry = {
+        'name': key,
+        'path': name,
+        'url': url or public_url(bucket_name, name),
+        'bytes': objects[name]['size'],
+        'width': size.get('width'),
+        'height': size.get('height'),
+        'md5': objects[name]['md5'],
+    }
+    entry_variants = []
+    for variant in sorted(variants.get(variant_key(name), [])):
+        _, width, fmt = split_variant(variant)
+        entry_variants.append({
+            'width': width,
+            'height': info.get(variant, {}).get('height'),
+            'format': fmt,
+            'url': public_url(bucket_name, variant),
+            'bytes': objects[variant]['size'],
+        })
+    if entry_variants:
+        entry['variants'] = sorted(entry_variants, key=lambda v: (v['width'], v['format']))
+    placeholder = local_placeholder(name)
+    if placeholder:
+        entry['placeholder'] = placeholder
+    return entry
+
+
+def write_json_if_changed(path, data):
+    """내용이 바뀐 경우에만 (임시 파일 + 교체로) 저장. 저장했으면 True"""
+    text = json.dumps(data, indent=2, ensure_ascii=False) + '\n'
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+    return True
+
+
+def manifest_files(curated_pattern=DEFAULT_MANIFESTS):
+    """URL이 들어 있는 설정 파일 (assets/*.json, 기존 설정 파일, 상세 manifest) 중 있는 것"""
+    paths = [str(path) for path in sorted(Path().glob(curated_pattern))]
+    paths += [path for path in (FLAT_CONFIG_PATH, STRUCTURED_CONFIG_PATH, MANIFEST_PATH)
+              if os.path.exists(path)]
+    return paths
+
+
+def referenced_objects(paths):
+    """설정 파일들의 URL이 가리키는 객체 이름 (storage_admin.py gc에서 지우지 않을 객체)"""
+    names = set()
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        for _, url in walk_urls(data, ''):
+            _, name = url_to_object(url)
+            if name:
+                names.add(name)
+    return names
+
+
+def _rewrite_urls(value, replacements):
+    """중첩된 dict/list의 URL을 replacements(논리 이름 -> 객체 이름)대로 바꾸기. (새 값, 바꾼 수)"""
+    if isinstance(value, dict):
+        result, count = {}, 0
+        for key, child in value.items():
+            result[key], changed = _rewrite_urls(child, replacements)
+            count += changed
+        return result, count
+    if isinstance(value, list):
+        pairs = [_rewrite_urls(child, replacements) for child in value]
+        return [child for child, _ in pairs], sum(changed for _, changed in pairs)
+    if isinstance(value, str):
+        bucket_name, name = url_to_object(value)
+        target = replacements.get(logical_name(name)) if name else None
+        if target and target != name:
+            return public_url(bucket_name, target), 1
+    return value, 0
+
+
+def rewrite_fingerprinted_urls(replacements, curated_pattern=DEFAULT_MANIFESTS):
+    """
+    assets/*.json의 URL을 같은 논리 이름의 내용 해시 객체 URL로 바꾸기
+
+    기존 설정 파일과 상세 manifest는 update_manifests()가 인덱스로 다시 만든다.
+
+    Args:
+        replacements: {논리 이름: 새 객체 이름}
+
+    Returns:
+        {파일 경로: 바꾼 URL 수}
+    """
+    rewritten = {}
+    for path in sorted(Path().glob(curated_pattern)):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        data, count = _rewrite_urls(data, replacements)
+        if count and write_json_if_changed(str(path), data):
+            rewritten[str(path)] = count
+    return rewritten
+
+
+def legacy_configs(groups):
+    """상세 manifest에서 기존 형식의 image_urls.json, structured_image_urls.json 내용 만들기"""
+    flat = {}
+    structured = {}
+    for group, data in groups.items():
+        if group == IMAGES_PREFIX.rstrip('/'):
+            flat = {entry['name']: entry['url'] for entry in data['entries']}
+        elif group.startswith(IMAGES_PREFIX):
+            structured[group[len(IMAGES_PREFIX):]] = {
+                entry['name']: entry['url'] for entry in data['entries']}
+    return flat, structured
+
+
+def update_manifests(bucket_name=DEFAULT_BUCKET, index_path=DEFAULT_INDEX_PATH,
+                     manifest_path=MANIFEST_PATH, curated_pattern=DEFAULT_MANIFESTS,
+                     workers=DEFAULT_WORKERS, force=False, legacy=True, skip_configs=()):
+    """
+    인덱스를 한 번 훑어서 상세 manifest와 기존 설정 파일을 갱신
+
+    Args:
+        skip_configs: 호출한 스크립트가 직접 쓰는 기존 설정 파일 경로 (덮어쓰지 않음)
+
+    Returns:
+        {'changed': [바뀐 그룹], 'removed': [없어진 그룹], 'written': [저장한 파일]}
+    """
+    previous = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            previous = json.load(f).get('groups', {})
+
+    conn = open_index(index_path)
+    try:
+        objects = get_objects(conn)
+        members_by_group, variants = collect_groups(objects, curated_pattern)
+
+        digests = {group: group_digest(members, objects, variants)
+                   for group, members in members_by_group.items()}
+        changed = sorted(group for group, digest in digests.items()
+                         if force or previous.get(group, {}).get('digest') != digest)
+        removed = sorted(set(previous) - set(digests))
+
+        names = set()
+        for group in changed:
+            for _, name, _ in members_by_group[group]:
+                if name in objects:
+                    names.add(name)
+                    names.update(variants.get(variant_key(name), []))
+        info = load_image_info(conn, sorted(names), objects, bucket_name, workers)
+    finally:
+        conn.close()
+
+    groups = {}
+    for group in sorted(digests):
+        if group not in changed:
+            groups[group] = previous[group]
+            continue
+        entries = [build_entry(key, name, url, objects, variants, info, bucket_name)
+                   for key, name, url in members_by_group[group]]
+        # 크기 확인에 실패한 항목이 있으면 digest를 비워서 다음 실행에서 다시 계산
+        complete = all(entry.get('width') is not None for entry in entries if 'path' in entry)
+        groups[group] = {'digest': digests[group] if complete else None, 'entries': entries}
+
+    written = []
+    if write_json_if_changed(manifest_path, {'bucket': bucket_name, 'groups': groups}):
+        written.append(manifest_path)
+    if legacy:
+        flat, structured = legacy_configs(groups)
+        for path, data in ((FLAT_CONFIG_PATH, flat), (STRUCTURED_CONFIG_PATH, structured)):
+            if path in skip_configs:
+                continue
+            if data and write_json_if_changed(path, data):
+                written.append(path)
+    return {'changed': changed, 'removed': removed, 'written': written}
+
+
+def print_update(result):
+    """갱신 결과 출력"""
+    for group in result['changed']:
+        print(f"   🔄 {group}")
+    for group in result['removed']:
+        print(f"   ➖ {group}")
+    print(f"📋 manifest 그룹 변경 {len(result['changed'])}개, 삭제 {len(result['removed'])}개")
+    for path in result['written']:
+        print(f"💾 저장됨: {path}")
+
+
+def curated_prefixes(curated_pattern=DEFAULT_MANIFESTS):
+    """assets/*.json이 가리키는 객체들의 최상위 폴더 prefix"""
+    prefixes = set()
+    for manifest in Path().glob(curated_pattern):
+        with open(manifest, encoding='utf-8') as f:
+            for _, url in walk_urls(json.load(f), ''):
+                _, name = url_to_object(url)
+                if name and '/' in name:
+                    prefixes.add(name.split('/', 1)[0] + '/')
+    return sorted(prefixes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='버킷 인덱스로 이미지 manifest 만들기')
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH,
+                        help=f'버킷 인덱스 파일 (기본값: {DEFAULT_INDEX_PATH})')
+    parser.add_argument('--output', default=MANIFEST_PATH,
+                        help=f'상세 manifest 경로 (기본값: {MANIFEST_PATH})')
+    parser.add_argument('--manifests', default=DEFAULT_MANIFESTS,
+                        help=f'함께 넣을 URL 목록 JSON (기본값: {DEFAULT_MANIFESTS})')
+    parser.add_argument('--refresh', action='store_true',
+                        help='images/와 URL 목록이 가리키는 prefix의 버킷 인덱스를 먼저 갱신')
+    parser.add_argument('--force', action='store_true', help='digest가 같아도 모든 그룹 다시 계산')
+    parser.add_argument('--no-legacy', action='store_true',
+                        help=f'{FLAT_CONFIG_PATH}, {STRUCTURED_CONFIG_PATH}는 쓰지 않음')
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'동시 크기 확인 수 (기본값: {DEFAULT_WORKERS})')
+    args = parser.parse_args()
+
+    bucket_name = DEFAULT_BUCKET
+    if args.refresh:
+        from upload_structured_images import init_firebase
+        bucket = init_firebase()
+        bucket_name = bucket.name
+        conn = open_index(args.index)
+        try:
+            for prefix in sorted({IMAGES_PREFIX, *curated_prefixes(args.manifests)}):
+                refreshed = refresh_prefix(conn, bucket, prefix)
+                print(f"🗂️  인덱스 갱신: {prefix} ({refreshed['total']}개, "
+                      f"변경 {refreshed['changed']}개, 삭제 {refreshed['removed']}개)")
+        finally:
+            conn.close()
+
+    result = update_manifests(bucket_name, args.index, args.output, args.manifests,
+                              args.workers, force=args.force, legacy=not args.no_legacy)
+    print_update(result)
+
+
+if __name__ == "__main__":
+    main()
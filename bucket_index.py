@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Firebase Storage 버킷 목록 로컬 인덱스 (SQLite)
+
+업로드/확인 스크립트들이 실행할 때마다 버킷 전체를 list_blobs()로
+훑지 않도록, 원격 객체(name, size, hash, generation, updated)를
+로컬 SQLite 파일에 저장해 두고 필요한 prefix만 갱신한다.
+
+- 갱신은 prefix 단위로, 필요한 필드만 요청(fields projection)해서 수행
+- max_age 안에 갱신한 prefix는 다시 목록을 가져오지 않음
+- 업로드 결과는 record_results()로 바로 반영해서 목록을 다시 가져올 필요 없음
+- 갱신 시 새로 생기거나 generation이 바뀐 객체는 changed_at이 기록되어
+  changed_since()로 "마지막 갱신 이후 바뀐 객체"를 조회할 수 있음
+
+사용법:
+    python bucket_index.py refresh images/ eidos_cards/
+    python bucket_index.py list images/backgrounds/
+    python bucket_index.py changed --since 2025-01-01T00:00:00
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+
+from storage_retry import call_with_retry
+
+# 인덱스 파일 위치
+DEFAULT_INDEX_PATH = '.storage_index.sqlite3'
+
+# 이 시간(초) 안에 갱신한 prefix는 다시 목록을 가져오지 않음
+DEFAULT_MAX_AGE = 3600
+
+# list_blobs 응답에서 필요한 필드만 요청
+LIST_FIELDS = 'items(name,size,md5Hash,crc32c,generation,updated),nextPageToken'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    name TEXT PRIMARY KEY,
+    size INTEGER,
+    md5 TEXT,
+    crc32c TEXT,
+    generation INTEGER,
+    updated TEXT,
+    changed_at REAL
+);
+CREATE TABLE IF NOT EXISTS refreshes (
+    prefix TEXT PRIMARY KEY,
+    refreshed_at REAL
+);
+"""
+
+
+def open_index(path=DEFAULT_INDEX_PATH):
+    """인덱스 파일을 열고 (없으면 생성) sqlite3 연결 반환"""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _blob_row(blob):
+    """블롭을 objects 테이블 행으로 변환"""
+    return (
+        blob.name,
+        blob.size,
+        blob.md5_hash,
+        blob.crc32c,
+        blob.generation,
+        blob.updated.isoformat() if blob.updated else None,
+    )
+
+
+def _upsert(conn, row, now):
+    """객체 한 개를 저장. 새 객체이거나 generation이 바뀌면 True"""
+    name, size, md5, crc32c, generation, updated = row
+    existing = conn.execute(
+        'SELECT generation FROM objects WHERE name = ?', (name,)).fetchone()
+    changed = existing is None or existing['generation'] != generation
+    conn.execute(
+        """
+        INSERT INTO objects (name, size, md5, crc32c, generation, updated, changed_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET
+            size = excluded.size,
+            md5 = excluded.md5,
+            crc32c = excluded.crc32c,
+            generation = excluded.generation,
+            updated = excluded.updated,
+            changed_at = CASE WHEN objects.generation IS excluded.generation
+                              THEN objects.changed_at ELSE excluded.changed_at END
+        """,
+        (name, size, md5, crc32c, generation, updated, now),
+    )
+    return changed
+
+
+def refresh_prefix(conn, bucket, prefix):
+    """
+    prefix 아래 객체 목록을 버킷에서 다시 가져와 인덱스 갱신
+
+    Returns:
+        {'total', 'changed', 'removed'} 개수
+    """
+    now = time.time()
+    seen = set()
+    changed = 0
+
+    # 목록 도중 실패하면 처음부터 다시 가져온다
+    blobs = call_with_retry(
+        lambda: list(bucket.list_blobs(prefix=prefix, fields=LIST_FIELDS)), op='list')
+
+    with conn:
+        for blob in blobs:
+            seen.add(blob.name)
+            if _upsert(conn, _blob_row(blob), now):
+                changed += 1
+
+        # 버킷에서 사라진 객체 제거
+        indexed = [row['name'] for row in conn.execute(
+            'SELECT name FROM objects WHERE substr(name, 1, ?) = ?', (len(prefix), prefix))]
+        removed = [name for name in indexed if name not in seen]
+        conn.executemany('DELETE FROM objects WHERE name = ?', [(name,) for name in removed])
+
+        conn.execute(
+            'INSERT OR REPLACE INTO refreshes (prefix, refreshed_at) VALUES (?, ?)',
+            (prefix, now))
+
+    return {'total': len(seen), 'changed': changed, 'removed': len(removed)}
+
+
+def ensure_fresh(conn, bucket, prefix, max_age=DEFAULT_MAX_AGE):
+    """prefix가 max_age보다 오래되었으면 갱신. 갱신했으면 결과, 아니면 None"""
+    if not is_fresh(conn, prefix, max_age):
+        return refresh_prefix(conn, bucket, prefix)
+    return None
+
+
+def is_fresh(conn, prefix, max_age=DEFAULT_MAX_AGE):
+    """prefix(또는 그 상위 prefix)가 max_age 안에 갱신되었는지 확인"""
+    if max_age is None or max_age <= 0:
+        return False
+    for row in conn.execute('SELECT prefix, refreshed_at FROM refreshes'):
+        if prefix.startswith(row['prefix']) and time.time() - row['refreshed_at'] < max_age:
+            return True
+    return False
+
+
+def get_objects(conn, prefix=''):
+    """
+    인덱스에서 prefix 아래 객체 목록 조회
+
+    Returns:
+        {블롭 이름: {'size', 'md5', 'crc32c', 'generation', 'updated'}}
+    """
+    rows = conn.execute(
+        'SELECT * FROM objects WHERE substr(name, 1, ?) = ? ORDER BY name',
+        (len(prefix), prefix))
+    return {
+        row['name']: {
+            'size': row['size'],
+            'md5': row['md5'],
+            'crc32c': row['crc32c'],
+            'generation': row['generation'],
+            'updated': row['updated'],
+        }
+        for row in rows
+    }
+
+
+def load_objects(bucket, prefix, max_age=DEFAULT_MAX_AGE, path=DEFAULT_INDEX_PATH):
+    """필요하면 prefix를 갱신한 뒤 인덱스에서 객체 목록을 반환 (스크립트용 단축 함수)"""
+    conn = open_index(path)
+    try:
+        refreshed = ensure_fresh(conn, bucket, prefix, max_age)
+        if refreshed:
+            print(f"🗂️  인덱스 갱신: {prefix} ({refreshed['total']}개, "
+                  f"변경 {refreshed['changed']}개, 삭제 {refreshed['removed']}개)")
+        return get_objects(conn, prefix)
+    finally:
+        conn.close()
+
+
+def changed_since(conn, since, prefix=''):
+    """since(epoch 초) 이후 새로 생기거나 바뀐 객체 이름 목록"""
+    rows = conn.execute(
+        'SELECT name FROM objects WHERE substr(name, 1, ?) = ? AND changed_at >= ? ORDER BY name',
+        (len(prefix), prefix, since))
+    return [row['name'] for row in rows]
+
+
+def last_refresh(conn, prefix):
+    """prefix의 마지막 갱신 시각(epoch 초), 없으면 None"""
+    row = conn.execute(
+        'SELECT refreshed_at FROM refreshes WHERE prefix = ?', (prefix,)).fetchone()
+    return row['refreshed_at'] if row else None
+
+
+def record_results(results, path=DEFAULT_INDEX_PATH):
+    """upload_engine 업로드 결과를 인덱스에 반영 (목록을 다시 가져오지 않음)"""
+    conn = open_index(path)
+    now = time.time()
+    try:
+        with conn:
+            for result in results:
+                if result['error'] is None:
+                    _upsert(conn, (
+                        result['remote_path'],
+                        result['size'],
+                        result.get('md5'),
+                        result.get('crc32c'),
+                        result.get('generation'),
+                        result.get('updated'),
+                    ), now)
+    finally:
+        conn.close()
+
+
+def remove_objects(names, path=DEFAULT_INDEX_PATH):
+    """삭제한 객체를 인덱스에서 제거 (목록을 다시 가져오지 않음)"""
+    conn = open_index(path)
+    try:
+        with conn:
+            conn.executemany('DELETE FROM objects WHERE name = ?', [(name,) for name in names])
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Firebase Storage 버킷 목록 로컬 인덱스')
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help='인덱스 파일 경로')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    refresh_parser = subparsers.add_parser('refresh', help='prefix 목록 갱신')
+    refresh_parser.add_argument('prefixes', nargs='+', help='갱신할 prefix (예: images/)')
+
+    list_parser = subparsers.add_parser('list', help='인덱스에 있는 객체 출력')
+    list_parser.add_argument('prefix', nargs='?', default='', help='조회할 prefix')
+
+    changed_parser = subparsers.add_parser('changed', help='마지막 갱신 이후 바뀐 객체 출력')
+    changed_parser.add_argument('prefix', nargs='?', default='', help='조회할 prefix')
+    changed_parser.add_argument('--since', help='기준 시각 (ISO 8601, 기본값: 직전 갱신 시각)')
+
+    args = parser.parse_args()
+    conn = open_index(args.index)
+
+    if args.command == 'refresh':
+        from upload_structured_images import init_firebase
+        bucket = init_firebase()
+        for prefix in args.prefixes:
+            result = refresh_prefix(conn, bucket, prefix)
+            print(f"✅ {prefix}: {result['total']}개 (변경 {result['changed']}개, 삭제 {result['removed']}개)")
+
+    elif args.command == 'list':
+        objects = get_objects(conn, args.prefix)
+        for name, info in objects.items():
+            print(f"- {name} ({(info['size'] or 0) / 1024:.1f}KB)")
+        print(f"\n📦 {len(objects)}개")
+
+    elif args.command == 'changed':
+        if args.since:
+            since = datetime.fromisoformat(args.since)
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            since = since.timestamp()
+        else:
+            # 직전 갱신에서 바뀐 객체 = changed_at이 마지막 갱신 시각인 객체
+            since = last_refresh(conn, args.prefix)
+            if since is None:
+                print(f"❌ {args.prefix or '(전체)'} 갱신 기록이 없습니다.")
+                sys.exit(1)
+        names = changed_since(conn, since, args.prefix)
+        for name in names:
+            print(f"- {name}")
+        print(f"\n🔄 바뀐 객체: {len(names)}개")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
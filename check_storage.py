@@ -1,6 +1,7 @@
 import firebase_admin
 from firebase_admin import credentials, storage
 import os
+from bucket_index import load_objects
 
 try:
     # Firebase 초기화
@@ -11,15 +12,17 @@ try:
 
     bucket = storage.bucket()
 
+    # 로컬 버킷 인덱스에서 조회 (오래되었을 때만 images/ 목록을 다시 가져옴)
+    objects = load_objects(bucket, 'images/')
+
     print('Firebase Storage의 이미지 목록:')
-    blobs = bucket.list_blobs(prefix='images/')
-    for blob in blobs:
-        print(f'- {blob.name}')
+    for name in objects:
+        print(f'- {name}')
         
     print('\n특히 login 이미지들:')
-    login_blobs = bucket.list_blobs(prefix='images/backgrounds/login')
-    for blob in login_blobs:
-        print(f'- {blob.name} (URL: https://storage.googleapis.com/{blob.bucket.name}/{blob.name})')
+    for name in objects:
+        if name.startswith('images/backgrounds/login'):
+            print(f'- {name} (URL: https://storage.googleapis.com/{bucket.name}/{name})')
         
 except Exception as e:
     print(f'에러: {e}') 
\ No newline at end of file
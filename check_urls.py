@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+assets/*.json URL 상태/무결성 검사
+
+eidos_card_urls.json, tag_image_urls.json, fortune_background_urls.json 등에
+직접 적힌 수백 개의 URL이 아직 살아 있고 버킷 객체와 같은지 확인한다.
+앱은 없는 URL을 fallback으로 차례로 시도하며 넘어가기 때문에 깨진 URL이
+오류 대신 지연으로만 드러난다.
+
+URL마다 HEAD 요청 하나를 보내고 아래 항목을 로컬 버킷 인덱스(bucket_index.py)와
+비교한다. 인덱스에 없는 객체는 상태 코드만 확인한다.
+
+    status          200이 아니면 실패
+    size            Content-Length != 인덱스 size
+    content_type    Content-Type != storage_metadata 정책 값
+    hash            x-goog-hash의 md5/crc32c != 인덱스 md5/crc32c
+
+asyncio 스트림으로 호스트별 keep-alive 연결을 재사용하고, 전체 동시 요청 수는
+세마포어로 제한한다 (storage.googleapis.com 한 호스트에 TLS 연결을 URL마다
+새로 맺지 않음). URL마다 응답 시간을 기록해서 보고서 JSON에 남긴다.
+문제가 있는 URL이 있으면 1로 종료한다 (CI용).
+
+사용법:
+    python check_urls.py
+    python check_urls.py --json reports/urls.json -j 64
+    python check_urls.py --manifests 'assets/eidos_*.json' --timeout 5
+"""
+
+import argparse
+import asyncio
+import json
+import ssl
+import sys
+import time
+from urllib.parse import urlsplit
+
+from asset_catalog import DEFAULT_MANIFESTS, load_references, url_to_object
+from bucket_index import DEFAULT_INDEX_PATH, get_objects, open_index
+from storage_metadata import content_type_for
+from storage_retry import RETRYABLE_STATUS, backoff_delay
+
+# 기본 동시 요청 수
+DEFAULT_CONCURRENCY = 32
+
+# 호스트 하나에 열어 둘 최대 연결 수
+DEFAULT_CONNECTIONS_PER_HOST = 16
+
+# 요청 하나의 타임아웃(초)
+DEFAULT_TIMEOUT = 15
+
+# 연결 오류/재시도 가능한 상태 코드일 때 최대 시도 횟수
+MAX_ATTEMPTS = 3
+
+USER_AGENT = 'innerfive-check-urls/1.0'
+
+
+class ConnectionPool:
+    """
+    (scheme, host, port)별 keep-alive 연결 풀
+
+    응답이 연결 유지를 허용하면 반납된 연결을 다음 요청에 다시 쓰고,
+    호스트마다 동시에 열린 연결 수를 per_host로 제한한다.
+    """
+
+    def __init__(self, per_host=DEFAULT_CONNECTIONS_PER_HOST):
+        self.per_host = per_host
+        self.opened = 0
+        self.reused = 0
+        self._idle = {}
+        self._slots = {}
+        self._ssl = None
+
+    def slot(self, key):
+        """호스트별 연결 수 제한 (async with pool.slot(key) 안에서 acquire/release)"""
+        if key not in self._slots:
+            self._slots[key] = asyncio.Semaphore(self.per_host)
+        return self._slots[key]
+
+    async def acquire(self, key):
+        """
+        연결 하나 가져오기 (idle 연결이 있으면 재사용)
+
+        Returns:
+            (reader, writer, 재사용 여부)
+        """
+        idle = self._idle.get(key, [])
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                self.reused += 1
+                return reader, writer, True
+            writer.close()
+        scheme, host, port = key
+        if scheme == 'https':
+            if self._ssl is None:
+                self._ssl = ssl.create_default_context()
+            reader, writer = await asyncio.open_connection(
+                host, port, ssl=self._ssl, server_hostname=host)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        self.opened += 1
+        return reader, writer, False
+
+    def release(self, key, reader, writer, keep_alive):
+        """연결 반납 (keep_alive가 아니면 닫기)"""
+        if keep_alive and not writer.is_closing():
+            self._idle.setdefault(key, []).append((reader, writer))
+        else:
+            writer.close()
+
+    def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+async def _read_response(reader):
+    """HEAD 응답의 (HTTP 버전, 상태 코드, 헤더 dict) 읽기 (헤더 이름은 소문자)"""
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError('응답 없이 연결이 닫힘')
+        version, status, _ = (line.decode('latin-1').rstrip('\r\n') + '  ').split(' ', 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            name = name.strip().lower()
+            value = value.strip()
+            # x-goog-hash처럼 여러 번 오는 헤더는 이어 붙인다
+            headers[name] = f"{headers[name]}, {value}" if name in headers else value
+        # 100 Continue 등 중간 응답은 건너뛴다
+        if not status.startswith('1'):
+            return version, int(status), headers
+
+
+def _keep_alive(version, headers):
+    connection = headers.get('connection', '').lower()
+    if version == 'HTTP/1.1':
+        return 'close' not in connection
+    return 'keep-alive' in connection
+
+
+async def head(pool, url, timeout=DEFAULT_TIMEOUT):
+    """
+    URL 하나에 HEAD 요청 보내기
+
+    재사용한 연결이 서버 쪽에서 이미 닫혀 있었으면 새 연결로 한 번 더 보낸다.
+    응답 시간은 호스트 연결 슬롯을 얻은 뒤부터 잰다 (슬롯 대기 시간 제외).
+
+    Returns:
+        (상태 코드, 헤더 dict, 응답 시간 ms)
+    """
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+    key = (parts.scheme, parts.hostname, port)
+    target = parts.path or '/'
+    if parts.query:
+        target += '?' + parts.query
+    host = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+    request = (f"HEAD {target} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: {USER_AGENT}\r\n"
+               f"Accept: */*\r\nConnection: keep-alive\r\n\r\n").encode('latin-1')
+
+    async with pool.slot(key):
+        started = time.perf_counter()
+        while True:
+            reader, writer, reused = await asyncio.wait_for(pool.acquire(key), timeout)
+            keep_alive = False
+            try:
+                writer.write(request)
+                await writer.drain()
+                version, status, headers = await asyncio.wait_for(_read_response(reader), timeout)
+                keep_alive = _keep_alive(version, headers)
+                return status, headers, (time.perf_counter() - started) * 1000
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if not reused:
+                    raise
+            finally:
+                pool.release(key, reader, writer, keep_alive)
+
+
+def parse_goog_hash(value):
+    """x-goog-hash 헤더 ('crc32c=..., md5=...')를 {'crc32c', 'md5'}로"""
+    hashes = {}
+    for part in value.split(','):
+        name, _, digest = part.strip().partition('=')
+        if digest:
+            hashes[name.lower()] = digest
+    return hashes
+
+
+def verify(status, headers, expected):
+    """
+    HEAD 응답을 인덱스 값과 비교
+
+    Args:
+        expected: {'name', 'size', 'md5', 'crc32c'} (인덱스에 없으면 None)
+
+    Returns:
+        [문제 설명, ...]
+    """
+    if status != 200:
+        return [f"status {status}"]
+    if expected is None:
+        return []
+    problems = []
+    length = headers.get('content-length')
+    if expected['size'] is not None and length is not None and int(length) != expected['size']:
+        problems.append(f"size {length} != {expected['size']}")
+    content_type = headers.get('content-type', '').split(';')[0].strip()
+    expected_type = content_type_for(expected['name'])
+    if content_type != expected_type:
+        problems.append(f"content_type {content_type or '-'} != {expected_type}")
+    hashes = parse_goog_hash(headers.get('x-goog-hash', ''))
+    for field in ('md5', 'crc32c'):
+        if expected[field] and field in hashes and hashes[field] != expected[field]:
+            problems.append(f"{field} {hashes[field]} != {expected[field]}")
+    return problems
+
+
+async def check_url(pool, semaphore, url, expected, timeout=DEFAULT_TIMEOUT):
+    """
+    URL 하나 검사 (재시도 가능한 상태 코드/연결 오류는 MAX_ATTEMPTS까지 재시도)
+
+    Returns:
+        {'status', 'latency_ms', 'bytes', 'content_type', 'indexed', 'problems'}
+    """
+    result = {'status': None, 'latency_ms': None, 'bytes': None, 'content_type': None,
+              'indexed': expected is not None, 'problems': []}
+    for attempt in range(MAX_ATTEMPTS):
+        async with semaphore:
+            try:
+                status, headers, latency = await head(pool, url, timeout)
+            except (OSError, asyncio.TimeoutError, ValueError) as e:
+                error = f"{type(e).__name__}: {e}".rstrip(': ')
+                status = latency = None
+        if status is not None and status not in RETRYABLE_STATUS:
+            break
+        if attempt + 1 < MAX_ATTEMPTS:
+            await asyncio.sleep(backoff_delay(attempt))
+
+    if status is None:
+        result['problems'] = [error]
+        return result
+    length = headers.get('content-length')
+    result['status'] = status
+    result['latency_ms'] = round(latency, 1)
+    result['bytes'] = int(length) if length and length.isdigit() else None
+    result['content_type'] = headers.get('content-type')
+    result['problems'] = verify(status, headers, expected)
+    return result
+
+
+def expected_objects(urls, index_path=DEFAULT_INDEX_PATH):
+    """URL별 인덱스 값 {url: {'name', 'size', 'md5', 'crc32c'} 또는 None}"""
+    conn = open_index(index_path)
+    try:
+        objects = get_objects(conn)
+    finally:
+        conn.close()
+    expected = {}
+    for url in urls:
+        _, name = url_to_object(url)
+        entry = objects.get(name) if name else None
+        expected[url] = None if entry is None else {
+            'name': name, 'size': entry['size'], 'md5': entry['md5'], 'crc32c': entry['crc32c']}
+    return expected
+
+
+async def check_urls(urls, expected, concurrency=DEFAULT_CONCURRENCY,
+                     per_host=DEFAULT_CONNECTIONS_PER_HOST, timeout=DEFAULT_TIMEOUT):
+    """
+    URL 전체를 동시에 검사
+
+    Returns:
+        ({url: 결과}, {'opened', 'reused'} 연결 통계)
+    """
+    pool = ConnectionPool(per_host)
+    semaphore = asyncio.Semaphore(concurrency)
+    try:
+        results = await asyncio.gather(*(
+            check_url(pool, semaphore, url, expected.get(url), timeout) for url in urls))
+    finally:
+        pool.close()
+    return dict(zip(urls, results)), {'opened': pool.opened, 'reused': pool.reused}
+
+
+def percentile(values, fraction):
+    """정렬된 값에서 fraction 위치 값 (nearest-rank)"""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, int(round(fraction * len(values) + 0.5)) - 1))]
+
+
+def build_report(results, references, connections, elapsed):
+    """URL별 결과와 요약으로 보고서 dict 만들기 (URL 순 정렬)"""
+    latencies = sorted(r['latency_ms'] for r in results.values() if r['latency_ms'] is not None)
+    broken = [url for url, r in results.items() if r['problems']]
+    return {
+        'summary': {
+            'urls': len(results),
+            'ok': len(results) - len(broken),
+            'broken': len(broken),
+            'unindexed': sum(1 for r in results.values() if not r['indexed']),
+            'elapsed_s': round(elapsed, 2),
+            'latency_ms': {
+                'p50': percentile(latencies, 0.5),
+                'p95': percentile(latencies, 0.95),
+                'max': latencies[-1] if latencies else None,
+            },
+            'connections': connections,
+        },
+        'urls': {
+            url: dict(results[url], references=[f"{manifest}:{group}"
+                                                for manifest, group in references.get(url, [])])
+            for url in sorted(results)
+        },
+    }
+
+
+def print_report(report, slowest=10):
+    summary = report['summary']
+    latency = summary['latency_ms']
+    print(f"\n📊 URL {summary['urls']}개: ✅ 정상 {summary['ok']}개, ❌ 문제 {summary['broken']}개, "
+          f"인덱스에 없음 {summary['unindexed']}개")
+    if latency['p50'] is not None:
+        print(f"⏱️  응답 시간 p50 {latency['p50']:.0f}ms, p95 {latency['p95']:.0f}ms, "
+              f"최대 {latency['max']:.0f}ms (전체 {summary['elapsed_s']:.1f}s)")
+    print(f"🔌 연결 {summary['connections']['opened']}개 생성, "
+          f"{summary['connections']['reused']}번 재사용")
+
+    broken = [(url, entry) for url, entry in report['urls'].items() if entry['problems']]
+    if broken:
+        print("\n❌ 문제 있는 URL:")
+        for url, entry in broken:
+            print(f"   {url}")
+            print(f"      {'; '.join(entry['problems'])}")
+            for reference in entry['references']:
+                print(f"      └── {reference}")
+
+    timed = [(entry['latency_ms'], url) for url, entry in report['urls'].items()
+             if entry['latency_ms'] is not None and not entry['problems']]
+    if timed and slowest:
+        print(f"\n🐢 느린 URL 상위 {min(slowest, len(timed))}개:")
+        for latency_ms, url in sorted(timed, reverse=True)[:slowest]:
+            print(f"   {latency_ms:8.1f}ms  {url}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='assets/*.json URL 상태/무결성 검사')
+    parser.add_argument('--manifests', default=DEFAULT_MANIFESTS,
+                        help=f'URL 목록 JSON (기본값: {DEFAULT_MANIFESTS})')
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH,
+                        help=f'버킷 인덱스 파일 (기본값: {DEFAULT_INDEX_PATH})')
+    parser.add_argument('-j', '--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'동시 요청 수 (기본값: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--per-host', type=int, default=DEFAULT_CONNECTIONS_PER_HOST,
+                        help=f'호스트별 최대 연결 수 (기본값: {DEFAULT_CONNECTIONS_PER_HOST})')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'요청 타임아웃 초 (기본값: {DEFAULT_TIMEOUT})')
+    parser.add_argument('--slowest', type=int, default=10, help='출력할 느린 URL 수 (기본값: 10)')
+    parser.add_argument('--json', help='보고서를 JSON으로 저장할 경로')
+    args = parser.parse_args()
+
+    references = load_references(args.manifests)
+    urls = sorted(references)
+    if not urls:
+        print(f"❌ {args.manifests}에 URL이 없습니다.")
+        return
+    print(f"🌐 URL {len(urls)}개 검사 중 (동시 {args.concurrency}개)...")
+
+    started = time.time()
+    results, connections = asyncio.run(check_urls(
+        urls, expected_objects(urls, args.index), args.concurrency, args.per_host, args.timeout))
+    report = build_report(results, references, connections, time.time() - started)
+    print_report(report, args.slowest)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"💾 보고서 저장됨: {args.json}")
+
+    if report['summary']['broken']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
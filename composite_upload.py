@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+아주 큰 파일용 병렬 composite 업로드
+
+큰 파일 하나(원본 배경, 함께 호스팅할 동영상 등)는 업로드 스트림 하나로는
+업링크를 다 쓰지 못한다. 파일을 N개 구간으로 나눠 임시 객체로 동시에 올린 뒤
+서버에서 compose로 합쳐 최종 객체를 만든다.
+
+composite 객체에는 md5Hash가 없고 crc32c만 있으므로, 합친 뒤 로컬 CRC32C와
+비교해서 무결성을 확인한다 (storage_sync.is_unchanged도 crc32c로 비교한다).
+
+사용법:
+    from composite_upload import composite_upload
+
+    blob = composite_upload(bucket, 'raw/intro.mp4', 'videos/intro.mp4', parts=8)
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from storage_metadata import apply_metadata
+from storage_retry import call_with_retry
+from storage_sync import file_crc32c_base64
+
+# 이 크기 이상인 파일은 composite 업로드 사용
+COMPOSITE_THRESHOLD = 64 * 1024 * 1024
+
+# 기본 분할 수
+DEFAULT_PARTS = 8
+
+# compose 한 번에 합칠 수 있는 최대 객체 수
+MAX_COMPOSE_SOURCES = 32
+
+# 구간 하나의 최소 크기 (너무 잘게 나누면 요청 수만 늘어남)
+MIN_PART_SIZE = 8 * 1024 * 1024
+
+
+def split_ranges(total_size, parts):
+    """파일을 (시작, 길이) 구간 parts개로 나누기"""
+    parts = max(1, min(parts, MAX_COMPOSE_SOURCES, total_size // MIN_PART_SIZE or 1))
+    part_size = -(-total_size // parts)
+    return [
+        (start, min(part_size, total_size - start))
+        for start in range(0, total_size, part_size)
+    ]
+
+
+def _upload_part(bucket, local_path, part_path, start, length):
+    """파일의 한 구간을 임시 객체로 업로드"""
+    blob = bucket.blob(part_path)
+    with open(local_path, 'rb') as f:
+        f.seek(start)
+        blob.upload_from_file(f, size=length)
+    return blob
+
+
+def _delete_batch(bucket, part_blobs):
+    with bucket.client.batch():
+        for blob in part_blobs:
+            blob.delete()
+
+
+def _delete_parts(bucket, part_blobs):
+    """임시 구간 객체를 배치 요청으로 삭제"""
+    try:
+        call_with_retry(_delete_batch, bucket, part_blobs, op='delete')
+    except Exception as e:
+        print(f"⚠️  임시 구간 삭제 실패 ({len(part_blobs)}개): {e}")
+
+
+def composite_upload(bucket, local_path, remote_path, parts=DEFAULT_PARTS,
+                     predefined_acl='publicRead', limiter=None):
+    """
+    파일을 구간으로 나눠 병렬 업로드한 뒤 서버 측 compose로 합치기
+
+    Args:
+        bucket: Firebase Storage 버킷
+        local_path: 로컬 파일 경로
+        remote_path: Firebase Storage에 저장될 최종 경로
+        parts: 분할 수 (최대 32)
+        predefined_acl: 최종 객체에 적용할 ACL
+        limiter: 구간 업로드 동시 요청 수를 조절하는 AdaptiveLimiter
+
+    Returns:
+        합쳐진 최종 블롭 (메타데이터 포함)
+    """
+    total_size = os.path.getsize(local_path)
+    ranges = split_ranges(total_size, parts)
+    part_paths = [f"{remote_path}.parts/{index:04d}" for index in range(len(ranges))]
+
+    print(f"🧩 composite 업로드: {remote_path} ({total_size / 1024 / 1024:.1f}MB, {len(ranges)}개 구간)")
+
+    part_blobs = []
+    try:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(call_with_retry, _upload_part, bucket, local_path, part_path,
+                                start, length, op='upload', limiter=limiter)
+                for part_path, (start, length) in zip(part_paths, ranges)
+            ]
+            # 실패한 구간이 있어도 나머지가 끝날 때까지 기다려서 모두 정리되게 한다
+            errors = []
+            for future in futures:
+                try:
+                    part_blobs.append(future.result())
+                except Exception as e:
+                    errors.append(e)
+            if errors:
+                raise errors[0]
+
+        final = bucket.blob(remote_path)
+        apply_metadata(final, remote_path)
+        call_with_retry(final.compose, part_blobs, op='compose')
+        if predefined_acl:
+            call_with_retry(final.acl.save_predefined, predefined_acl, op='acl')
+    finally:
+        if part_blobs:
+            _delete_parts(bucket, part_blobs)
+
+    # composite 객체는 crc32c로 무결성 확인
+    local_crc32c = file_crc32c_base64(local_path)
+    if local_crc32c and final.crc32c != local_crc32c:
+        raise RuntimeError(f"compose 후 CRC32C 불일치: {remote_path}")
+    return final
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+압축 결과 캐시 (원본 해시 + 인코딩 옵션 기반)
+
+compress_single_image.py는 실행할 때마다 모든 이미지를 다시 디코딩/인코딩한다.
+원본 내용과 옵션(quality, 가로 크기, 형식, 탐색 목표 등)이 같으면 결과도 같으므로,
+그 조합의 해시를 키로 결과 파일을 로컬 캐시에 보관했다가 그대로 복사해 쓴다.
+
+    .compress_cache/index.sqlite3     키별 파일 목록, 메타데이터, 크기, 마지막 사용 시각
+    .compress_cache/objects/ab/<키>/  결과 파일
+
+캐시 전체 크기가 한도를 넘으면 가장 오래 쓰지 않은 항목부터 지운다 (LRU).
+적중/미스 횟수와 적중으로 아낀 CPU 시간은 프로세스별 STATS에 모인다.
+
+사용법:
+    from compress_cache import cache_key, run_cached
+
+    key = cache_key(input_path, kind='jpeg', quality=85, name='a.jpg')
+    meta, hit = run_cached(produce, key, output_dir)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import time
+
+import PIL
+
+# 캐시 폴더 위치
+DEFAULT_CACHE_DIR = '.compress_cache'
+
+# 캐시 최대 크기 (이보다 커지면 LRU로 정리)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# 결과 형식이 바뀌면 올려서 기존 캐시를 무효화
+CACHE_VERSION = 1
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    files TEXT NOT NULL,
+    meta TEXT,
+    bytes INTEGER,
+    cpu_seconds REAL,
+    created_at REAL,
+    last_used REAL
+);
+"""
+
+# 이 프로세스의 캐시 통계
+STATS = {
+    'hits': 0,
+    'misses': 0,
+    'saved_seconds': 0.0,
+}
+
+
+def open_cache(cache_dir=DEFAULT_CACHE_DIR):
+    """캐시 인덱스를 열고 (없으면 생성) sqlite3 연결 반환"""
+    os.makedirs(cache_dir, exist_ok=True)
+    # 배치 모드에서는 여러 프로세스가 같은 인덱스를 쓰므로 잠금 대기 시간을 넉넉히
+    conn = sqlite3.connect(os.path.join(cache_dir, 'index.sqlite3'), timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _object_dir(cache_dir, key):
+    return os.path.join(cache_dir, 'objects', key[:2], key)
+
+
+def file_sha256(path):
+    """파일 내용 SHA-256 (hex)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(input_path, **params):
+    """
+    원본 내용 해시와 인코딩 옵션으로 캐시 키 만들기
+
+    결과 파일 이름을 정하는 값(출력 파일 이름, stem)도 params에 넣어야 한다.
+    Pillow 버전이 바뀌면 인코더 결과도 달라질 수 있으므로 키에 포함한다.
+    """
+    payload = json.dumps({
+        'source': file_sha256(input_path),
+        'params': params,
+        'version': CACHE_VERSION,
+        'pillow': PIL.__version__,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _restore(conn, cache_dir, key, output_dir):
+    """캐시 항목을 output_dir에 복사하고 메타데이터 반환 (없거나 깨졌으면 None)"""
+    row = conn.execute('SELECT files, meta, cpu_seconds FROM entries WHERE key = ?', (key,)).fetchone()
+    if row is None:
+        return None
+
+    object_dir = _object_dir(cache_dir, key)
+    names = json.loads(row['files'])
+    if not all(os.path.exists(os.path.join(object_dir, name)) for name in names):
+        # 파일이 지워진 항목은 버리고 미스로 처리
+        with conn:
+            conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+        return None
+
+    os.makedirs(output_dir, exist_ok=True)
+    for name in names:
+        shutil.copyfile(os.path.join(object_dir, name), os.path.join(output_dir, name))
+    with conn:
+        conn.execute('UPDATE entries SET last_used = ? WHERE key = ?', (time.time(), key))
+    STATS['hits'] += 1
+    STATS['saved_seconds'] += row['cpu_seconds'] or 0.0
+    return json.loads(row['meta'])
+
+
+def _store(conn, cache_dir, key, output_dir, paths, meta, cpu_seconds):
+    """결과 파일을 캐시에 복사하고 인덱스에 기록"""
+    object_dir = _object_dir(cache_dir, key)
+    temp_dir = f"{object_dir}.tmp{os.getpid()}"
+    os.makedirs(temp_dir, exist_ok=True)
+    names = []
+    for path in paths:
+        name = os.path.relpath(path, output_dir)
+        shutil.copyfile(path, os.path.join(temp_dir, name))
+        names.append(name)
+
+    # 중단된 실행이 남긴 폴더가 있으면 비우고 교체 (같은 키면 내용도 같음)
+    shutil.rmtree(object_dir, ignore_errors=True)
+    try:
+        os.replace(temp_dir, object_dir)
+    except OSError:
+        # 다른 프로세스가 같은 키를 동시에 저장함
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        return
+
+    now = time.time()
+    with conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO entries (key, files, meta, bytes, cpu_seconds, created_at, last_used)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (key, json.dumps(names), json.dumps(meta, ensure_ascii=False),
+             sum(os.path.getsize(path) for path in paths), cpu_seconds, now, now))
+
+
+def run_cached(produce, key, output_dir, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    캐시에 있으면 결과 파일을 output_dir에 복사하고, 없으면 produce()를 실행해서 저장
+
+    Args:
+        produce: 실제 작업 함수. (JSON으로 저장 가능한 메타데이터, output_dir 안의 결과 파일 경로 리스트) 반환
+        key: cache_key() 결과
+        output_dir: 결과 파일이 놓일 폴더
+
+    Returns:
+        (메타데이터, 캐시 적중 여부)
+    """
+    conn = open_cache(cache_dir)
+    try:
+        meta = _restore(conn, cache_dir, key, output_dir)
+        if meta is not None:
+            return meta, True
+
+        STATS['misses'] += 1
+        started = time.process_time()
+        meta, paths = produce()
+        cpu_seconds = time.process_time() - started
+        _store(conn, cache_dir, key, output_dir, paths, meta, cpu_seconds)
+        return meta, False
+    finally:
+        conn.close()
+
+
+def evict(cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    캐시 크기가 max_bytes 이하가 될 때까지 오래 쓰지 않은 항목부터 삭제
+
+    Returns:
+        (삭제한 항목 수, 삭제한 바이트)
+    """
+    if not os.path.isdir(cache_dir):
+        return 0, 0
+    conn = open_cache(cache_dir)
+    try:
+        total = conn.execute('SELECT COALESCE(SUM(bytes), 0) FROM entries').fetchone()[0]
+        removed = 0
+        removed_bytes = 0
+        for row in conn.execute('SELECT key, bytes FROM entries ORDER BY last_used').fetchall():
+            if total <= max_bytes:
+                break
+            shutil.rmtree(_object_dir(cache_dir, row['key']), ignore_errors=True)
+            with conn:
+                conn.execute('DELETE FROM entries WHERE key = ?', (row['key'],))
+            total -= row['bytes']
+            removed += 1
+            removed_bytes += row['bytes']
+        return removed, removed_bytes
+    finally:
+        conn.close()
+
+
+def print_cache_report(stats):
+    """캐시 적중/미스와 아낀 CPU 시간 출력 (STATS 형식 dict)"""
+    if not stats['hits'] and not stats['misses']:
+        return
+    print(f"🗃️  캐시: 적중 {stats['hits']}개, 미스 {stats['misses']}개, "
+          f"아낀 CPU 시간 {stats['saved_seconds']:.1f}s")
@@ -1,13 +1,300 @@
 #!/usr/bin/env python3
 """
 단일 이미지 파일 압축 스크립트
+
+입력이 폴더이면 하위 폴더까지 모든 이미지를 프로세스 풀로 나눠 압축하고,
+출력 폴더에 같은 트리 구조로 저장한다.
+
+--target-size나 --min-ssim을 주면 고정 quality 대신, 목표 용량 이하이거나
+축소한 원본과의 SSIM이 기준 이상인 가장 낮은 quality를 이진 탐색으로 찾는다.
+
+--variants를 주면 원본을 한 번만 디코딩해서 여러 가로 크기(480/960/1440/1920)와
+형식(JPEG/WebP/AVIF)의 변형을 만들고, 앱과 업로드 스크립트가 기기 폭에 맞는
+변형을 고를 수 있도록 변형 목록 JSON을 함께 저장한다.
+
+--placeholders를 주면 이미 디코딩한 픽셀로 BlurHash, 16px LQIP, 대표 색을 계산해서
+결과 파일 옆 <이름>.placeholder.json (변형 모드는 변형 목록 JSON)에 함께 저장한다.
+
+--low-memory를 주면 8000px 같은 큰 원본의 메모리 사용을 줄인다.
+JPEG는 디코더에서 바로 축소(draft)해서 원래 해상도로 디코딩하지 않는다.
+PNG/WebP 등은 디코더 축소가 없어 원본 해상도 디코딩은 피할 수 없으므로, 정수배
+축소를 가로 띠 단위로 해서 원본 크기의 복사본(RGBA premultiply 등)을 만들지 않는다.
+나머지 축소만 LANCZOS로 처리하며, 투명도 합성은 축소 후에 한다.
+이미지마다 최대 메모리(peak RSS)와 원본 해상도 디코딩 여부를 출력해서 효과를 확인할 수 있다.
+
+사용법:
+    python compress_single_image.py assets/images/backgrounds/login_bg.png
+    python compress_single_image.py assets/images -o build/compressed -j 8
+    python compress_single_image.py assets/images --variants --widths 480,960,1440,1920
+    python compress_single_image.py assets/images --min-ssim 0.98 --target-size 300KB
+    python compress_single_image.py raw_art -o build/art -j 16 --low-memory
 """
 
+import io
+import json
 import os
-from PIL import Image
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from PIL import Image, features
 import argparse
 
-def compress_image(input_path, output_path, quality=85, max_width=1920):
+import compress_cache
+from compress_cache import (DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, cache_key, evict,
+                            print_cache_report, run_cached)
+from alpha_encode import CANDIDATE_EXTENSIONS, encode_transparent, has_transparency
+from image_placeholder import make_placeholder
+from image_quality import budget_met, luma, search_quality
+
+# 배치 모드에서 압축할 이미지 확장자
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp', '.tif', '.tiff')
+
+# 변형 생성 기본 가로 크기 / 형식
+DEFAULT_WIDTHS = (480, 960, 1440, 1920)
+DEFAULT_FORMATS = ('jpeg', 'webp', 'avif')
+
+# 형식별 확장자와 Pillow 저장 옵션
+FORMAT_EXTENSIONS = {'jpeg': 'jpg', 'webp': 'webp', 'avif': 'avif'}
+
+# --low-memory 축소 시 reduce()로 먼저 줄일 배율 여유
+# (Pillow 문서 기준 2.0 이상이면 전체 LANCZOS와 거의 구별되지 않고, 3.0보다 작게 해야
+#  8000px -> 1920px에서도 원본 크기 LANCZOS 없이 띠 단위 축소가 먼저 적용된다)
+REDUCING_GAP = 2.0
+
+# --low-memory 띠 단위 축소 시 한 번에 만들 결과 줄 수
+STRIP_ROWS = 256
+
+# 배치 변형 목록 파일 이름
+VARIANTS_MANIFEST = 'variants.json'
+
+# 배치 플레이스홀더 목록 파일 이름
+PLACEHOLDERS_MANIFEST = 'placeholders.json'
+
+# 이 프로세스에서 목표 용량/SSIM을 만족하지 못한 결과 수 (배치 요약용)
+BUDGET_STATS = {'missed': 0}
+
+# 이 프로세스에서 --low-memory인데 디코더 축소 없이 원본 해상도로 디코딩한 이미지 수
+LOW_MEMORY_STATS = {'full_decode': 0}
+
+def supported_formats(formats):
+    """이 Pillow 빌드에서 저장할 수 있는 형식만 남기기"""
+    available = []
+    for fmt in formats:
+        if fmt == 'avif' and not features.check('avif'):
+            try:
+                import pillow_avif  # noqa: F401  (Pillow 11.2 이전 버전용 플러그인)
+            except ImportError:
+                print("⚠️  AVIF 인코더가 없어 AVIF 변형은 건너뜁니다 (pip install pillow-avif-plugin).")
+                continue
+        available.append(fmt)
+    return available
+
+def flatten_to_rgb(img):
+    """RGBA를 RGB로 변환 (JPEG는 투명도 지원하지 않음)"""
+    if img.mode in ('RGBA', 'LA'):
+        # 흰색 배경으로 변환
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        return background
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+def resize_to_width(img, width, reducing_gap=None):
+    """가로 width에 맞춰 비율 유지 축소 (width보다 작으면 그대로)"""
+    if img.width <= width:
+        return img
+    new_height = int(img.height * width / img.width)
+    return img.resize((width, new_height), Image.Resampling.LANCZOS, reducing_gap=reducing_gap)
+
+def draft_to_width(img, max_width):
+    """
+    JPEG는 디코더에서 max_width 근처까지 미리 축소 (열기만 하고 load 전에 호출)
+    
+    draft()는 1/2, 1/4, 1/8 배율 중 요청 크기 이상인 가장 작은 크기로 디코딩하므로
+    이후 resize로 정확한 크기를 맞춘다. 다른 형식은 원본 해상도로 디코딩되므로
+    LOW_MEMORY_STATS['full_decode']에 센다.
+    """
+    if img.width <= max_width:
+        return
+    if img.format == 'JPEG':
+        img.draft(None, (max_width, int(img.height * max_width / img.width)))
+    else:
+        LOW_MEMORY_STATS['full_decode'] += 1
+
+def reduce_in_strips(img, factor, rows=STRIP_ROWS):
+    """
+    정수배 축소(reduce)를 가로 띠 단위로 하기
+    
+    reduce()/resize()는 RGBA를 통째로 RGBa(premultiply)로 바꾼 복사본을 만들어서
+    원본 크기만큼 메모리를 더 쓴다. factor의 배수 높이로 자른 띠마다 축소해서
+    붙이므로 결과는 reduce()와 같다.
+    """
+    if factor <= 1:
+        return img
+    band = rows * factor
+    reduced = Image.new(img.mode, (-(-img.width // factor), -(-img.height // factor)))
+    for top in range(0, img.height, band):
+        strip = img.crop((0, top, img.width, min(top + band, img.height)))
+        reduced.paste(strip.reduce(factor), (0, top // factor))
+    return reduced
+
+def reduce_for_width(img, width):
+    """
+    resize(reducing_gap=REDUCING_GAP)가 먼저 할 정수배 축소를 띠 단위로 미리 하기
+    
+    축소했으면 원본 픽셀은 더 쓰지 않으므로 img를 닫아서 메모리를 바로 돌려준다.
+    """
+    reduced = reduce_in_strips(img, int(img.width / width / REDUCING_GAP))
+    if reduced is not img:
+        img.close()
+    return reduced
+
+def normalize_mode(img):
+    """팔레트/흑백 등은 축소 품질을 위해 RGB(투명도가 있으면 RGBA)로 변환"""
+    if img.mode in ('RGB', 'RGBA'):
+        return img
+    return img.convert('RGBA' if 'A' in img.getbands() or 'transparency' in img.info else 'RGB')
+
+def reset_peak_rss():
+    """현재 프로세스의 최대 메모리 기록 초기화 (Linux에서만 가능, 아니면 무시)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def peak_rss():
+    """
+    현재 프로세스의 최대 메모리(peak RSS) 바이트
+    
+    Linux는 reset_peak_rss() 이후의 최대값, 다른 OS는 프로세스 전체 최대값이다.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    import sys
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    return usage if sys.platform == 'darwin' else usage * 1024
+
+def parse_size(text):
+    """'300KB', '1.5MB', '200000' 같은 크기 문자열을 바이트로 변환"""
+    text = text.strip().upper()
+    for suffix, factor in (('KB', 1024), ('MB', 1024 * 1024), ('B', 1)):
+        if text.endswith(suffix):
+            return int(float(text[:-len(suffix)]) * factor)
+    return int(text)
+
+def encode_image(img, fmt, quality):
+    """형식에 맞는 옵션으로 메모리에 인코딩해서 bytes 반환"""
+    buffer = io.BytesIO()
+    if fmt == 'jpeg':
+        flatten_to_rgb(img).save(buffer, 'JPEG', quality=quality, optimize=True)
+    elif fmt == 'webp':
+        img.save(buffer, 'WEBP', quality=quality, method=6)
+    elif fmt == 'avif':
+        img.save(buffer, 'AVIF', quality=quality)
+    else:
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+    return buffer.getvalue()
+
+def choose_encoding(img, fmt, quality=85, target_bytes=None, min_ssim=None):
+    """
+    목표가 있으면 quality를 탐색하고, 없으면 주어진 quality로 인코딩
+    
+    탐색 중에는 같은 축소 픽셀과 같은 비교 기준을 재사용한다.
+    
+    Returns:
+        (사용한 quality, 인코딩된 bytes, SSIM 또는 None)
+    """
+    if target_bytes is None and min_ssim is None:
+        return quality, encode_image(img, fmt, quality), None
+    
+    if fmt == 'jpeg':
+        img = flatten_to_rgb(img)
+    reference = luma(img) if min_ssim is not None else None
+    return search_quality(lambda q: encode_image(img, fmt, q), reference,
+                          target_bytes=target_bytes, min_ssim=min_ssim)
+
+def save_encoded(img, output_path, fmt, quality, target_bytes=None, min_ssim=None):
+    """
+    형식에 맞는 옵션으로 저장
+    
+    Returns:
+        (사용한 quality, SSIM 또는 None)
+    """
+    chosen, data, score = choose_encoding(img, fmt, quality, target_bytes, min_ssim)
+    with open(output_path, 'wb') as f:
+        f.write(data)
+    return chosen, score
+
+def check_budget(path, size, score, target_bytes=None, min_ssim=None):
+    """
+    quality 탐색 결과가 목표를 만족하지 못했으면 경고를 출력하고 BUDGET_STATS에 기록
+    
+    Returns:
+        목표를 만족했는지 (목표가 없으면 True)
+    """
+    if budget_met(size, score, target_bytes, min_ssim):
+        return True
+    BUDGET_STATS['missed'] += 1
+    reasons = []
+    if target_bytes is not None and size > target_bytes:
+        reasons.append(f"{size / 1024:.0f}KB > 목표 {target_bytes / 1024:.0f}KB")
+    if min_ssim is not None and score is not None and score < min_ssim:
+        reasons.append(f"SSIM {score:.4f} < 목표 {min_ssim}")
+    print(f"⚠️  목표 미달 (가장 가까운 quality 사용) {path}: {', '.join(reasons)}")
+    return False
+
+def save_transparent(img, input_path, output_path, resized, colors=256, dither=True):
+    """
+    투명도를 유지한 채 가장 작은 형식으로 저장 (alpha_encode 참고)
+    
+    축소하지 않았고 원본 PNG/WebP가 모든 후보보다 작으면 원본을 그대로 복사한다.
+    출력 확장자는 선택된 형식에 맞게 바뀐다.
+    
+    Returns:
+        (선택한 후보 이름, 실제 저장 경로, {후보 이름: 바이트 수})
+    """
+    name, data, sizes = encode_transparent(img, colors, dither)
+    extension = CANDIDATE_EXTENSIONS[name]
+    
+    source_extension = Path(input_path).suffix.lower()
+    if not resized and source_extension in ('.png', '.webp'):
+        sizes['original'] = os.path.getsize(input_path)
+        if sizes['original'] <= len(data):
+            name = 'original'
+            extension = source_extension[1:]
+            with open(input_path, 'rb') as f:
+                data = f.read()
+    
+    path = str(Path(output_path).with_suffix(f'.{extension}'))
+    with open(path, 'wb') as f:
+        f.write(data)
+    return name, path, sizes
+
+def placeholder_path(image_path):
+    """이미지 옆 플레이스홀더 JSON 경로 (a.jpg -> a.placeholder.json)"""
+    return str(Path(image_path).with_suffix('.placeholder.json'))
+
+def write_placeholder(img, image_path):
+    """저장 직전의 이미지로 플레이스홀더를 계산해서 이미지 옆에 저장"""
+    placeholder = make_placeholder(img)
+    path = placeholder_path(image_path)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(placeholder, f, indent=2, ensure_ascii=False)
+    return placeholder, path
+
+def compress_image(input_path, output_path, quality=85, max_width=1920, verbose=True,
+                   target_bytes=None, min_ssim=None, cache_dir=None, low_memory=False,
+                   flatten_alpha=False, palette_colors=256, dither=True, placeholders=False):
     """
     이미지를 압축합니다.
     
@@ -16,56 +303,461 @@ def compress_image(input_path, output_path, quality=85, max_width=1920):
         output_path: 출력 이미지 경로  
         quality: JPEG 품질 (1-100)
         max_width: 최대 가로 크기
+        verbose: 진행 상황 출력 여부 (배치 모드에서는 끔)
+        target_bytes: 주면 이 크기 이하가 되는 가장 높은 quality 사용
+        min_ssim: 주면 SSIM이 이 값 이상인 가장 낮은 quality 사용
+        cache_dir: 주면 원본과 옵션이 같은 이전 결과를 캐시에서 복사 (compress_cache 참고)
+        low_memory: 디코더 축소(draft, JPEG만) + 띠 단위 reducing_gap 축소 후 투명도 합성
+        flatten_alpha: 투명 이미지도 흰 배경에 합성해서 JPEG로 저장
+            (기본값은 투명도를 유지하는 PNG/WebP 중 가장 작은 것으로 저장)
+        palette_colors: 투명 이미지 팔레트 PNG 색 수
+        dither: 투명 이미지 팔레트 양자화 시 디더링 여부
+        placeholders: 결과 옆에 <이름>.placeholder.json (BlurHash, LQIP, 대표 색) 저장
+    
+    Returns:
+        실제 저장한 파일 경로 (투명 이미지는 확장자가 .png/.webp로 바뀜), 실패하면 None
     """
-    try:
+    def produce():
         with Image.open(input_path) as img:
-            print(f"원본 이미지: {input_path}")
-            print(f"원본 크기: {img.size}")
-            
-            # RGBA를 RGB로 변환 (JPEG는 투명도 지원하지 않음)
-            if img.mode in ('RGBA', 'LA'):
-                # 흰색 배경으로 변환
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'RGBA':
-                    background.paste(img, mask=img.split()[-1])
-                else:
-                    background.paste(img, mask=img.split()[-1])
-                img = background
-            elif img.mode != 'RGB':
-                img = img.convert('RGB')
+            if verbose:
+                print(f"원본 이미지: {input_path}")
+                print(f"원본 크기: {img.size}")
             
-            # 크기 조정 (필요한 경우)
-            if img.width > max_width:
-                ratio = max_width / img.width
-                new_height = int(img.height * ratio)
-                img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
-                print(f"크기 조정됨: {img.size}")
+            if low_memory:
+                draft_to_width(img, max_width)
             
-            # 압축된 이미지 저장
-            img.save(output_path, 'JPEG', quality=quality, optimize=True)
+            if not flatten_alpha and has_transparency(img):
+                # 투명 UI 이미지: 투명도 유지, 무손실/팔레트 후보 중 가장 작은 것
+                img = normalize_mode(img)
+                resized = img.width > max_width
+                if resized:
+                    if low_memory:
+                        img = reduce_for_width(img, max_width)
+                    img = resize_to_width(img, max_width,
+                                          reducing_gap=REDUCING_GAP if low_memory else None)
+                    if verbose:
+                        print(f"크기 조정됨: {img.size}")
+                name, path, sizes = save_transparent(img, input_path, output_path, resized,
+                                                     palette_colors, dither)
+                meta = {'encoder': name, 'path': os.path.basename(path), 'candidates': sizes,
+                        'quality': None, 'ssim': None}
+                paths = [path]
+                if placeholders:
+                    meta['placeholder'], extra = write_placeholder(img, path)
+                    paths.append(extra)
+                return meta, paths
             
-            # 파일 크기 비교
-            original_size = os.path.getsize(input_path)
-            compressed_size = os.path.getsize(output_path)
-            compression_ratio = (original_size - compressed_size) / original_size * 100
+            if low_memory:
+                # 디코더 축소 후 작은 이미지에서 흰 배경 합성
+                img = normalize_mode(img)
+                if img.width > max_width:
+                    img = reduce_for_width(img, max_width)
+                    img = resize_to_width(img, max_width, reducing_gap=REDUCING_GAP)
+                    if verbose:
+                        print(f"크기 조정됨: {img.size}")
+                img = flatten_to_rgb(img)
+            else:
+                # RGBA를 RGB로 변환 (JPEG는 투명도 지원하지 않음)
+                img = flatten_to_rgb(img)
+                
+                # 크기 조정 (필요한 경우)
+                if img.width > max_width:
+                    img = resize_to_width(img, max_width)
+                    if verbose:
+                        print(f"크기 조정됨: {img.size}")
             
+            # 압축된 이미지 저장
+            chosen, score = save_encoded(img, output_path, 'jpeg', quality, target_bytes, min_ssim)
+            meta = {'encoder': 'jpeg', 'path': os.path.basename(output_path),
+                    'quality': chosen, 'ssim': score}
+            paths = [output_path]
+            if placeholders:
+                meta['placeholder'], extra = write_placeholder(img, output_path)
+                paths.append(extra)
+            return meta, paths
+    
+    try:
+        if cache_dir:
+            key = cache_key(input_path, kind='jpeg', quality=quality, max_width=max_width,
+                            target_bytes=target_bytes, min_ssim=min_ssim, low_memory=low_memory,
+                            flatten_alpha=flatten_alpha, palette_colors=palette_colors, dither=dither,
+                            placeholders=placeholders, name=os.path.basename(output_path))
+            meta, hit = run_cached(produce, key, os.path.dirname(output_path) or '.', cache_dir)
+            if verbose and hit:
+                print(f"🗃️  캐시 사용: {input_path}")
+        else:
+            meta, _ = produce()
+        
+        output_path = os.path.join(os.path.dirname(output_path), meta['path'])
+        if verbose and meta['encoder'] != 'jpeg':
+            candidates = ', '.join(f"{name} {size / 1024:.0f}KB" for name, size in meta['candidates'].items())
+            print(f"투명 이미지: {meta['encoder']} 선택 ({candidates})")
+        if verbose and meta['encoder'] == 'jpeg' and (target_bytes is not None or min_ssim is not None):
+            print(f"품질 자동 선택: {meta['quality']}"
+                  + (f" (SSIM {meta['ssim']:.4f})" if meta['ssim'] is not None else ""))
+        
+        # 파일 크기 비교
+        original_size = os.path.getsize(input_path)
+        compressed_size = os.path.getsize(output_path)
+        if meta['encoder'] == 'jpeg':
+            check_budget(output_path, compressed_size, meta['ssim'], target_bytes, min_ssim)
+        compression_ratio = (original_size - compressed_size) / original_size * 100
+        
+        if verbose:
             print(f"압축 완료: {output_path}")
             print(f"원본 크기: {original_size:,} bytes ({original_size/1024/1024:.1f} MB)")
             print(f"압축 크기: {compressed_size:,} bytes ({compressed_size/1024/1024:.1f} MB)")
             print(f"압축률: {compression_ratio:.1f}%")
+        
+        return output_path
+        
+    except Exception as e:
+        print(f"❌ 압축 실패 {input_path}: {e}")
+        return None
+
+def generate_variants(input_path, output_dir, widths=DEFAULT_WIDTHS, formats=DEFAULT_FORMATS,
+                      quality=85, stem=None, target_bytes=None, min_ssim=None, cache_dir=None,
+                      low_memory=False, placeholders=False):
+    """
+    원본을 한 번만 디코딩해서 가로 크기 x 형식 변형 만들기
+    
+    원본보다 큰 가로 크기는 만들지 않고, 대신 원본 크기 변형을 하나 넣는다.
+    
+    Args:
+        input_path: 입력 이미지 경로
+        output_dir: 변형을 저장할 폴더
+        widths: 가로 크기 목록
+        formats: 형식 목록 (jpeg, webp, avif)
+        quality: 인코딩 품질 (1-100)
+        stem: 출력 파일 이름 앞부분 (기본값: 입력 파일 이름)
+        target_bytes, min_ssim: 주면 변형마다 quality 탐색 (compress_image 참고)
+        cache_dir: 주면 원본과 옵션이 같은 이전 결과를 캐시에서 복사
+        low_memory: 가장 큰 변형 크기로 디코더 축소(JPEG만)와 띠 단위 정수배 축소 후
+            reducing_gap으로 축소
+        placeholders: 가장 작은 변형 픽셀로 계산한 플레이스홀더를 'placeholder'에 추가
+    
+    Returns:
+        {'source', 'width', 'height', 'placeholder'(선택),
+         'variants': [{'width', 'height', 'format', 'path', 'bytes', 'quality', 'ssim'}]}
+    """
+    stem = stem or Path(input_path).stem
+    os.makedirs(output_dir, exist_ok=True)
+    
+    def produce():
+        reducing_gap = REDUCING_GAP if low_memory else None
+        with Image.open(input_path) as img:
+            source_width, source_height = img.size
+            if low_memory:
+                draft_to_width(img, max(widths))
+            img.load()
+            # WebP/AVIF는 투명도를 유지하고, JPEG 저장 시에만 흰 배경으로 합성
+            img = normalize_mode(img)
+        
+            targets = sorted({min(width, source_width) for width in widths}, reverse=True)
+            if low_memory:
+                img = reduce_for_width(img, targets[0])
+            variants = []
+            for width in targets:
+                resized = resize_to_width(img, width, reducing_gap=reducing_gap)
+                for fmt in formats:
+                    filename = f"{stem}_{resized.width}w.{FORMAT_EXTENSIONS[fmt]}"
+                    output_path = os.path.join(output_dir, filename)
+                    chosen, score = save_encoded(resized, output_path, fmt, quality, target_bytes, min_ssim)
+                    variants.append({
+                        'width': resized.width,
+                        'height': resized.height,
+                        'format': fmt,
+                        'path': filename,
+                        'bytes': os.path.getsize(output_path),
+                        'quality': chosen,
+                        'ssim': round(score, 4) if score is not None else None,
+                    })
             
-            return True
-            
+            # 마지막 resized가 가장 작은 변형
+            placeholder = make_placeholder(resized, (source_width, source_height)) if placeholders else None
+    
+        info = {
+            'source': Path(input_path).name,
+            'width': source_width,
+            'height': source_height,
+            'variants': sorted(variants, key=lambda v: (v['width'], v['format'])),
+        }
+        if placeholder:
+            info['placeholder'] = placeholder
+        return info, [os.path.join(output_dir, v['path']) for v in info['variants']]
+    
+    if not cache_dir:
+        info = produce()[0]
+    else:
+        key = cache_key(input_path, kind='variants', widths=sorted(widths), formats=list(formats),
+                        quality=quality, stem=stem, target_bytes=target_bytes, min_ssim=min_ssim,
+                        low_memory=low_memory, placeholders=placeholders)
+        info = run_cached(produce, key, output_dir, cache_dir)[0]
+    for variant in info['variants']:
+        check_budget(os.path.join(output_dir, variant['path']), variant['bytes'], variant['ssim'],
+                     target_bytes, min_ssim)
+    return info
+
+def _cache_counts():
+    """이 프로세스의 캐시 통계 (작업 하나의 변화량 계산용)"""
+    return dict(compress_cache.STATS)
+
+def _cache_delta(before):
+    return {key: compress_cache.STATS[key] - before[key] for key in before}
+
+def _variants_worker(input_path, output_dir, widths, formats, quality, **options):
+    """프로세스 풀에서 실행되는 파일 하나 변형 생성 (배치 결과 dict 반환)"""
+    started = time.time()
+    cache_before = _cache_counts()
+    missed_before = BUDGET_STATS['missed']
+    full_decode_before = LOW_MEMORY_STATS['full_decode']
+    reset_peak_rss()
+    result = {
+        'input': input_path,
+        'output': output_dir,
+        'success': False,
+        'original_size': os.path.getsize(input_path),
+        'compressed_size': 0,
+        'elapsed': 0.0,
+        'variants': None,
+    }
+    try:
+        result['variants'] = generate_variants(input_path, output_dir, widths, formats, quality, **options)
+        result['compressed_size'] = sum(v['bytes'] for v in result['variants']['variants'])
+        result['success'] = True
     except Exception as e:
-        print(f"❌ 압축 실패: {e}")
-        return False
+        print(f"❌ 변형 생성 실패 {input_path}: {e}")
+    result['elapsed'] = time.time() - started
+    result['cache'] = _cache_delta(cache_before)
+    result['budget_missed'] = BUDGET_STATS['missed'] - missed_before
+    result['full_decode'] = LOW_MEMORY_STATS['full_decode'] > full_decode_before
+    result['peak_rss'] = peak_rss()
+    return result
+
+def _compress_worker(input_path, output_path, quality, max_width, **options):
+    """프로세스 풀에서 실행되는 파일 하나 압축 (결과 dict 반환)"""
+    started = time.time()
+    cache_before = _cache_counts()
+    missed_before = BUDGET_STATS['missed']
+    full_decode_before = LOW_MEMORY_STATS['full_decode']
+    reset_peak_rss()
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    saved_path = compress_image(input_path, output_path, quality, max_width, verbose=False, **options)
+    result = {
+        'input': input_path,
+        'output': saved_path or output_path,
+        'success': saved_path is not None,
+        'original_size': os.path.getsize(input_path),
+        'compressed_size': os.path.getsize(saved_path) if saved_path else 0,
+        'elapsed': time.time() - started,
+        'cache': _cache_delta(cache_before),
+        'budget_missed': BUDGET_STATS['missed'] - missed_before,
+        'full_decode': LOW_MEMORY_STATS['full_decode'] > full_decode_before,
+        'peak_rss': peak_rss(),
+        'placeholder': None,
+    }
+    if saved_path and options.get('placeholders'):
+        with open(placeholder_path(saved_path), encoding='utf-8') as f:
+            result['placeholder'] = json.load(f)
+    return result
+
+def scan_image_tree(input_dir, exclude_dir=None):
+    """폴더 트리에서 이미지 파일 목록 수집 (출력 폴더가 안에 있으면 제외)"""
+    exclude = Path(exclude_dir).resolve() if exclude_dir else None
+    return sorted(
+        path for path in Path(input_dir).rglob('*')
+        if path.is_file() and path.suffix.lower() in IMAGE_EXTENSIONS
+        and not (exclude and exclude in path.resolve().parents)
+    )
+
+def output_collisions(images, input_dir):
+    """
+    확장자만 다른 입력 파일 찾기 (a.png와 a.jpg는 출력 a.jpg, 변형, 목록 키가 겹침)
+
+    Returns:
+        {상대 경로(확장자 제외): [입력 파일, ...]} (겹치는 것만)
+    """
+    stems = {}
+    for image_path in images:
+        stems.setdefault(image_path.relative_to(input_dir).with_suffix('').as_posix(), []).append(image_path)
+    return {stem: paths for stem, paths in stems.items() if len(paths) > 1}
+
+def compress_directory(input_dir, output_dir, quality=85, max_width=1920, workers=None,
+                       widths=None, formats=DEFAULT_FORMATS, target_bytes=None, min_ssim=None,
+                       cache_dir=None, low_memory=False, placeholders=False, **alpha_options):
+    """
+    폴더 트리의 모든 이미지를 프로세스 풀로 압축
+    
+    Args:
+        input_dir: 입력 폴더 (하위 폴더 포함)
+        output_dir: 출력 폴더 (입력과 같은 트리 구조로 저장)
+        quality: JPEG 품질 (1-100)
+        max_width: 최대 가로 크기
+        workers: 프로세스 수 (기본값: CPU 코어 수)
+        widths: 주면 파일 하나 대신 가로 크기별 변형을 만들고
+            출력 폴더에 variants.json (상대 경로 -> 변형 목록) 저장
+        formats: 변형 형식 목록
+        target_bytes, min_ssim: 주면 파일(변형)마다 quality 탐색
+        cache_dir: 주면 압축 결과 캐시 사용
+        low_memory: 메모리를 적게 쓰는 디코딩/축소 경로 사용
+        placeholders: 파일마다 플레이스홀더를 저장하고 출력 폴더에 placeholders.json 저장
+            (변형 모드는 variants.json에 포함)
+        alpha_options: 투명 이미지 옵션 (flatten_alpha, palette_colors, dither)
+    
+    Returns:
+        파일별 결과 dict 리스트
+    """
+    images = scan_image_tree(input_dir, exclude_dir=output_dir)
+    if not images:
+        print(f"❌ 압축할 이미지가 없습니다: {input_dir}")
+        return []
+    
+    # 출력 파일이 서로 덮어쓰지 않도록 시작 전에 중단
+    collisions = output_collisions(images, input_dir)
+    if collisions:
+        print(f"❌ 확장자만 다른 파일은 출력 이름이 겹쳐서 압축할 수 없습니다 ({len(collisions)}개):")
+        for paths in collisions.values():
+            print(f"   {', '.join(str(path) for path in paths)}")
+        return []
+    
+    workers = workers or os.cpu_count() or 1
+    print(f"📁 {len(images)}개 이미지 압축 중 (프로세스 {workers}개)...")
+    
+    options = {'target_bytes': target_bytes, 'min_ssim': min_ssim, 'cache_dir': cache_dir,
+               'low_memory': low_memory, 'placeholders': placeholders}
+    compress_options = dict(options, **alpha_options)
+    started = time.time()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for image_path in images:
+            relative = image_path.relative_to(input_dir)
+            if widths:
+                futures.append(executor.submit(
+                    _variants_worker, str(image_path), str(Path(output_dir) / relative.parent),
+                    widths, formats, quality, **options))
+            else:
+                output_path = str(Path(output_dir) / relative.with_suffix('.jpg'))
+                futures.append(executor.submit(
+                    _compress_worker, str(image_path), output_path, quality, max_width, **compress_options))
+        
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if result['success']:
+                print(f"✅ {result['input']} -> {result['output']} "
+                      f"({result['original_size'] / 1024:.0f}KB -> {result['compressed_size'] / 1024:.0f}KB, "
+                      f"peak {result['peak_rss'] / 1024 / 1024:.0f}MB"
+                      + (", 원본 해상도 디코딩" if result['full_decode'] else "") + ")")
+    
+    if widths:
+        save_variants_manifest(input_dir, output_dir, results)
+    elif placeholders:
+        save_placeholders_manifest(input_dir, output_dir, results)
+    print_batch_report(results, time.time() - started)
+    return results
+
+def save_variants_manifest(input_dir, output_dir, results):
+    """
+    배치 변형 목록 저장: {입력 기준 상대 경로(확장자 제외): 변형 정보}
+    
+    변형의 path는 출력 폴더 기준 상대 경로라서, 업로드 시 같은 구조로 올리면
+    그대로 원격 경로 뒤쪽이 된다.
+    """
+    manifest = {}
+    for result in results:
+        if not result['success']:
+            continue
+        relative = Path(result['input']).relative_to(input_dir)
+        entry = dict(result['variants'])
+        entry['variants'] = [
+            dict(v, path=(relative.parent / v['path']).as_posix()) for v in entry['variants']
+        ]
+        manifest[relative.with_suffix('').as_posix()] = entry
+    
+    manifest_path = Path(output_dir) / VARIANTS_MANIFEST
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=2, ensure_ascii=False)
+    print(f"💾 변형 목록 저장됨: {manifest_path}")
+
+def save_placeholders_manifest(input_dir, output_dir, results):
+    """배치 플레이스홀더 목록 저장: {입력 기준 상대 경로(확장자 제외): 플레이스홀더}"""
+    manifest = {
+        Path(result['input']).relative_to(input_dir).with_suffix('').as_posix(): result['placeholder']
+        for result in results if result['success'] and result['placeholder']
+    }
+    manifest_path = Path(output_dir) / PLACEHOLDERS_MANIFEST
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=2, ensure_ascii=False)
+    print(f"💾 플레이스홀더 목록 저장됨: {manifest_path}")
+
+def print_batch_report(results, wall_time):
+    """배치 압축 결과 요약"""
+    succeeded = [r for r in results if r['success']]
+    original = sum(r['original_size'] for r in succeeded)
+    compressed = sum(r['compressed_size'] for r in succeeded)
+    
+    print(f"\n📊 배치 압축 결과: 성공 {len(succeeded)}개, 실패 {len(results) - len(succeeded)}개")
+    print(f"원본 합계: {original:,} bytes ({original/1024/1024:.1f} MB)")
+    print(f"압축 합계: {compressed:,} bytes ({compressed/1024/1024:.1f} MB)")
+    if original:
+        print(f"압축률: {(original - compressed) / original * 100:.1f}%")
+    missed = sum(r['budget_missed'] for r in results)
+    if missed:
+        print(f"⚠️  목표 용량/SSIM 미달: {missed}개 (가장 가까운 quality로 저장)")
+    if wall_time > 0:
+        print(f"⏱️  {wall_time:.1f}s ({len(results) / wall_time:.1f}개/s)")
+    if results:
+        peaks = [r['peak_rss'] for r in results]
+        print(f"🧠 이미지별 최대 메모리: 평균 {sum(peaks) / len(peaks) / 1024 / 1024:.0f}MB, "
+              f"최대 {max(peaks) / 1024 / 1024:.0f}MB")
+        full_decodes = sum(r['full_decode'] for r in results)
+        if full_decodes:
+            print(f"ℹ️  --low-memory 디코더 축소는 JPEG만 가능: {full_decodes}개는 원본 해상도로 디코딩")
+    
+    # 작업 프로세스별 캐시 통계 합산
+    cache_stats = {key: sum(r['cache'][key] for r in results) for key in compress_cache.STATS}
+    print_cache_report(cache_stats)
+
+def finish_cache(cache_dir, max_bytes):
+    """캐시 크기 한도 적용 (LRU 정리)"""
+    if not cache_dir:
+        return
+    removed, removed_bytes = evict(cache_dir, max_bytes)
+    if removed:
+        print(f"🧹 캐시 정리: {removed}개 항목 삭제 ({removed_bytes / 1024 / 1024:.1f}MB)")
 
 def main():
-    parser = argparse.ArgumentParser(description='단일 이미지 압축')
-    parser.add_argument('input', help='입력 이미지 파일 경로')
-    parser.add_argument('-o', '--output', help='출력 이미지 파일 경로')
+    parser = argparse.ArgumentParser(description='단일 이미지 압축 (폴더를 주면 배치 압축)')
+    parser.add_argument('input', help='입력 이미지 파일 또는 폴더 경로')
+    parser.add_argument('-o', '--output', help='출력 이미지 파일 경로 (폴더 입력이면 출력 폴더)')
     parser.add_argument('-q', '--quality', type=int, default=85, help='JPEG 품질 (1-100, 기본값: 85)')
     parser.add_argument('-w', '--width', type=int, default=1920, help='최대 가로 크기 (기본값: 1920)')
+    parser.add_argument('-j', '--workers', type=int, help='배치 모드 프로세스 수 (기본값: CPU 코어 수)')
+    parser.add_argument('--variants', action='store_true',
+                        help='가로 크기 x 형식별 변형과 변형 목록 JSON 생성')
+    parser.add_argument('--widths', default=','.join(map(str, DEFAULT_WIDTHS)),
+                        help=f"변형 가로 크기 목록 (기본값: {','.join(map(str, DEFAULT_WIDTHS))})")
+    parser.add_argument('--formats', default=','.join(DEFAULT_FORMATS),
+                        help=f"변형 형식 목록 (기본값: {','.join(DEFAULT_FORMATS)})")
+    parser.add_argument('--target-size', type=parse_size,
+                        help='목표 파일 크기 (예: 300KB, 1.5MB). 이 크기 이하인 가장 높은 quality 사용')
+    parser.add_argument('--min-ssim', type=float,
+                        help='최소 SSIM (예: 0.98). 이 값 이상인 가장 낮은 quality 사용')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'압축 결과 캐시 폴더 (기본값: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--cache-size', type=parse_size, default=DEFAULT_MAX_BYTES,
+                        help=f'캐시 최대 크기 (기본값: {DEFAULT_MAX_BYTES // 1024 // 1024}MB)')
+    parser.add_argument('--no-cache', action='store_true', help='캐시를 쓰지 않고 항상 새로 압축')
+    parser.add_argument('--flatten-alpha', action='store_true',
+                        help='투명 이미지도 흰 배경에 합성해서 JPEG로 저장 (기본값: 투명도 유지 PNG/WebP)')
+    parser.add_argument('--colors', type=int, default=256, help='투명 이미지 팔레트 PNG 색 수 (기본값: 256)')
+    parser.add_argument('--no-dither', action='store_true', help='투명 이미지 팔레트 양자화 시 디더링 끄기')
+    parser.add_argument('--placeholders', action='store_true',
+                        help='BlurHash, 16px LQIP, 대표 색을 계산해서 결과 옆에 저장')
+    parser.add_argument('--low-memory', action='store_true',
+                        help='큰 원본용 저메모리 경로 (디코더 축소는 JPEG만, 띠 단위 reducing_gap 축소, '
+                             '축소 후 투명도 합성)')
     
     args = parser.parse_args()
     
@@ -73,6 +765,39 @@ def main():
         print(f"❌ 입력 파일을 찾을 수 없습니다: {args.input}")
         return
     
+    widths = [int(width) for width in args.widths.split(',')] if args.variants else None
+    formats = supported_formats(args.formats.split(','))
+    cache_dir = None if args.no_cache else args.cache_dir
+    options = {'target_bytes': args.target_size, 'min_ssim': args.min_ssim, 'cache_dir': cache_dir,
+               'low_memory': args.low_memory, 'placeholders': args.placeholders}
+    alpha_options = {'flatten_alpha': args.flatten_alpha, 'palette_colors': args.colors,
+                     'dither': not args.no_dither}
+    
+    # 폴더 입력: 배치 압축
+    if os.path.isdir(args.input):
+        output_dir = args.output or f"{args.input.rstrip(os.sep)}_compressed"
+        print("🔧 배치 압축 시작...")
+        compress_directory(args.input, output_dir, args.quality, args.width, args.workers,
+                           widths=widths, formats=formats, **options, **alpha_options)
+        finish_cache(cache_dir, args.cache_size)
+        return
+    
+    # 파일 입력 + 변형 생성
+    if widths:
+        output_dir = args.output or os.path.dirname(args.input) or '.'
+        print("🔧 변형 생성 시작...")
+        info = generate_variants(args.input, output_dir, widths, formats, args.quality, **options)
+        manifest_path = os.path.join(output_dir, f"{Path(args.input).stem}.variants.json")
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(info, f, indent=2, ensure_ascii=False)
+        for variant in info['variants']:
+            print(f"  {variant['path']}: {variant['width']}x{variant['height']} "
+                  f"({variant['bytes'] / 1024:.0f}KB, q{variant['quality']})")
+        print(f"✅ 변형 {len(info['variants'])}개 생성, 목록: {manifest_path}")
+        print_cache_report(compress_cache.STATS)
+        finish_cache(cache_dir, args.cache_size)
+        return
+    
     # 출력 경로 설정
     if args.output:
         output_path = args.output
@@ -82,12 +807,18 @@ def main():
     
     # 압축 실행
     print("🔧 이미지 압축 시작...")
-    success = compress_image(args.input, output_path, args.quality, args.width)
+    reset_peak_rss()
+    success = compress_image(args.input, output_path, args.quality, args.width, **options, **alpha_options)
+    print(f"🧠 최대 메모리: {peak_rss() / 1024 / 1024:.0f}MB")
+    if LOW_MEMORY_STATS['full_decode']:
+        print("ℹ️  --low-memory 디코더 축소는 JPEG만 가능해서 원본 해상도로 디코딩했습니다")
     
     if success:
         print("✅ 압축이 완료되었습니다!")
     else:
         print("❌ 압축에 실패했습니다.")
+    print_cache_report(compress_cache.STATS)
+    finish_cache(cache_dir, args.cache_size)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
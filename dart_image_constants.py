@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+버킷 인덱스로 Dart 상수 파일(lib/constants/storage_images.dart) 만들기
+
+ImageService.getImageUrl은 경로마다 Firebase Storage getDownloadURL을 호출하고,
+운세 배경은 없는 파일을 찾느라 최대 8번까지 차례로 요청한다. 업로드 스크립트는
+공개 URL을 이미 모두 알고 있으므로, 로컬 버킷 인덱스(bucket_index.py)로
+아래 const map을 만들어 앱이 네트워크 요청 없이 URL을 찾게 한다.
+
+    StorageImages.paths      객체 경로(논리 이름) -> 공개 URL (내용 해시 이름이면 최신 해시 객체)
+    StorageImages.folders    폴더 -> 이름(확장자 없음) -> 공개 URL
+    StorageImages.variants   원본 객체 경로 -> 변형 목록 (selectVariantPath용)
+    StorageImages.prefixes   목록 전체를 가져온(refresh) prefix (참고용). 생성 뒤에
+                             다른 스크립트가 올린 객체는 paths에 없을 수 있으므로
+                             앱은 paths에 없으면 getDownloadURL로 확인한다
+
+업로드 스크립트가 끝날 때 다시 만들고, --check는 버킷 목록을 새로 가져와서
+파일과 다르면(드리프트) 추가/삭제된 경로를 출력하고 1로 종료한다 (CI용).
+
+사용법:
+    python dart_image_constants.py
+    python dart_image_constants.py --check
+"""
+
+import argparse
+import posixpath
+import re
+import sys
+
+from asset_catalog import public_url
+from asset_manifest import DEFAULT_BUCKET, object_stem, split_variant, variant_key
+from bucket_index import DEFAULT_INDEX_PATH, get_objects, open_index, refresh_prefix
+from fingerprint import current_objects
+
+DART_PATH = 'lib/constants/storage_images.dart'
+
+HEADER = """\
+// GENERATED CODE - DO NOT MODIFY BY HAND
+// dart_image_constants.py가 로컬 버킷 인덱스로 생성 (업로드 스크립트 실행 시 갱신)
+"""
+
+# 생성된 파일의 paths 항목 (드리프트 비교용)
+_PATH_LINE = re.compile(r"^    '((?:[^'\\]|\\.)*)': '", re.MULTILINE)
+
+
+def dart_string(value):
+    """작은따옴표 Dart 문자열 리터럴"""
+    escaped = value.replace('\\', '\\\\').replace("'", "\\'").replace('$', '\\$')
+    return f"'{escaped}'"
+
+
+def refreshed_prefixes(conn):
+    """
+    목록 전체를 가져온 적이 있는 prefix
+
+    upload_single_image.py처럼 객체 경로 하나를 prefix로 갱신한 기록은 폴더 목록이
+    아니므로 제외한다 ('' 또는 '/'로 끝나는 prefix만).
+    """
+    return sorted(row['prefix'] for row in conn.execute('SELECT prefix FROM refreshes')
+                  if row['prefix'] == '' or row['prefix'].endswith('/'))
+
+
+def render_dart(objects, prefixes, bucket_name=DEFAULT_BUCKET):
+    """
+    Dart 소스 만들기
+
+    Args:
+        objects: bucket_index.get_objects() 결과
+        prefixes: 목록 전체가 objects에 있는 prefix
+    """
+    paths = {}
+    folders = {}
+    variants = {}
+    # 키는 논리 이름, URL은 그 이름의 가장 최근 객체 (내용 해시 이름이면 해시 객체)
+    for logical, name in sorted(current_objects(objects).items()):
+        variant = split_variant(logical)
+        if variant:
+            base, width, fmt = variant
+            variants.setdefault(base, []).append((width, fmt, name))
+            continue
+        url = public_url(bucket_name, name)
+        paths[logical] = url
+        # 같은 이름이 확장자만 다르면 먼저 나온 것 사용
+        folders.setdefault(posixpath.dirname(logical), {}).setdefault(object_stem(logical), url)
+
+    lines = [HEADER, 'class StorageImages {']
+    lines.append(f"  static const String bucket = {dart_string(bucket_name)};")
+    lines.append('')
+    lines.append('  /// 생성 시점에 목록 전체를 가져온 prefix (이후 올린 객체는 [paths]에 없을 수 있음)')
+    lines.append('  static const List<String> prefixes = [')
+    lines.extend(f"    {dart_string(prefix)}," for prefix in prefixes)
+    lines.append('  ];')
+    lines.append('')
+    lines.append('  /// 객체 경로(내용 해시를 뺀 이름) -> 공개 URL')
+    lines.append('  static const Map<String, String> paths = {')
+    lines.extend(f"    {dart_string(name)}: {dart_string(url)}," for name, url in paths.items())
+    lines.append('  };')
+    lines.append('')
+    lines.append('  /// 폴더 -> 이름(확장자 없음) -> 공개 URL')
+    lines.append('  static const Map<String, Map<String, String>> folders = {')
+    for folder, names in sorted(folders.items()):
+        lines.append(f"    {dart_string(folder)}: {{")
+        lines.extend(f"      {dart_string(stem)}: {dart_string(url)}," for stem, url in sorted(names.items()))
+        lines.append('    },')
+    lines.append('  };')
+    lines.append('')
+    lines.append("  /// 원본 객체 경로 -> 변형 목록 (ImageService.selectVariantPath에 전달, 'path'는 URL)")
+    lines.append('  static const Map<String, List<Map<String, Object>>> variants = {')
+    for name in paths:
+        entries = variants.get(variant_key(name))
+        if not entries:
+            continue
+        lines.append(f"    {dart_string(name)}: [")
+        for width, fmt, variant in sorted(entries):
+            lines.append(f"      {{'width': {width}, 'format': {dart_string(fmt)}, "
+                         f"'path': {dart_string(public_url(bucket_name, variant))}}},")
+        lines.append('    ],')
+    lines.append('  };')
+    lines.append('')
+    lines.append('  /// [path]가 생성 시점에 목록 전체를 가져온 prefix 안에 있는지')
+    lines.append('  static bool covers(String path) => prefixes.any(path.startsWith);')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def build_dart(index_path=DEFAULT_INDEX_PATH, bucket_name=DEFAULT_BUCKET):
+    """인덱스로 Dart 소스 만들기"""
+    conn = open_index(index_path)
+    try:
+        return render_dart(get_objects(conn), refreshed_prefixes(conn), bucket_name)
+    finally:
+        conn.close()
+
+
+def write_dart_constants(bucket_name=DEFAULT_BUCKET, index_path=DEFAULT_INDEX_PATH,
+                         output=DART_PATH):
+    """Dart 상수 파일을 내용이 바뀐 경우에만 저장. 저장했으면 True"""
+    source = build_dart(index_path, bucket_name)
+    try:
+        with open(output, encoding='utf-8') as f:
+            if f.read() == source:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(source)
+    print(f"💾 Dart 상수 저장됨: {output}")
+    return True
+
+
+def path_drift(current, expected):
+    """두 Dart 소스의 paths 차이 (추가될 경로, 삭제될 경로)"""
+    old = set(_PATH_LINE.findall(current))
+    new = set(_PATH_LINE.findall(expected))
+    return sorted(new - old), sorted(old - new)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='버킷 인덱스로 Dart 이미지 URL 상수 만들기')
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH,
+                        help=f'버킷 인덱스 파일 (기본값: {DEFAULT_INDEX_PATH})')
+    parser.add_argument('-o', '--output', default=DART_PATH, help=f'Dart 파일 (기본값: {DART_PATH})')
+    parser.add_argument('--check', action='store_true',
+                        help='버킷 목록을 새로 가져와서 파일과 다르면 차이를 출력하고 1로 종료')
+    parser.add_argument('--no-refresh', action='store_true',
+                        help='--check에서 버킷 대신 현재 인덱스와 비교')
+    args = parser.parse_args()
+
+    if not args.check:
+        if not write_dart_constants(index_path=args.index, output=args.output):
+            print(f"✅ 변경 없음: {args.output}")
+        return
+
+    bucket_name = DEFAULT_BUCKET
+    if not args.no_refresh:
+        from upload_structured_images import init_firebase
+        bucket = init_firebase()
+        bucket_name = bucket.name
+        conn = open_index(args.index)
+        try:
+            for prefix in refreshed_prefixes(conn):
+                refresh_prefix(conn, bucket, prefix)
+        finally:
+            conn.close()
+
+    expected = build_dart(args.index, bucket_name)
+    try:
+        with open(args.output, encoding='utf-8') as f:
+            current = f.read()
+    except FileNotFoundError:
+        current = ''
+    if current == expected:
+        print(f"✅ {args.output}가 버킷과 일치합니다.")
+        return
+
+    added, removed = path_drift(current, expected)
+    print(f"⚠️  {args.output}가 버킷과 다릅니다.")
+    for name in added:
+        print(f"   ➕ {name}")
+    for name in removed:
+        print(f"   ➖ {name}")
+    if not added and not removed:
+        print("   (경로는 같고 폴더/변형/prefix 구성이 다름)")
+    print("👉 python dart_image_constants.py 로 다시 생성하세요.")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+지각 해시(pHash/dHash)로 비슷한 이미지 찾기
+
+assets/eidos_card_urls.json, assets/tag_image_urls.json은 카드/태그마다
+변형 이미지를 4개 이상 가리키고, 어떤 그룹은 서로 다른 폴더
+(eidos_images/golden_sage/...jpg, eidos_cards/..._N.png)를 함께 쓴다.
+같거나 거의 같은 이미지가 여러 번 저장/다운로드되고 있는지 확인한다.
+
+로컬 에셋과 원격 에셋마다 64비트 pHash(DCT)와 dHash(가로 밝기 차)를
+계산하고, pHash로 BK-tree를 만들어 해밍 거리 threshold 안의 이웃만 찾는다
+(모든 쌍을 비교하지 않음). dHash도 기준 안이면 같은 묶음으로 합친다.
+
+묶음마다 해상도가 가장 큰 이미지 하나만 남긴다고 보고,
+줄일 수 있는 저장 용량(원격/로컬 따로)과 앱의 다운로드 수를 출력한다.
+로컬 원본과 그것을 업로드한 원격 객체(내용이 같거나 파일 이름이 같음)는
+같은 에셋이므로 절약량에 넣지 않는다.
+
+사용법:
+    python find_duplicates.py
+    python find_duplicates.py --threshold 6 --json duplicates.json
+    python find_duplicates.py --no-remote --local assets/images
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import math
+import os
+import posixpath
+import time
+
+from PIL import Image
+
+from asset_catalog import (DEFAULT_LOCAL_ROOT, DEFAULT_MANIFESTS, DEFAULT_WORKERS, display_name,
+                           load_references, map_assets, scan_local_assets)
+from fingerprint import logical_name
+
+# 해시 크기 (8x8 = 64비트)
+HASH_SIZE = 8
+
+# pHash 계산용 축소 크기
+PHASH_SAMPLE = 32
+
+# 기본 해밍 거리 기준 (64비트 중)
+DEFAULT_PHASH_THRESHOLD = 8
+DEFAULT_DHASH_THRESHOLD = 10
+
+_DCT_TABLE = [
+    [math.cos((2 * x + 1) * u * math.pi / (2 * PHASH_SAMPLE)) for x in range(PHASH_SAMPLE)]
+    for u in range(HASH_SIZE)
+]
+
+
+def hamming(a, b):
+    """두 해시의 해밍 거리"""
+    return bin(a ^ b).count('1')
+
+
+def _bits_to_int(bits):
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+def dhash(img):
+    """가로로 이웃한 픽셀의 밝기 차 부호로 만든 64비트 해시"""
+    small = img.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS)
+    pixels = small.tobytes()
+    width = HASH_SIZE + 1
+    return _bits_to_int(
+        pixels[y * width + x + 1] > pixels[y * width + x]
+        for y in range(HASH_SIZE) for x in range(HASH_SIZE)
+    )
+
+
+def phash(img):
+    """32x32 흑백의 저주파 8x8 DCT 계수를 중앙값과 비교한 64비트 해시"""
+    small = img.convert('L').resize((PHASH_SAMPLE, PHASH_SAMPLE), Image.Resampling.LANCZOS)
+    pixels = small.tobytes()
+
+    # 분리 가능한 2D DCT-II (저주파 8x8만 계산)
+    rows = [
+        [sum(pixels[y * PHASH_SAMPLE + x] * _DCT_TABLE[u][x] for x in range(PHASH_SAMPLE))
+         for u in range(HASH_SIZE)]
+        for y in range(PHASH_SAMPLE)
+    ]
+    coefficients = [
+        sum(rows[y][u] * _DCT_TABLE[v][y] for y in range(PHASH_SAMPLE))
+        for v in range(HASH_SIZE) for u in range(HASH_SIZE)
+    ]
+    median = sorted(coefficients)[len(coefficients) // 2]
+    return _bits_to_int(value > median for value in coefficients)
+
+
+def hash_image(location, data):
+    """이미지 bytes 하나의 지각 해시와 정보 (asset_catalog.map_assets의 handle)"""
+    with Image.open(io.BytesIO(data)) as img:
+        width, height = img.size
+        # JPEG는 해시에 필요한 만큼만 작게 디코딩
+        img.draft('RGB', (PHASH_SAMPLE * 2, PHASH_SAMPLE * 2))
+        if img.mode in ('RGBA', 'LA', 'P'):
+            img = img.convert('RGBA')
+            background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+            img = Image.alpha_composite(background, img)
+        return {
+            'phash': phash(img),
+            'dhash': dhash(img),
+            'width': width,
+            'height': height,
+            'bytes': len(data),
+            'sha256': hashlib.sha256(data).hexdigest(),
+        }
+
+
+class BKTree:
+    """해밍 거리용 BK-tree (threshold 안의 이웃을 모든 쌍 비교 없이 찾기)"""
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, key, item):
+        node = self.root
+        if node is None:
+            self.root = [key, item, {}]
+            return
+        while True:
+            distance = hamming(key, node[0])
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [key, item, {}]
+                return
+            node = child
+
+    def search(self, key, radius):
+        """key와의 거리가 radius 이하인 (거리, item) 목록"""
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node_key, item, children = stack.pop()
+            distance = hamming(key, node_key)
+            if distance <= radius:
+                found.append((distance, item))
+            # 삼각 부등식: 자식 거리 d가 [distance-radius, distance+radius] 안인 것만 탐색
+            for child_distance, child in children.items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        return found
+
+
+def find_clusters(hashes, phash_threshold=DEFAULT_PHASH_THRESHOLD,
+                  dhash_threshold=DEFAULT_DHASH_THRESHOLD):
+    """
+    비슷한 이미지 묶음 찾기 (union-find)
+
+    Args:
+        hashes: {위치: hash_image() 결과}
+
+    Returns:
+        2개 이상인 묶음 리스트 [[위치, ...], ...]
+    """
+    locations = sorted(hashes)
+    parent = {location: location for location in locations}
+
+    def find(location):
+        while parent[location] != location:
+            parent[location] = parent[parent[location]]
+            location = parent[location]
+        return location
+
+    tree = BKTree()
+    for location in locations:
+        info = hashes[location]
+        for _, other in tree.search(info['phash'], phash_threshold):
+            if hamming(info['dhash'], hashes[other]['dhash']) <= dhash_threshold:
+                parent[find(location)] = find(other)
+        tree.add(info['phash'], location)
+
+    clusters = {}
+    for location in locations:
+        clusters.setdefault(find(location), []).append(location)
+    return [members for members in clusters.values() if len(members) > 1]
+
+
+def asset_stem(location):
+    """로컬/원격이 같은 에셋인지 비교할 이름 (폴더, 내용 해시, 확장자를 뺀 파일 이름)"""
+    name = logical_name(display_name(location).replace(os.sep, '/'))
+    return posixpath.splitext(posixpath.basename(name))[0]
+
+
+def summarize_cluster(members, hashes, references):
+    """
+    묶음 하나의 보고서 항목 (해상도가 가장 큰 이미지를 남긴다고 가정)
+
+    로컬 원본과 그 업로드본처럼 로컬/원격 양쪽에 같은 내용이나 같은 파일 이름이 있는
+    이미지는 같은 에셋(same_asset)으로 보고 절약량에 넣지 않는다.
+
+    Returns:
+        {'keep', 'drop', 'members', 'same_asset', 'local_bytes_saved', 'remote_bytes_saved',
+         'bytes_saved', 'downloads_saved'}
+    """
+    def rank(location):
+        info = hashes[location]
+        # 해상도 큰 것, 원격 에셋, 이름 순
+        return (-info['width'] * info['height'], location not in references, location)
+
+    ordered = sorted(members, key=rank)
+    keep, drop = ordered[0], ordered[1:]
+
+    sides = {True: [], False: []}
+    for location in members:
+        sides[location in references].append(location)
+    keys = {side: ({hashes[location]['sha256'] for location in locations},
+                   {asset_stem(location) for location in locations})
+            for side, locations in sides.items()}
+
+    def is_same_asset(location):
+        """반대쪽(로컬이면 원격, 원격이면 로컬)에 같은 내용이나 같은 이름이 있는지"""
+        digests, stems = keys[location not in references]
+        return hashes[location]['sha256'] in digests or asset_stem(location) in stems
+
+    same_asset = [location for location in drop if is_same_asset(location)]
+    counted = [location for location in drop if location not in same_asset]
+    local_bytes = sum(hashes[location]['bytes'] for location in counted if location not in references)
+    remote_bytes = sum(hashes[location]['bytes'] for location in counted if location in references)
+    return {
+        'keep': keep,
+        'drop': drop,
+        'members': [
+            {
+                'location': location,
+                'name': display_name(location),
+                'bytes': hashes[location]['bytes'],
+                'width': hashes[location]['width'],
+                'height': hashes[location]['height'],
+                'identical': hashes[location]['sha256'] == hashes[keep]['sha256'],
+                'phash_distance': hamming(hashes[location]['phash'], hashes[keep]['phash']),
+                'references': [f"{manifest}:{group}" for manifest, group in references.get(location, [])],
+            }
+            for location in ordered
+        ],
+        'same_asset': same_asset,
+        'local_bytes_saved': local_bytes,
+        'remote_bytes_saved': remote_bytes,
+        'bytes_saved': local_bytes + remote_bytes,
+        # 앱은 URL 목록의 참조마다 따로 내려받으므로, 버리는 원격 이미지의 참조 수만큼 줄어든다
+        'downloads_saved': sum(len(references.get(location, [])) for location in counted),
+    }
+
+
+def print_report(clusters, total_assets):
+    """묶음과 절약량 출력"""
+    print(f"\n🔍 비슷한 이미지 묶음: {len(clusters)}개 (전체 {total_assets}개 중)")
+    print("=" * 80)
+    for index, cluster in enumerate(sorted(clusters, key=lambda c: -c['bytes_saved']), 1):
+        print(f"\n#{index} 절약 원격 {cluster['remote_bytes_saved'] / 1024:.0f}KB, "
+              f"로컬 {cluster['local_bytes_saved'] / 1024:.0f}KB, "
+              f"다운로드 -{cluster['downloads_saved']}회")
+        for member in cluster['members']:
+            if member['location'] == cluster['keep']:
+                marker = '✅ 유지'
+            elif member['location'] in cluster['same_asset']:
+                marker = '🔁 로컬↔원격 같은 에셋'
+            else:
+                marker = '🟰 동일' if member['identical'] else f"≈ 거리 {member['phash_distance']}"
+            print(f"   {marker} {member['name']} ({member['width']}x{member['height']}, "
+                  f"{member['bytes'] / 1024:.0f}KB)")
+            for reference in member['references']:
+                print(f"        └── {reference}")
+
+    remote_bytes = sum(c['remote_bytes_saved'] for c in clusters)
+    local_bytes = sum(c['local_bytes_saved'] for c in clusters)
+    total_downloads = sum(c['downloads_saved'] for c in clusters)
+    print(f"\n📊 합치면 줄어드는 용량: 원격 {remote_bytes / 1024 / 1024:.2f}MB, "
+          f"로컬 {local_bytes / 1024 / 1024:.2f}MB, 다운로드: {total_downloads}회")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='지각 해시로 비슷한 이미지 찾기')
+    parser.add_argument('--manifests', default=DEFAULT_MANIFESTS,
+                        help=f'원격 URL 목록 JSON (기본값: {DEFAULT_MANIFESTS})')
+    parser.add_argument('--local', nargs='*', default=[DEFAULT_LOCAL_ROOT],
+                        help=f'로컬 에셋 폴더 (기본값: {DEFAULT_LOCAL_ROOT})')
+    parser.add_argument('--no-remote', action='store_true', help='원격 에셋은 검사하지 않음')
+    parser.add_argument('--threshold', type=int, default=DEFAULT_PHASH_THRESHOLD,
+                        help=f'pHash 해밍 거리 기준 (기본값: {DEFAULT_PHASH_THRESHOLD})')
+    parser.add_argument('--dhash-threshold', type=int, default=DEFAULT_DHASH_THRESHOLD,
+                        help=f'dHash 해밍 거리 기준 (기본값: {DEFAULT_DHASH_THRESHOLD})')
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'동시 다운로드/해시 계산 수 (기본값: {DEFAULT_WORKERS})')
+    parser.add_argument('--json', help='보고서를 JSON으로 저장할 경로')
+    args = parser.parse_args()
+
+    started = time.time()
+    hashes = {}
+    references = {}
+
+    local_paths = [path for root in args.local for path in scan_local_assets(root)]
+    if local_paths:
+        print(f"📁 로컬 에셋 {len(local_paths)}개 해시 계산 중...")
+        results, _ = map_assets(local_paths, hash_image, args.workers, remote=False)
+        hashes.update(results)
+
+    if not args.no_remote:
+        references = load_references(args.manifests)
+        print(f"🌐 원격 에셋 {len(references)}개 내려받아 해시 계산 중...")
+        results, _ = map_assets(list(references), hash_image, args.workers)
+        hashes.update(results)
+
+    clusters = [
+        summarize_cluster(members, hashes, references)
+        for members in find_clusters(hashes, args.threshold, args.dhash_threshold)
+    ]
+    print_report(clusters, len(hashes))
+    print(f"⏱️  {time.time() - started:.1f}s")
+
+    if args.json:
+        report = {
+            'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'phash_threshold': args.threshold,
+            'dhash_threshold': args.dhash_threshold,
+            'assets': len(hashes),
+            'remote_bytes_saved': sum(c['remote_bytes_saved'] for c in clusters),
+            'local_bytes_saved': sum(c['local_bytes_saved'] for c in clusters),
+            'bytes_saved': sum(c['bytes_saved'] for c in clusters),
+            'downloads_saved': sum(c['downloads_saved'] for c in clusters),
+            'clusters': sorted(clusters, key=lambda c: -c['bytes_saved']),
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"💾 보고서 저장됨: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
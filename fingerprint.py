@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+내용 해시를 붙인 객체 이름 (content fingerprint)
+
+images/backgrounds/login_bg.png처럼 같은 이름으로 덮어쓰면, 오래 캐시했을 때
+바뀐 그림 대신 예전 그림이 보인다. 업로드 스크립트의 --fingerprint 모드는
+내용 해시를 이름에 넣어 새 객체로 올린다.
+
+    images/backgrounds/login_bg.png  ->  images/backgrounds/login_bg.3f2a9c1d07.png
+
+이름이 내용과 함께 바뀌므로 storage_metadata는 이런 객체에
+'public, max-age=31536000, immutable'을 적용하고, manifest와 Dart 상수는
+논리 이름(해시를 뺀 이름)마다 가장 최근에 올린 객체를 가리킨다.
+예전 해시 객체는 유예 기간이 지나면 storage_admin.py gc로 지운다
+(이전 버전 앱이 아직 예전 URL을 들고 있을 수 있으므로 바로 지우지 않음).
+
+사용법:
+    from fingerprint import fingerprint_path, logical_name, current_objects
+
+    remote_path = fingerprint_path('images/backgrounds/login_bg.png', local_path)
+"""
+
+import hashlib
+import posixpath
+import re
+import time
+from datetime import datetime
+
+# 이름에 넣는 해시 길이 (sha256 16진수 앞부분)
+FINGERPRINT_LENGTH = 10
+
+# 예전 해시 객체를 지우기 전 유예 기간
+DEFAULT_GRACE_DAYS = 7
+
+_FINGERPRINTED = re.compile(
+    r'^(?P<base>.+)\.(?P<hash>[0-9a-f]{%d})(?P<ext>\.[A-Za-z0-9]+)$' % FINGERPRINT_LENGTH)
+
+# 해시 계산 시 한 번에 읽는 크기
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_fingerprint(path):
+    """파일 내용의 sha256 앞 FINGERPRINT_LENGTH자리"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:FINGERPRINT_LENGTH]
+
+
+def split_fingerprint(name):
+    """객체 이름을 (논리 이름, 해시)로 나누기. 해시가 없으면 (name, None)"""
+    directory, filename = posixpath.split(name)
+    match = _FINGERPRINTED.match(filename)
+    if not match:
+        return name, None
+    return posixpath.join(directory, match['base'] + match['ext']), match['hash']
+
+
+def logical_name(name):
+    """해시를 뺀 논리 이름 (images/a.3f2a9c1d07.png -> images/a.png)"""
+    return split_fingerprint(name)[0]
+
+
+def is_fingerprinted(name):
+    """이름에 내용 해시가 들어 있는지"""
+    return split_fingerprint(name)[1] is not None
+
+
+def fingerprint_path(remote_path, local_path):
+    """업로드 경로에 로컬 파일 내용 해시 넣기"""
+    base, extension = posixpath.splitext(logical_name(remote_path))
+    return f"{base}.{file_fingerprint(local_path)}{extension}"
+
+
+def _created_at(info):
+    """
+    객체를 만든 시각 (초)
+
+    GCS generation은 객체를 만든 시각(마이크로초)이다. updated는 메타데이터/ACL
+    patch(backfill-metadata, publish)에도 바뀌므로 generation이 없을 때만 쓴다.
+    """
+    if info.get('generation'):
+        return int(info['generation']) / 1_000_000
+    return datetime.fromisoformat(info['updated']).timestamp() if info.get('updated') else None
+
+
+def _rank(name, info):
+    # 해시가 없는 이름은 같은 논리 이름의 해시 객체를 대체하지 않는다
+    return is_fingerprinted(name), _created_at(info) or 0
+
+
+def current_objects(objects):
+    """
+    논리 이름마다 가장 최근에 만든 객체 고르기 (해시 객체가 있으면 그중에서)
+
+    Args:
+        objects: bucket_index.get_objects() 결과
+
+    Returns:
+        {논리 이름: 실제 객체 이름}
+    """
+    current = {}
+    for name in sorted(objects):
+        logical = logical_name(name)
+        chosen = current.get(logical)
+        if chosen is None or _rank(name, objects[name]) > _rank(chosen, objects[chosen]):
+            current[logical] = name
+    return current
+
+
+def find_superseded(objects, referenced=(), grace_days=DEFAULT_GRACE_DAYS, now=None):
+    """
+    유예 기간이 지난 예전 해시 객체 찾기
+
+    해시가 없는 이름은 대상이 아니다. 같은 논리 이름의 최신 해시 객체가 만들어진 지
+    grace_days가 지났고, manifest에서 참조하지 않는 해시 객체만 고른다.
+
+    Args:
+        objects: bucket_index.get_objects() 결과
+        referenced: manifest들이 가리키는 객체 이름
+        grace_days: 유예 기간 (일)
+
+    Returns:
+        [(지울 객체 이름, 대신 쓰는 객체 이름), ...]
+    """
+    now = now or time.time()
+    referenced = set(referenced)
+    current = current_objects(objects)
+    superseded = []
+    for name in sorted(objects):
+        logical = logical_name(name)
+        replacement = current[logical]
+        if name == replacement or name in referenced or not is_fingerprinted(name):
+            continue
+        replaced_at = _created_at(objects[replacement])
+        if replaced_at is not None and now - replaced_at >= grace_days * 86400:
+            superseded.append((name, replacement))
+    return superseded
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+이미지 로딩 중에 보여줄 작은 플레이스홀더 (BlurHash, LQIP, 대표 색)
+
+큰 배경 이미지가 로드되는 동안 앱은 빈 화면이나 스피너를 보여준다.
+압축 파이프라인에서 이미 디코딩/축소한 픽셀로 아래 값을 함께 계산해 두면,
+manifest에 실어서 네트워크 요청 없이 바로 그릴 수 있다.
+
+    blurhash  BlurHash 문자열 (기본 4x3 성분, 약 28자)
+    lqip      가로 16px JPEG data URI (base64)
+    color     대표 색 (#rrggbb)
+    width, height  원래 이미지 크기 (비율 계산용)
+
+모든 계산은 가로 32px로 줄인 이미지에서 하므로 원본 크기와 상관없이 빠르다.
+
+사용법:
+    from image_placeholder import make_placeholder
+
+    placeholder = make_placeholder(img)
+"""
+
+import base64
+import io
+import math
+
+from PIL import Image
+
+# 계산용 축소 이미지 가로 크기
+SAMPLE_WIDTH = 32
+
+# LQIP 가로 크기와 JPEG 품질
+LQIP_WIDTH = 16
+LQIP_QUALITY = 50
+
+# BlurHash 성분 수 (가로, 세로)
+BLURHASH_COMPONENTS = (4, 3)
+
+# 대표 색 계산 시 양자화 색 수
+DOMINANT_COLORS = 5
+
+_BASE83 = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~'
+
+
+def _encode83(value, length):
+    result = ''
+    for i in range(1, length + 1):
+        digit = (value // 83 ** (length - i)) % 83
+        result += _BASE83[digit]
+    return result
+
+
+def _srgb_to_linear(value):
+    v = value / 255
+    return v / 12.92 if v <= 0.04045 else ((v + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(value):
+    v = max(0.0, min(1.0, value))
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value, exponent):
+    return math.copysign(abs(value) ** exponent, value)
+
+
+def blurhash(img, components=BLURHASH_COMPONENTS):
+    """
+    BlurHash 인코딩 (https://blurha.sh 알고리즘)
+
+    Args:
+        img: RGB 이미지 (작게 줄인 것을 권장)
+        components: (가로 성분 수, 세로 성분 수), 각각 1-9
+    """
+    x_components, y_components = components
+    width, height = img.size
+    linear = [_srgb_to_linear(value) for value in range(256)]
+    data = img.convert('RGB').tobytes()
+    pixels = [(linear[data[k]], linear[data[k + 1]], linear[data[k + 2]])
+              for k in range(0, len(data), 3)]
+
+    cos_x = [[math.cos(math.pi * i * x / width) for x in range(width)] for i in range(x_components)]
+    cos_y = [[math.cos(math.pi * j * y / height) for y in range(height)] for j in range(y_components)]
+
+    factors = []
+    for j in range(y_components):
+        for i in range(x_components):
+            normalisation = 1 if i == 0 and j == 0 else 2
+            r = g = b = 0.0
+            for y in range(height):
+                row = y * width
+                basis_y = cos_y[j][y]
+                for x in range(width):
+                    basis = basis_y * cos_x[i][x]
+                    pr, pg, pb = pixels[row + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = normalisation / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _encode83((x_components - 1) + (y_components - 1) * 9, 1)
+
+    if ac:
+        actual_max = max(abs(value) for factor in ac for value in factor)
+        quantised_max = max(0, min(82, int(actual_max * 166 - 0.5)))
+        max_value = (quantised_max + 1) / 166
+    else:
+        quantised_max = 0
+        max_value = 1
+    result += _encode83(quantised_max, 1)
+
+    result += _encode83((_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8)
+                        + _linear_to_srgb(dc[2]), 4)
+    for factor in ac:
+        quantised = [max(0, min(18, int(_sign_pow(value / max_value, 0.5) * 9 + 9.5)))
+                     for value in factor]
+        result += _encode83(quantised[0] * 19 * 19 + quantised[1] * 19 + quantised[2], 2)
+    return result
+
+
+def dominant_color(img):
+    """가장 많은 픽셀을 차지하는 양자화 색 (#rrggbb)"""
+    paletted = img.convert('RGB').quantize(DOMINANT_COLORS, method=Image.Quantize.MEDIANCUT)
+    count, index = max(paletted.getcolors())
+    r, g, b = paletted.getpalette()[index * 3:index * 3 + 3]
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def lqip(img):
+    """가로 LQIP_WIDTH px JPEG data URI"""
+    height = max(1, round(img.height * LQIP_WIDTH / img.width))
+    tiny = img.resize((LQIP_WIDTH, height), Image.Resampling.BOX)
+    buffer = io.BytesIO()
+    tiny.save(buffer, 'JPEG', quality=LQIP_QUALITY, optimize=True)
+    return 'data:image/jpeg;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def make_placeholder(img, size=None):
+    """
+    이미 디코딩한 이미지로 플레이스홀더 계산
+
+    투명 이미지는 흰 배경에 합성해서 계산한다.
+
+    Args:
+        img: 디코딩/축소한 이미지
+        size: 기록할 원래 (가로, 세로). 작은 변형으로 계산할 때 사용 (기본값: img 크기)
+
+    Returns:
+        {'blurhash', 'lqip', 'color', 'width', 'height'}
+    """
+    width, height = img.size
+    sample_height = max(1, round(height * SAMPLE_WIDTH / width))
+    sample = img.resize((SAMPLE_WIDTH, sample_height), Image.Resampling.BOX) \
+        if width > SAMPLE_WIDTH else img.copy()
+    if sample.mode in ('RGBA', 'LA') or 'transparency' in sample.info:
+        sample = sample.convert('RGBA')
+        background = Image.new('RGBA', sample.size, (255, 255, 255, 255))
+        sample = Image.alpha_composite(background, sample)
+    sample = sample.convert('RGB')
+
+    return {
+        'blurhash': blurhash(sample),
+        'lqip': lqip(sample),
+        'color': dominant_color(sample),
+        'width': size[0] if size else width,
+        'height': size[1] if size else height,
+    }
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+인코딩 품질 자동 탐색 (목표 용량 / 최소 SSIM)
+
+모든 이미지를 quality=85로 고정해서 저장하면 복잡한 카드 아트는 너무 크고,
+단순한 UI 배경은 필요 이상으로 크다. 여기서는 quality를 이진 탐색해서
+목표를 만족하는 가장 낮은 quality를 찾는다.
+
+    target_bytes  결과 파일이 이 크기 이하가 되는 가장 높은 quality
+    min_ssim      축소한 원본과의 SSIM이 이 값 이상인 가장 낮은 quality
+
+디코딩/축소한 픽셀과 비교 기준(휘도 채널)은 한 번만 만들고, 인코딩은
+메모리에서만 하므로 탐색 한 번에 log2(범위)회 정도의 인코딩만 든다.
+
+SSIM은 numpy 없이 Pillow 연산만으로 계산한다. 가우시안 창 대신 8x8
+블록 평균(Image.reduce)을 쓰는 블록 SSIM이라 표준 SSIM보다 값이 약간
+다르지만, 같은 이미지의 quality 비교에는 충분하다.
+
+사용법:
+    from image_quality import search_quality
+
+    quality, data, score = search_quality(encode, reference, min_ssim=0.98)
+    if not budget_met(len(data), score, min_ssim=0.98):
+        ...  # 범위 끝값으로 대신함
+"""
+
+import io
+
+from PIL import Image, ImageMath
+
+# SSIM 블록 크기와 안정화 상수 (8비트 기준)
+SSIM_BLOCK = 8
+SSIM_C1 = (0.01 * 255) ** 2
+SSIM_C2 = (0.03 * 255) ** 2
+
+# quality 탐색 범위
+MIN_QUALITY = 30
+MAX_QUALITY = 95
+
+
+def luma(img):
+    """SSIM 비교용 휘도 채널 (투명 영역은 흰 배경으로 합성) 'F' 이미지"""
+    if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+        img = img.convert('RGBA')
+        background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+        img = Image.alpha_composite(background, img)
+    return img.convert('L').convert('F')
+
+
+def _mean(img):
+    """'F' 이미지 전체 평균"""
+    return img.resize((1, 1), Image.Resampling.BOX).getpixel((0, 0))
+
+
+def ssim(reference, candidate, block=SSIM_BLOCK):
+    """
+    블록 SSIM (1.0이면 동일)
+
+    Args:
+        reference: luma()로 만든 기준 이미지
+        candidate: 비교할 이미지 (크기가 같아야 함, 모드는 상관없음)
+    """
+    x = reference
+    y = candidate if candidate.mode == 'F' else luma(candidate)
+    if x.size != y.size:
+        raise ValueError(f"이미지 크기가 다릅니다: {x.size} != {y.size}")
+
+    def square(a):
+        return ImageMath.lambda_eval(lambda args: args['a'] * args['a'], a=a)
+
+    mu_x = x.reduce(block)
+    mu_y = y.reduce(block)
+    xx = square(x).reduce(block)
+    yy = square(y).reduce(block)
+    xy = ImageMath.lambda_eval(lambda args: args['x'] * args['y'], x=x, y=y).reduce(block)
+
+    ssim_map = ImageMath.lambda_eval(
+        lambda a: ((2 * a['mx'] * a['my'] + SSIM_C1) * (2 * (a['xy'] - a['mx'] * a['my']) + SSIM_C2))
+        / ((a['mx'] * a['mx'] + a['my'] * a['my'] + SSIM_C1)
+           * ((a['xx'] - a['mx'] * a['mx']) + (a['yy'] - a['my'] * a['my']) + SSIM_C2)),
+        mx=mu_x, my=mu_y, xx=xx, yy=yy, xy=xy)
+    return _mean(ssim_map)
+
+
+def search_quality(encode, reference=None, target_bytes=None, min_ssim=None,
+                   lo=MIN_QUALITY, hi=MAX_QUALITY):
+    """
+    목표를 만족하는 quality 이진 탐색
+
+    quality가 높을수록 용량과 SSIM이 커진다고 보고 탐색한다.
+    목표를 만족하는 quality가 없으면 가장 가까운 끝값(lo 또는 hi)을 쓰므로,
+    만족 여부는 budget_met()으로 확인한다.
+
+    Args:
+        encode: quality -> 인코딩된 bytes 함수 (같은 픽셀을 반복 인코딩)
+        reference: min_ssim을 쓸 때 비교 기준 (luma() 결과)
+        target_bytes: 최대 파일 크기
+        min_ssim: 최소 SSIM
+        lo, hi: quality 탐색 범위
+
+    Returns:
+        (quality, 인코딩된 bytes, SSIM 또는 None)
+    """
+    if target_bytes is None and min_ssim is None:
+        raise ValueError("target_bytes나 min_ssim 중 하나는 필요합니다")
+    if min_ssim is not None and reference is None:
+        raise ValueError("min_ssim을 쓰려면 reference가 필요합니다")
+
+    encoded = {}
+    scores = {}
+
+    def attempt(quality):
+        if quality not in encoded:
+            encoded[quality] = encode(quality)
+        return encoded[quality]
+
+    def score(quality):
+        if quality not in scores:
+            with Image.open(io.BytesIO(attempt(quality))) as decoded:
+                scores[quality] = ssim(reference, decoded)
+        return scores[quality]
+
+    if target_bytes is not None:
+        # 용량 한도 안에서 가장 높은 quality
+        low, high = lo, hi
+        best = lo
+        while low <= high:
+            mid = (low + high) // 2
+            if len(attempt(mid)) <= target_bytes:
+                best = mid
+                low = mid + 1
+            else:
+                high = mid - 1
+        hi = best
+
+    if min_ssim is not None:
+        # SSIM을 만족하는 가장 낮은 quality (용량 한도가 있으면 그 안에서)
+        low, high = lo, hi
+        best = hi
+        while low <= high:
+            mid = (low + high) // 2
+            if score(mid) >= min_ssim:
+                best = mid
+                high = mid - 1
+            else:
+                low = mid + 1
+        return best, attempt(best), score(best)
+
+    return hi, attempt(hi), None
+
+
+def budget_met(size, score, target_bytes=None, min_ssim=None):
+    """search_quality() 결과(바이트 수, SSIM)가 목표를 만족하는지"""
+    if target_bytes is not None and size > target_bytes:
+        return False
+    return min_ssim is None or score is None or score >= min_ssim
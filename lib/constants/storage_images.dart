@@ -0,0 +1,25 @@
+// GENERATED CODE - DO NOT MODIFY BY HAND
+// dart_image_constants.py가 로컬 버킷 인덱스로 생성 (업로드 스크립트 실행 시 갱신)
+
+class StorageImages {
+  static const String bucket = 'innerfive.firebasestorage.app';
+
+  /// 생성 시점에 목록 전체를 가져온 prefix (이후 올린 객체는 [paths]에 없을 수 있음)
+  static const List<String> prefixes = [
+  ];
+
+  /// 객체 경로(내용 해시를 뺀 이름) -> 공개 URL
+  static const Map<String, String> paths = {
+  };
+
+  /// 폴더 -> 이름(확장자 없음) -> 공개 URL
+  static const Map<String, Map<String, String>> folders = {
+  };
+
+  /// 원본 객체 경로 -> 변형 목록 (ImageService.selectVariantPath에 전달, 'path'는 URL)
+  static const Map<String, List<Map<String, Object>>> variants = {
+  };
+
+  /// [path]가 생성 시점에 목록 전체를 가져온 prefix 안에 있는지
+  static bool covers(String path) => prefixes.any(path.startsWith);
+}
@@ -3,6 +3,8 @@ import 'dart:typed_data';
 import 'package:firebase_storage/firebase_storage.dart';
 import 'package:flutter/foundation.dart';
 
+import '../constants/storage_images.dart';
+
 class ImageService {
   static final FirebaseStorage _storage = FirebaseStorage.instance;
   static final Map<String, List<String>> _eidosImageUrls = {};
@@ -160,6 +162,13 @@ class ImageService {
         return url;
       }
 
+      // 업로드 스크립트가 생성한 버킷 목록에서 찾기 (네트워크 요청 없음)
+      // 없으면 상수 파일이 오래됐을 수 있으므로 아래 getDownloadURL로 확인
+      final generatedUrl = _generatedUrl(finalPath);
+      if (generatedUrl != null) {
+        return generatedUrl;
+      }
+
       // Check cache first
       if (_urlCache.containsKey(finalPath)) {
         if (kDebugMode) {
@@ -201,6 +210,17 @@ class ImageService {
     }
   }
 
+  /// lib/constants/storage_images.dart에서 경로(또는 확장자 없는 이름)의 URL 찾기
+  static String? _generatedUrl(String path) {
+    final url = StorageImages.paths[path];
+    if (url != null) return url;
+
+    final slash = path.lastIndexOf('/');
+    if (slash < 0) return null;
+    return StorageImages.folders[path.substring(0, slash)]
+        ?[path.substring(slash + 1)];
+  }
+
   /// Get a random login background image URL
   static Future<String?> getRandomLoginBackground() async {
     final random = Random();
@@ -256,6 +276,35 @@ class ImageService {
     _urlCache.clear();
   }
 
+  /// 기기 폭에 맞는 이미지 변형 경로 선택
+  ///
+  /// [variants]는 compress_single_image.py --variants가 만든 변형 목록
+  /// (`{'width', 'height', 'format', 'path', 'bytes'}` 항목들)이다.
+  /// 화면에 그릴 물리 픽셀 폭(logicalWidth * devicePixelRatio) 이상인 변형 중
+  /// 가장 작은 것을, 없으면 가장 큰 것을 고른다. Flutter 기본 코덱은 AVIF를
+  /// 디코딩하지 못하므로 기본 선호 형식은 WebP, JPEG 순서다.
+  static String? selectVariantPath(
+    List<Map<String, dynamic>> variants,
+    double logicalWidth,
+    double devicePixelRatio, {
+    List<String> preferredFormats = const ['webp', 'jpeg'],
+  }) {
+    final targetWidth = logicalWidth * devicePixelRatio;
+
+    for (final format in preferredFormats) {
+      final candidates = variants.where((v) => v['format'] == format).toList()
+        ..sort((a, b) => (a['width'] as int).compareTo(b['width'] as int));
+      if (candidates.isEmpty) continue;
+
+      final fit = candidates.firstWhere(
+        (v) => (v['width'] as int) >= targetWidth,
+        orElse: () => candidates.last,
+      );
+      return fit['path'] as String;
+    }
+    return null;
+  }
+
   /// 특정 그룹의 랜덤 이미지 가져오기 (확장 가능)
   static Future<String> getRandomImageFromGroup(List<String> imageNames) async {
     if (imageNames.isEmpty) {
@@ -0,0 +1,190 @@
+import 'dart:convert';
+import 'dart:ui' as ui;
+import 'package:flutter/material.dart';
+import 'package:flutter/services.dart';
+
+/// 아틀라스 페이지 안의 이미지 하나 위치
+class AtlasSprite {
+  final int page;
+  final Rect rect;
+
+  const AtlasSprite(this.page, this.rect);
+}
+
+/// pack_atlas.py가 만든 아틀라스 좌표 manifest (<이름>.atlas.json)
+///
+/// 태그 이미지처럼 작은 이미지 여러 개를 페이지 이미지 한두 장으로 받아서
+/// 잘라 그리므로, 화면 하나에 이미지 수십 번 대신 페이지 수만큼만 요청한다.
+class ImageAtlas {
+  /// 페이지 이미지 위치 (페이지 번호 순). http(s) URL이거나, 페이지 URL이 없는
+  /// manifest(--base-url 없이 만든 로컬 아틀라스)면 manifest 옆 에셋 경로
+  final List<String> pageUrls;
+
+  /// 원래 이미지 URL(또는 경로) -> 위치
+  final Map<String, AtlasSprite> sprites;
+
+  const ImageAtlas(this.pageUrls, this.sprites);
+
+  /// [assetDir]는 manifest가 있는 에셋 폴더 (url이 없는 페이지의 file 기준 경로)
+  factory ImageAtlas.fromJson(
+    Map<String, dynamic> data, {
+    String assetDir = '',
+  }) {
+    final pages = (data['pages'] as List).map((page) {
+      final url = page['url'] as String?;
+      if (url != null) return url;
+      final file = page['file'] as String;
+      return assetDir.isEmpty ? file : '$assetDir/$file';
+    }).toList();
+    final sprites = (data['sprites'] as Map<String, dynamic>).map(
+      (key, value) => MapEntry(
+        key,
+        AtlasSprite(
+          value['page'] as int,
+          Rect.fromLTWH(
+            (value['x'] as num).toDouble(),
+            (value['y'] as num).toDouble(),
+            (value['width'] as num).toDouble(),
+            (value['height'] as num).toDouble(),
+          ),
+        ),
+      ),
+    );
+    return ImageAtlas(pages, sprites);
+  }
+
+  /// 에셋에서 아틀라스 manifest를 로드합니다. 실패하면 null (원래 URL로 로드하면 됨)
+  static Future<ImageAtlas?> load(String assetPath) async {
+    try {
+      final String response = await rootBundle.loadString(assetPath);
+      final slash = assetPath.lastIndexOf('/');
+      final atlas = ImageAtlas.fromJson(
+        json.decode(response),
+        assetDir: slash < 0 ? '' : assetPath.substring(0, slash),
+      );
+      print("✓ 아틀라스 로드 완료: $assetPath (${atlas.sprites.length}개)");
+      return atlas;
+    } catch (e) {
+      print("✗ 아틀라스 로드 실패: $assetPath ($e)");
+      return null;
+    }
+  }
+
+  /// 원래 이미지 URL이 아틀라스에 있으면 위치를 반환합니다.
+  AtlasSprite? spriteFor(String url) => sprites[url];
+
+  String pageUrl(AtlasSprite sprite) => pageUrls[sprite.page];
+
+  /// 페이지 이미지 provider (URL이면 NetworkImage, 아니면 번들 에셋)
+  ImageProvider pageImage(AtlasSprite sprite) {
+    final location = pageUrl(sprite);
+    if (location.startsWith('http://') || location.startsWith('https://')) {
+      return NetworkImage(location);
+    }
+    return AssetImage(location);
+  }
+}
+
+/// 아틀라스 페이지에서 이미지 하나를 잘라 그리는 위젯
+///
+/// 페이지는 NetworkImage(또는 에셋)로 받으므로 같은 페이지를 쓰는 위젯들은
+/// 이미지 캐시의 디코딩 결과 하나를 함께 쓴다.
+class AtlasSpriteImage extends StatefulWidget {
+  final ImageAtlas atlas;
+  final AtlasSprite sprite;
+  final double? width;
+  final double? height;
+  final BoxFit fit;
+
+  const AtlasSpriteImage({
+    super.key,
+    required this.atlas,
+    required this.sprite,
+    this.width,
+    this.height,
+    this.fit = BoxFit.cover,
+  });
+
+  @override
+  State<AtlasSpriteImage> createState() => _AtlasSpriteImageState();
+}
+
+class _AtlasSpriteImageState extends State<AtlasSpriteImage> {
+  ImageStream? _stream;
+  late final ImageStreamListener _listener = ImageStreamListener(
+    (info, _) => setState(() => _image = info.image),
+  );
+  ui.Image? _image;
+
+  @override
+  void didChangeDependencies() {
+    super.didChangeDependencies();
+    _resolve();
+  }
+
+  @override
+  void didUpdateWidget(AtlasSpriteImage oldWidget) {
+    super.didUpdateWidget(oldWidget);
+    if (widget.atlas.pageUrl(widget.sprite) !=
+        oldWidget.atlas.pageUrl(oldWidget.sprite)) {
+      _resolve();
+    }
+  }
+
+  void _resolve() {
+    final stream = widget.atlas
+        .pageImage(widget.sprite)
+        .resolve(createLocalImageConfiguration(context));
+    if (stream.key == _stream?.key) return;
+    _stream?.removeListener(_listener);
+    _stream = stream..addListener(_listener);
+  }
+
+  @override
+  void dispose() {
+    _stream?.removeListener(_listener);
+    super.dispose();
+  }
+
+  @override
+  Widget build(BuildContext context) {
+    final image = _image;
+    if (image == null) {
+      return SizedBox(width: widget.width, height: widget.height);
+    }
+    return SizedBox(
+      width: widget.width,
+      height: widget.height,
+      child: CustomPaint(
+        painter: _SpritePainter(image, widget.sprite.rect, widget.fit),
+      ),
+    );
+  }
+}
+
+class _SpritePainter extends CustomPainter {
+  final ui.Image image;
+  final Rect source;
+  final BoxFit fit;
+
+  _SpritePainter(this.image, this.source, this.fit);
+
+  @override
+  void paint(Canvas canvas, Size size) {
+    final fitted = applyBoxFit(fit, source.size, size);
+    final src = Alignment.center.inscribe(fitted.source, source);
+    final dst = Alignment.center.inscribe(fitted.destination, Offset.zero & size);
+    canvas.drawImageRect(
+      image,
+      src,
+      dst,
+      Paint()..filterQuality = FilterQuality.medium,
+    );
+  }
+
+  @override
+  bool shouldRepaint(_SpritePainter oldDelegate) =>
+      oldDelegate.image != image ||
+      oldDelegate.source != source ||
+      oldDelegate.fit != fit;
+}
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+작은 이미지(태그 이미지, 아이콘)를 아틀라스 이미지로 묶기
+
+태그가 많은 화면은 WoodEnergy1.jpg, FireEnergy2.jpg ... 를 각각 따로
+storage.googleapis.com에서 받아서, 이미지 크기보다 요청 수가 로딩 시간을 좌우한다.
+여기서는 폴더나 URL 목록 그룹의 작은 이미지를 몇 장의 아틀라스로
+bin-packing하고, 앱이 잘라 쓸 수 있게 좌표 manifest(JSON)를 만든다.
+
+    <이름>_<페이지>.jpg|png|webp   아틀라스 페이지 이미지
+    <이름>.atlas.json              {'pages': [...], 'sprites': {원래 URL 또는 경로: 좌표}}
+
+배치는 높이 내림차순 shelf 방식(FFDH)이며, 스프라이트마다 padding만큼
+가장자리 픽셀을 늘려 붙여서(extrude) 축소 표시할 때 옆 스프라이트 색이
+번지지 않게 한다. 투명 스프라이트는 <이름>_alpha 아틀라스로 따로 묶어
+투명도를 유지하는 형식으로 저장하고, 나머지 페이지는 JPEG로 저장한다.
+
+사용법:
+    python pack_atlas.py --manifest assets/tag_image_urls.json --sprite-width 256 \\
+        --base-url https://storage.googleapis.com/innerfive.firebasestorage.app/atlases/
+    python pack_atlas.py assets/images/icons -o build/atlas --name icons
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+from pathlib import Path
+
+from PIL import Image
+
+from alpha_encode import CANDIDATE_EXTENSIONS, encode_transparent, has_transparency
+from asset_catalog import DEFAULT_WORKERS, load_references, map_assets, scan_local_assets
+from compress_single_image import draft_to_width, encode_image, normalize_mode, resize_to_width
+
+# 아틀라스 페이지 최대 가로/세로 (모바일 GPU 텍스처 한도 고려)
+DEFAULT_PAGE_SIZE = 2048
+
+# 이보다 긴 변을 가진 이미지는 작은 이미지가 아니므로 묶지 않음
+DEFAULT_MAX_SPRITE = 512
+
+# 스프라이트 주변 여백 (가장자리 픽셀로 채움)
+DEFAULT_PADDING = 2
+
+# 불투명 아틀라스 JPEG 품질
+DEFAULT_QUALITY = 85
+
+
+def pack_shelves(sizes, page_size=DEFAULT_PAGE_SIZE, padding=DEFAULT_PADDING):
+    """
+    직사각형들을 페이지에 shelf 방식으로 배치
+
+    높이가 큰 것부터 왼쪽에서 오른쪽으로 채우고, 줄이 차면 아래에 새 줄(shelf)을,
+    페이지가 차면 새 페이지를 연다. 페이지 가로는 전체 면적의 제곱근 정도로
+    잡아서 정사각형에 가깝게 만든다.
+
+    Args:
+        sizes: [(가로, 세로), ...]
+        page_size: 페이지 최대 가로/세로
+        padding: 각 직사각형 둘레 여백
+
+    Returns:
+        (배치 [(페이지, x, y), ...] (sizes 순서), 페이지 크기 [(가로, 세로), ...])
+    """
+    padded = [(width + 2 * padding, height + 2 * padding) for width, height in sizes]
+    too_large = [size for size in padded if size[0] > page_size or size[1] > page_size]
+    if too_large:
+        raise ValueError(f"페이지({page_size}px)보다 큰 이미지가 있습니다: {too_large[0]}")
+
+    area = sum(width * height for width, height in padded)
+    widest = max((width for width, _ in padded), default=0)
+    page_width = min(page_size, max(widest, math.ceil(math.sqrt(area * 1.1))))
+
+    order = sorted(range(len(padded)), key=lambda i: (-padded[i][1], -padded[i][0]))
+    placements = [None] * len(padded)
+    pages = []
+    page = 0
+    x = y = shelf_height = used_width = 0
+    for index in order:
+        width, height = padded[index]
+        if x + width > page_width:
+            # 새 줄
+            y += shelf_height
+            x = shelf_height = 0
+        if y + height > page_size:
+            # 새 페이지
+            pages.append((used_width, y + shelf_height if x else y))
+            page += 1
+            x = y = shelf_height = used_width = 0
+        placements[index] = (page, x + padding, y + padding)
+        x += width
+        shelf_height = max(shelf_height, height)
+        used_width = max(used_width, x)
+    if padded:
+        pages.append((used_width, y + shelf_height))
+    return placements, pages
+
+
+def paste_extruded(page, sprite, x, y, padding):
+    """스프라이트를 붙이고 padding 폭만큼 가장자리 픽셀을 바깥으로 늘려 채우기"""
+    width, height = sprite.size
+    page.paste(sprite, (x, y))
+    if not padding:
+        return
+    edges = [
+        (sprite.crop((0, 0, 1, height)).resize((padding, height)), (x - padding, y)),
+        (sprite.crop((width - 1, 0, width, height)).resize((padding, height)), (x + width, y)),
+        (sprite.crop((0, 0, width, 1)).resize((width, padding)), (x, y - padding)),
+        (sprite.crop((0, height - 1, width, height)).resize((width, padding)), (x, y + height)),
+    ]
+    corners = [
+        ((0, 0), (x - padding, y - padding)),
+        ((width - 1, 0), (x + width, y - padding)),
+        ((0, height - 1), (x - padding, y + height)),
+        ((width - 1, height - 1), (x + width, y + height)),
+    ]
+    for strip, position in edges:
+        page.paste(strip, position)
+    for pixel, position in corners:
+        page.paste(Image.new(sprite.mode, (padding, padding), sprite.getpixel(pixel)), position)
+
+
+def load_sprite(data, sprite_width=None):
+    """이미지 bytes를 디코딩하고 필요하면 sprite_width로 축소 (실제 투명 픽셀이 없으면 RGB)"""
+    with Image.open(io.BytesIO(data)) as img:
+        if sprite_width:
+            draft_to_width(img, sprite_width)
+        img = normalize_mode(img)
+        if img.mode == 'RGBA' and not has_transparency(img):
+            img = img.convert('RGB')
+        if sprite_width:
+            img = resize_to_width(img, sprite_width)
+        return img.copy()
+
+
+def encode_page(page, quality=DEFAULT_QUALITY):
+    """아틀라스 페이지 인코딩. 투명 픽셀이 있으면 투명도 유지 형식 중 가장 작은 것"""
+    if has_transparency(page):
+        name, data, _ = encode_transparent(page)
+        return CANDIDATE_EXTENSIONS[name], data
+    return 'jpg', encode_image(page.convert('RGB'), 'jpeg', quality)
+
+
+def build_atlas(sprites, output_dir, name, page_size=DEFAULT_PAGE_SIZE, padding=DEFAULT_PADDING,
+                quality=DEFAULT_QUALITY, base_url=None):
+    """
+    스프라이트들을 아틀라스 페이지로 묶어서 저장
+
+    Args:
+        sprites: {키(원래 URL 또는 경로): (그룹, PIL 이미지)}
+        output_dir: 출력 폴더
+        name: 아틀라스 이름 (파일 이름 앞부분)
+        base_url: 주면 페이지마다 업로드 후 URL(base_url + 파일 이름)을 manifest에 기록
+
+    Returns:
+        manifest dict
+    """
+    keys = sorted(sprites)
+    sizes = [sprites[key][1].size for key in keys]
+    placements, page_sizes = pack_shelves(sizes, page_size, padding)
+
+    has_alpha = any(sprites[key][1].mode == 'RGBA' for key in keys)
+    mode = 'RGBA' if has_alpha else 'RGB'
+    pages = [Image.new(mode, size, (0, 0, 0, 0) if has_alpha else (255, 255, 255))
+             for size in page_sizes]
+
+    manifest = {'pages': [], 'sprites': {}}
+    for key, (page, x, y) in zip(keys, placements):
+        group, sprite = sprites[key]
+        paste_extruded(pages[page], sprite.convert(mode), x, y, padding)
+        manifest['sprites'][key] = {
+            'group': group,
+            'page': page,
+            'x': x,
+            'y': y,
+            'width': sprite.width,
+            'height': sprite.height,
+        }
+
+    os.makedirs(output_dir, exist_ok=True)
+    for index, page in enumerate(pages):
+        extension, data = encode_page(page, quality)
+        filename = f"{name}_{index}.{extension}"
+        with open(os.path.join(output_dir, filename), 'wb') as f:
+            f.write(data)
+        entry = {'file': filename, 'width': page.width, 'height': page.height, 'bytes': len(data)}
+        if base_url:
+            entry['url'] = base_url.rstrip('/') + '/' + filename
+        manifest['pages'].append(entry)
+
+    with open(os.path.join(output_dir, f"{name}.atlas.json"), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest
+
+
+def collect_remote(manifest_path, sprite_width, max_sprite, workers):
+    """URL 목록 JSON의 이미지를 내려받아 {URL: (그룹, 이미지)} 만들기"""
+    references = load_references(manifest_path)
+    images, _ = map_assets(list(references), lambda url, data: load_sprite(data, sprite_width), workers)
+    sprites = {}
+    for url, img in images.items():
+        if max(img.size) > max_sprite:
+            print(f"⏭️  큰 이미지 제외: {url} ({img.width}x{img.height})")
+            continue
+        # 그룹은 첫 번째 참조의 최상위 키 (예: WoodEnergy)
+        sprites[url] = (references[url][0][1].split('/')[0], img)
+    return sprites
+
+
+def collect_local(folder, sprite_width, max_sprite):
+    """폴더의 이미지를 {상대 경로: (하위 폴더, 이미지)}로 만들기"""
+    sprites = {}
+    for path in scan_local_assets(folder):
+        img = load_sprite(path.read_bytes(), sprite_width)
+        relative = path.relative_to(folder)
+        if max(img.size) > max_sprite:
+            print(f"⏭️  큰 이미지 제외: {relative} ({img.width}x{img.height})")
+            continue
+        sprites[relative.as_posix()] = (relative.parent.as_posix() if relative.parent.parts else '', img)
+    return sprites
+
+
+def main():
+    parser = argparse.ArgumentParser(description='작은 이미지를 아틀라스로 묶기')
+    parser.add_argument('folders', nargs='*', help='묶을 로컬 이미지 폴더')
+    parser.add_argument('--manifest', help='URL 목록 JSON (예: assets/tag_image_urls.json)')
+    parser.add_argument('-o', '--output', default='build/atlas', help='출력 폴더 (기본값: build/atlas)')
+    parser.add_argument('--name', help='아틀라스 이름 (기본값: 폴더 또는 manifest 이름)')
+    parser.add_argument('--per-group', action='store_true', help='그룹(하위 폴더, 최상위 키)마다 따로 묶기')
+    parser.add_argument('--sprite-width', type=int, help='스프라이트 가로 크기로 축소 (화면 표시 크기 x 배율)')
+    parser.add_argument('--max-sprite', type=int, default=DEFAULT_MAX_SPRITE,
+                        help=f'이보다 큰 이미지는 제외 (기본값: {DEFAULT_MAX_SPRITE}px)')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE,
+                        help=f'페이지 최대 크기 (기본값: {DEFAULT_PAGE_SIZE}px)')
+    parser.add_argument('--padding', type=int, default=DEFAULT_PADDING,
+                        help=f'스프라이트 여백 (기본값: {DEFAULT_PADDING}px)')
+    parser.add_argument('-q', '--quality', type=int, default=DEFAULT_QUALITY,
+                        help=f'불투명 아틀라스 JPEG 품질 (기본값: {DEFAULT_QUALITY})')
+    parser.add_argument('--base-url',
+                        help='업로드될 위치 (페이지 URL을 manifest에 기록, --manifest에는 필수). '
+                             '없으면 앱이 manifest와 같은 에셋 폴더에서 페이지를 찾음')
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_WORKERS, help='동시 다운로드 수')
+    args = parser.parse_args()
+    if args.manifest and not args.base_url:
+        # 원격 이미지를 대신하는 아틀라스는 앱이 네트워크로 받으므로 페이지 URL이 필요
+        parser.error('--manifest를 쓸 때는 --base-url이 필요합니다')
+
+    sources = []
+    if args.manifest:
+        sprites = collect_remote(args.manifest, args.sprite_width, args.max_sprite, args.workers)
+        sources.append((args.name or Path(args.manifest).stem, sprites))
+    for folder in args.folders:
+        sprites = collect_local(folder, args.sprite_width, args.max_sprite)
+        sources.append((args.name or Path(folder).name, sprites))
+    if not sources:
+        parser.error('폴더나 --manifest 중 하나는 필요합니다')
+
+    for name, sprites in sources:
+        if args.per_group:
+            groups = {}
+            for key, (group, img) in sprites.items():
+                groups.setdefault(group, {})[key] = (group, img)
+            atlases = [(f"{name}_{group or 'root'}".replace('/', '_'), members)
+                       for group, members in sorted(groups.items())]
+        else:
+            atlases = [(name, sprites)]
+
+        # 투명 스프라이트는 따로 묶어서 불투명 페이지는 JPEG로 저장되게 함
+        atlases = [
+            (atlas_name + suffix, {key: value for key, value in members.items()
+                                   if (value[1].mode == 'RGBA') == alpha})
+            for atlas_name, members in atlases
+            for suffix, alpha in (('', False), ('_alpha', True))
+        ]
+
+        for atlas_name, members in atlases:
+            if not members:
+                continue
+            manifest = build_atlas(members, args.output, atlas_name, args.page_size, args.padding,
+                                   args.quality, args.base_url)
+            total = sum(page['bytes'] for page in manifest['pages'])
+            print(f"✅ {atlas_name}: 이미지 {len(members)}개 -> 페이지 {len(manifest['pages'])}장 "
+                  f"({total / 1024:.0f}KB), 요청 {len(members)}회 -> {len(manifest['pages'])}회")
+            print(f"   💾 {os.path.join(args.output, atlas_name + '.atlas.json')}")
+
+
+if __name__ == "__main__":
+    main()
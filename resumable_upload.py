@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+체크포인트 파일을 쓰는 재개 가능한(resumable) 청크 업로드
+
+큰 원본 파일(eidos_images/, 운세 배경 등)을 upload_from_filename으로 올리면
+중간에 연결이 끊겼을 때 처음부터 다시 올려야 한다. 여기서는 GCS resumable
+업로드 세션을 직접 사용해서 청크 단위로 올리고, 파일별 세션 URI와 커밋된
+오프셋을 체크포인트 파일에 기록한다. 다시 실행하면 서버에 커밋된 위치부터
+이어서 올린다.
+
+사용법:
+    from resumable_upload import resumable_upload
+
+    blob = resumable_upload(bucket, 'raw/golden_sage1.png', 'eidos_images/golden_sage/1.png')
+"""
+
+import json
+import os
+import threading
+
+from storage_metadata import apply_metadata
+from storage_sync import file_md5_base64
+
+# 체크포인트 파일 위치
+CHECKPOINT_PATH = '.upload_checkpoint.json'
+
+# GCS는 마지막 청크를 제외하고 256KiB 배수만 허용
+CHUNK_ALIGNMENT = 256 * 1024
+
+# 기본 청크 크기 (업링크에 맞게 조정)
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+# 이 크기 이상인 파일은 resumable 업로드 사용
+RESUMABLE_THRESHOLD = 5 * 1024 * 1024
+
+_checkpoint_lock = threading.Lock()
+
+
+def align_chunk_size(chunk_size):
+    """청크 크기를 256KiB 배수로 맞추기"""
+    return max(CHUNK_ALIGNMENT, chunk_size // CHUNK_ALIGNMENT * CHUNK_ALIGNMENT)
+
+
+def load_checkpoints(path=CHECKPOINT_PATH):
+    """체크포인트 파일 읽기 ({remote_path: 항목})"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_checkpoint(remote_path, entry, path=CHECKPOINT_PATH):
+    """
+    파일 하나의 체크포인트 저장 (entry가 None이면 삭제)
+
+    여러 업로드 스레드가 같은 파일을 쓰므로 잠금 안에서 읽고,
+    임시 파일에 쓴 뒤 교체해서 중간에 죽어도 파일이 깨지지 않게 한다.
+    """
+    with _checkpoint_lock:
+        checkpoints = load_checkpoints(path)
+        if entry is None:
+            checkpoints.pop(remote_path, None)
+        else:
+            checkpoints[remote_path] = entry
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoints, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+
+def _committed_offset(response):
+    """308 응답의 Range 헤더(bytes=0-N)에서 다음에 보낼 오프셋 계산"""
+    committed = response.headers.get('Range')
+    if not committed:
+        return 0
+    return int(committed.rsplit('-', 1)[1]) + 1
+
+
+def _query_session(session, session_uri, total_size):
+    """
+    세션 상태 조회
+
+    Returns:
+        (offset, resource) 튜플. 업로드가 끝났으면 resource가 객체 메타데이터,
+        세션이 만료되었으면 (None, None)
+    """
+    response = session.put(session_uri, data=b'', headers={
+        'Content-Range': f'bytes */{total_size}',
+    })
+    if response.status_code in (200, 201):
+        return total_size, response.json()
+    if response.status_code == 308:
+        return _committed_offset(response), None
+    if response.status_code in (404, 410):
+        return None, None
+    response.raise_for_status()
+    raise RuntimeError(f"예상하지 못한 세션 상태 응답: {response.status_code}")
+
+
+def _start_session(blob, total_size, predefined_acl):
+    """새 resumable 업로드 세션 URI 만들기 (블롭의 Cache-Control 등 메타데이터 포함)"""
+    metadata = apply_metadata(blob)
+    return blob.create_resumable_upload_session(
+        content_type=metadata['content_type'],
+        size=total_size,
+        predefined_acl=predefined_acl,
+    )
+
+
+def resumable_upload(bucket, local_path, remote_path, chunk_size=DEFAULT_CHUNK_SIZE,
+                     predefined_acl='publicRead', checkpoint_path=CHECKPOINT_PATH):
+    """
+    청크 단위로 업로드하고 진행 상황을 체크포인트에 기록
+
+    같은 파일(경로, 크기, 수정 시각이 같음)의 체크포인트가 있으면
+    서버에 커밋된 오프셋부터 이어서 올린다.
+
+    Args:
+        bucket: Firebase Storage 버킷
+        local_path: 로컬 파일 경로
+        remote_path: Firebase Storage에 저장될 경로
+        chunk_size: 청크 크기 (256KiB 배수로 맞춰짐)
+        predefined_acl: 업로드와 함께 적용할 ACL
+        checkpoint_path: 체크포인트 파일 경로
+
+    Returns:
+        업로드된 블롭 (메타데이터 포함)
+    """
+    from google.auth.transport.requests import AuthorizedSession
+
+    chunk_size = align_chunk_size(chunk_size)
+    stat = os.stat(local_path)
+    total_size = stat.st_size
+    blob = bucket.blob(remote_path)
+    session = AuthorizedSession(bucket.client._credentials)
+
+    identity = {
+        'local_path': os.path.abspath(local_path),
+        'size': total_size,
+        'mtime': stat.st_mtime,
+    }
+    entry = load_checkpoints(checkpoint_path).get(remote_path)
+    offset, resource = None, None
+    if entry and all(entry.get(key) == value for key, value in identity.items()):
+        offset, resource = _query_session(session, entry['session_uri'], total_size)
+        if offset is not None:
+            print(f"↪️  이어서 업로드: {remote_path} ({offset / 1024 / 1024:.1f}MB부터)")
+            session_uri = entry['session_uri']
+
+    if offset is None:
+        session_uri = _start_session(blob, total_size, predefined_acl)
+        offset = 0
+        save_checkpoint(remote_path, dict(identity, session_uri=session_uri, offset=0),
+                        checkpoint_path)
+
+    with open(local_path, 'rb') as f:
+        while resource is None:
+            f.seek(offset)
+            chunk = f.read(chunk_size)
+            end = offset + len(chunk) - 1
+            response = session.put(session_uri, data=chunk, headers={
+                'Content-Range': f'bytes {offset}-{end}/{total_size}',
+            })
+            if response.status_code in (200, 201):
+                resource = response.json()
+            elif response.status_code == 308:
+                offset = _committed_offset(response)
+                save_checkpoint(remote_path, dict(identity, session_uri=session_uri, offset=offset),
+                                checkpoint_path)
+            else:
+                response.raise_for_status()
+                raise RuntimeError(f"예상하지 못한 업로드 응답: {response.status_code}")
+
+    save_checkpoint(remote_path, None, checkpoint_path)
+    blob._set_properties(resource)
+
+    # 서버가 계산한 MD5로 무결성 확인
+    if blob.md5_hash and blob.md5_hash != file_md5_base64(local_path):
+        raise RuntimeError(f"업로드 후 MD5 불일치: {remote_path}")
+    return blob
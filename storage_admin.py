@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Firebase Storage 관리 명령 모음
+
+기존 객체를 일괄로 고치는 작업을 모아 둔 스크립트.
+객체마다 요청을 하나씩 보내지 않고 배치 요청(최대 100개씩)으로 묶어 보낸다.
+
+사용법:
+    python storage_admin.py publish images/
+    python storage_admin.py publish eidos_cards/ tag_images/ --dry-run
+    python storage_admin.py backfill-metadata images/ eidos_cards/ --dry-run
+    python storage_admin.py gc images/ --grace-days 7 --dry-run
+"""
+
+import argparse
+
+from asset_manifest import manifest_files, referenced_objects
+from bucket_index import DEFAULT_INDEX_PATH, get_objects, open_index, refresh_prefix, remove_objects
+from fingerprint import DEFAULT_GRACE_DAYS, find_superseded
+from storage_metadata import metadata_changes
+from storage_retry import call_with_retry, print_retry_report
+
+# GCS 배치 요청 하나에 넣을 수 있는 최대 요청 수
+BATCH_SIZE = 100
+
+PUBLIC_READ_ENTRY = {'entity': 'allUsers', 'role': 'READER'}
+
+
+def is_public(blob):
+    """블롭 ACL에 allUsers READER가 있는지 확인 (projection='full'로 가져온 블롭)"""
+    for entry in blob._properties.get('acl', []):
+        if entry.get('entity') == 'allUsers' and entry.get('role') in ('READER', 'OWNER'):
+            return True
+    return False
+
+
+def _send_batch(client, blobs, apply):
+    with client.batch():
+        for blob in blobs:
+            apply(blob)
+
+
+def run_batched(client, blobs, apply, op='batch'):
+    """
+    blobs를 BATCH_SIZE씩 묶어 배치 요청으로 보내기
+
+    Args:
+        client: google.cloud.storage Client
+        blobs: 처리할 블롭 리스트
+        apply: 배치 안에서 블롭 하나에 요청을 추가하는 함수
+        op: 재시도 통계에 기록할 작업 이름
+
+    Returns:
+        (성공 개수, 실패 개수)
+    """
+    succeeded = 0
+    failed = 0
+    for start in range(0, len(blobs), BATCH_SIZE):
+        chunk = blobs[start:start + BATCH_SIZE]
+        try:
+            call_with_retry(_send_batch, client, chunk, apply, op=op)
+            succeeded += len(chunk)
+        except Exception as e:
+            print(f"❌ 배치 실패 ({chunk[0].name} 외 {len(chunk) - 1}개): {e}")
+            failed += len(chunk)
+    return succeeded, failed
+
+
+def publish_prefix(bucket, prefix, dry_run=False):
+    """
+    prefix 아래에서 아직 공개되지 않은 객체에 allUsers 읽기 권한 부여
+
+    Returns:
+        {'total', 'already_public', 'published', 'failed'} 개수
+    """
+    blobs = call_with_retry(lambda: list(bucket.list_blobs(
+        prefix=prefix, projection='full', fields='items(name,acl),nextPageToken')), op='list')
+    pending = [blob for blob in blobs if not is_public(blob)]
+    stats = {
+        'total': len(blobs),
+        'already_public': len(blobs) - len(pending),
+        'published': 0,
+        'failed': 0,
+    }
+    if dry_run or not pending:
+        return stats
+
+    def apply(blob):
+        # 배치 안에서는 acl.save()의 응답을 바로 읽을 수 없으므로 acl 필드를 patch
+        blob._patch_property('acl', blob._properties.get('acl', []) + [PUBLIC_READ_ENTRY])
+        blob.patch()
+
+    stats['published'], stats['failed'] = run_batched(bucket.client, pending, apply, op='acl')
+    return stats
+
+
+def backfill_metadata(bucket, prefix, dry_run=False):
+    """
+    prefix 아래 객체의 Cache-Control/Content-Type을 storage_metadata 정책에 맞게 patch
+
+    Returns:
+        {'total', 'up_to_date', 'changed', 'failed', 'fields'} ('fields'는 필드별 변경 대상 수)
+    """
+    blobs = call_with_retry(lambda: list(bucket.list_blobs(
+        prefix=prefix, fields='items(name,cacheControl,contentType),nextPageToken')), op='list')
+    changes = {blob.name: metadata_changes(blob) for blob in blobs}
+    pending = [blob for blob in blobs if changes[blob.name]]
+    fields = {}
+    for change in changes.values():
+        for field in change:
+            fields[field] = fields.get(field, 0) + 1
+    stats = {
+        'total': len(blobs),
+        'up_to_date': len(blobs) - len(pending),
+        'changed': 0,
+        'failed': 0,
+        'fields': fields,
+    }
+    if dry_run or not pending:
+        return stats
+
+    def apply(blob):
+        # 바뀐 필드만 patch 요청에 들어감
+        for field, (_, value) in changes[blob.name].items():
+            setattr(blob, field, value)
+        blob.patch()
+
+    stats['changed'], stats['failed'] = run_batched(bucket.client, pending, apply, op='metadata')
+    return stats
+
+
+def gc_fingerprints(bucket, prefix, grace_days=DEFAULT_GRACE_DAYS, dry_run=False,
+                    index_path=DEFAULT_INDEX_PATH):
+    """
+    prefix 아래에서 새 해시 객체로 대체된 지 grace_days가 지난 예전 해시 객체 삭제
+
+    manifest(assets/*.json, 설정 파일)가 아직 가리키는 객체와 해시가 없는 이름은 지우지 않는다.
+
+    Returns:
+        ({'total', 'superseded', 'deleted', 'failed', 'bytes'}, [(지울 객체, 대신 쓰는 객체), ...])
+    """
+    conn = open_index(index_path)
+    try:
+        # 다른 곳에서 올린 새 해시를 놓치지 않도록 목록을 새로 가져와서 판단
+        refresh_prefix(conn, bucket, prefix)
+        objects = get_objects(conn, prefix)
+    finally:
+        conn.close()
+
+    superseded = find_superseded(objects, referenced_objects(manifest_files()), grace_days)
+    stats = {
+        'total': len(objects),
+        'superseded': len(superseded),
+        'deleted': 0,
+        'failed': 0,
+        'bytes': sum(objects[name]['size'] or 0 for name, _ in superseded),
+    }
+    if dry_run or not superseded:
+        return stats, superseded
+
+    blobs = [bucket.blob(name) for name, _ in superseded]
+    stats['deleted'], stats['failed'] = run_batched(
+        bucket.client, blobs, lambda blob: blob.delete(), op='delete')
+    if stats['failed']:
+        # 어느 객체가 실패했는지 모르므로 목록을 다시 가져온다
+        conn = open_index(index_path)
+        try:
+            refresh_prefix(conn, bucket, prefix)
+        finally:
+            conn.close()
+    else:
+        remove_objects([name for name, _ in superseded], index_path)
+    return stats, superseded
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Firebase Storage 관리 명령')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    publish_parser = subparsers.add_parser('publish', help='prefix 아래 객체를 공개 읽기로 설정')
+    publish_parser.add_argument('prefixes', nargs='+', help='대상 prefix (예: images/)')
+    publish_parser.add_argument('--dry-run', action='store_true', help='변경 없이 개수만 확인')
+
+    backfill_parser = subparsers.add_parser(
+        'backfill-metadata', help='기존 객체의 Cache-Control/Content-Type을 정책에 맞게 수정')
+    backfill_parser.add_argument('prefixes', nargs='+', help='대상 prefix (예: images/)')
+    backfill_parser.add_argument('--dry-run', action='store_true', help='변경 없이 개수만 확인')
+
+    gc_parser = subparsers.add_parser('gc', help='대체된 지 오래된 예전 내용 해시 객체 삭제')
+    gc_parser.add_argument('prefixes', nargs='+', help='대상 prefix (예: images/)')
+    gc_parser.add_argument('--grace-days', type=float, default=DEFAULT_GRACE_DAYS,
+                           help=f'새 해시가 올라온 뒤 기다릴 기간 (기본값: {DEFAULT_GRACE_DAYS}일)')
+    gc_parser.add_argument('--dry-run', action='store_true', help='삭제 없이 대상만 출력')
+
+    args = parser.parse_args()
+
+    from upload_structured_images import init_firebase
+    bucket = init_firebase()
+
+    if args.command == 'publish':
+        for prefix in args.prefixes:
+            stats = publish_prefix(bucket, prefix, dry_run=args.dry_run)
+            pending = stats['total'] - stats['already_public']
+            print(f"📂 {prefix}: 전체 {stats['total']}개, 이미 공개 {stats['already_public']}개, "
+                  f"대상 {pending}개")
+            if not args.dry_run:
+                print(f"   ✅ 공개 설정 {stats['published']}개, ❌ 실패 {stats['failed']}개")
+
+    elif args.command == 'backfill-metadata':
+        for prefix in args.prefixes:
+            stats = backfill_metadata(bucket, prefix, dry_run=args.dry_run)
+            pending = stats['total'] - stats['up_to_date']
+            fields = ', '.join(f"{field} {count}개" for field, count in sorted(stats['fields'].items()))
+            print(f"📂 {prefix}: 전체 {stats['total']}개, 이미 정책과 같음 {stats['up_to_date']}개, "
+                  f"대상 {pending}개" + (f" ({fields})" if fields else ''))
+            if not args.dry_run:
+                print(f"   ✅ 수정 {stats['changed']}개, ❌ 실패 {stats['failed']}개")
+
+    elif args.command == 'gc':
+        for prefix in args.prefixes:
+            stats, superseded = gc_fingerprints(bucket, prefix, args.grace_days, dry_run=args.dry_run)
+            for name, replacement in superseded:
+                print(f"   🗑️  {name} (-> {replacement})")
+            print(f"📂 {prefix}: 전체 {stats['total']}개, 삭제 대상 {stats['superseded']}개 "
+                  f"({stats['bytes'] / 1024 / 1024:.2f}MB)")
+            if not args.dry_run:
+                print(f"   ✅ 삭제 {stats['deleted']}개, ❌ 실패 {stats['failed']}개")
+
+    print_retry_report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+업로드 객체의 Cache-Control / Content-Type 정책
+
+지금까지 업로드한 객체에는 cache_control이 없어서 storage.googleapis.com이
+기본값(짧은 캐시)으로 응답했고, 기기는 같은 배경 이미지를 세션마다 다시
+확인하거나 다시 받았다. 여기서 prefix별 정책을 정해 두고 업로드(upload_engine),
+서버 측 복사, 기존 객체 일괄 수정(storage_admin.py backfill-metadata)에서
+같은 값을 쓴다.
+
+    CACHE_POLICY      (prefix, Cache-Control). 가장 긴 prefix가 적용된다
+    CONTENT_TYPES     확장자 -> Content-Type (mimetypes가 모르는 형식 포함)
+
+같은 이름으로 덮어쓰는 객체(images/backgrounds/login_bg.png 등)는 오래 캐시하면
+바뀐 그림이 늦게 보이므로 prefix 규칙을 쓰고, 이름에 내용 해시가 들어간 객체
+(fingerprint.py, 업로드 --fingerprint)에만 1년 immutable을 적용한다.
+
+사용법:
+    from storage_metadata import object_metadata, apply_metadata
+
+    blob = bucket.blob(remote_path)
+    apply_metadata(blob, remote_path)
+"""
+
+import mimetypes
+import posixpath
+
+from fingerprint import is_fingerprinted
+
+# 1년, 내용이 바뀌면 이름도 바뀌는 객체용
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# (prefix, Cache-Control)
+CACHE_POLICY = [
+    ('', 'public, max-age=3600'),
+    # 배경/UI 이미지는 같은 이름으로 교체될 수 있음
+    ('images/', 'public, max-age=86400'),
+    ('backgrounds/', 'public, max-age=86400'),
+    # 카드/태그 그림은 거의 바뀌지 않음
+    ('eidos_cards/', 'public, max-age=2592000'),
+    ('eidos_images/', 'public, max-age=2592000'),
+    ('edios_group_image/', 'public, max-age=2592000'),
+    ('inner_compass/', 'public, max-age=2592000'),
+    ('tag_images/', 'public, max-age=2592000'),
+]
+
+CONTENT_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+    '.avif': 'image/avif',
+    '.svg': 'image/svg+xml',
+    '.json': 'application/json',
+}
+
+
+def cache_control_for(remote_path):
+    """객체 경로에 적용할 Cache-Control (해시 이름이면 immutable, 아니면 가장 긴 prefix 규칙)"""
+    if is_fingerprinted(remote_path):
+        return IMMUTABLE_CACHE_CONTROL
+    matches = [(prefix, value) for prefix, value in CACHE_POLICY if remote_path.startswith(prefix)]
+    return max(matches, key=lambda match: len(match[0]))[1]
+
+
+def content_type_for(remote_path):
+    """객체 경로 확장자로 Content-Type 결정"""
+    extension = posixpath.splitext(remote_path)[1].lower()
+    return (CONTENT_TYPES.get(extension) or mimetypes.guess_type(remote_path)[0]
+            or 'application/octet-stream')
+
+
+def object_metadata(remote_path):
+    """
+    객체 하나에 적용할 메타데이터
+
+    Returns:
+        {'cache_control', 'content_type'}
+    """
+    return {
+        'cache_control': cache_control_for(remote_path),
+        'content_type': content_type_for(remote_path),
+    }
+
+
+def apply_metadata(blob, remote_path=None):
+    """블롭 속성에 정책 메타데이터를 설정 (업로드/compose/rewrite 요청에 함께 전송됨)"""
+    metadata = object_metadata(remote_path or blob.name)
+    blob.cache_control = metadata['cache_control']
+    blob.content_type = metadata['content_type']
+    return metadata
+
+
+def metadata_changes(blob):
+    """
+    기존 블롭이 정책과 다른 필드 (list_blobs로 cacheControl, contentType을 가져온 블롭)
+
+    Returns:
+        {필드: (현재 값, 정책 값)}, 같으면 빈 dict
+    """
+    expected = object_metadata(blob.name)
+    current = {'cache_control': blob.cache_control, 'content_type': blob.content_type}
+    return {field: (current[field], value) for field, value in expected.items()
+            if current[field] != value}
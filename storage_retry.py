@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Storage 요청 재시도(지수 백오프 + jitter)와 적응형 동시성 제어
+
+업로드, ACL, 목록, 삭제 요청이 429/5xx나 연결 오류로 실패하면
+지수 백오프(full jitter)로 다시 시도한다. AdaptiveLimiter는 429/503
+응답을 받으면 동시 요청 수를 절반으로 줄이고, 성공이 이어지면 다시
+하나씩 늘린다 (AIMD). 재시도, 스로틀 횟수와 시간에 따른 실제 동시성은
+STATS에 모여서 실행이 끝날 때 print_retry_report()로 출력된다.
+
+사용법:
+    from storage_retry import AdaptiveLimiter, call_with_retry
+
+    limiter = AdaptiveLimiter(max_limit=16)
+    call_with_retry(blob.upload_from_filename, path, op='upload', limiter=limiter)
+"""
+
+import random
+import threading
+import time
+from collections import Counter
+
+# 기본 최대 시도 횟수
+DEFAULT_MAX_ATTEMPTS = 6
+
+# 백오프 기본/최대 대기 시간(초)
+BASE_DELAY = 0.5
+MAX_DELAY = 30.0
+
+# 재시도할 HTTP 상태 코드
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# 동시성을 줄여야 하는 상태 코드
+THROTTLE_STATUS = {429, 503}
+
+# 연속으로 동시성을 줄이지 않도록 하는 최소 간격(초)
+DECREASE_COOLDOWN = 1.0
+
+_stats_lock = threading.Lock()
+_started = time.time()
+
+# 실행 전체의 재시도/스로틀 통계
+STATS = {
+    'retries': Counter(),
+    'throttles': Counter(),
+    'failures': Counter(),
+    'concurrency': [],
+}
+
+
+def status_code(exc):
+    """예외에서 HTTP 상태 코드 꺼내기 (google.api_core, requests 예외 모두 지원)"""
+    code = getattr(exc, 'code', None)
+    if isinstance(code, int):
+        return code
+    response = getattr(exc, 'response', None)
+    if response is not None:
+        return getattr(response, 'status_code', None)
+    return None
+
+
+def is_retryable(exc):
+    """다시 시도할 만한 오류인지 확인"""
+    if status_code(exc) in RETRYABLE_STATUS:
+        return True
+    # 연결 끊김, 타임아웃 등 (requests / urllib3 / 내장 예외)
+    return isinstance(exc, (ConnectionError, TimeoutError)) or type(exc).__name__ in (
+        'ConnectionError', 'Timeout', 'ReadTimeout', 'ConnectTimeout',
+        'ChunkedEncodingError', 'ProtocolError', 'TransportError',
+    )
+
+
+def is_throttle(exc):
+    """서버가 요청 속도를 줄이라고 한 오류인지 확인"""
+    return status_code(exc) in THROTTLE_STATUS
+
+
+def backoff_delay(attempt, base_delay=BASE_DELAY, max_delay=MAX_DELAY):
+    """attempt번째 재시도 전 대기 시간 (full jitter)"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def _count(key, op):
+    with _stats_lock:
+        STATS[key][op] += 1
+
+
+def _record_concurrency(limit):
+    with _stats_lock:
+        timeline = STATS['concurrency']
+        if not timeline or timeline[-1][1] != limit:
+            timeline.append((time.time() - _started, limit))
+
+
+class AdaptiveLimiter:
+    """
+    AIMD 방식의 동시 요청 수 제한
+
+    스로틀 응답을 받으면 limit을 절반으로, 성공할 때마다 1/limit씩 늘려서
+    대략 limit번 성공하면 1 늘어나게 한다.
+    """
+
+    def __init__(self, max_limit, min_limit=1):
+        self.max_limit = max(min_limit, max_limit)
+        self.min_limit = min_limit
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        _record_concurrency(int(self.limit))
+
+    def __enter__(self):
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+        return False
+
+    def on_success(self):
+        with self._condition:
+            if self.limit < self.max_limit:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                _record_concurrency(int(self.limit))
+                self._condition.notify_all()
+
+    def on_throttle(self):
+        with self._condition:
+            now = time.time()
+            # 한 번의 폭주로 여러 요청이 동시에 실패해도 한 번만 줄인다
+            if now - self._last_decrease >= DECREASE_COOLDOWN:
+                self.limit = max(self.min_limit, self.limit / 2)
+                self._last_decrease = now
+                _record_concurrency(int(self.limit))
+
+
+def call_with_retry(func, *args, op='request', limiter=None,
+                    max_attempts=DEFAULT_MAX_ATTEMPTS, **kwargs):
+    """
+    func(*args, **kwargs)를 재시도 가능한 오류에 대해 백오프하며 다시 실행
+
+    Args:
+        func: 실행할 함수
+        op: 통계에 기록할 작업 이름 (upload, acl, list, delete 등)
+        limiter: 주어지면 요청 동안 슬롯을 잡고, 결과에 따라 동시성 조정
+        max_attempts: 최대 시도 횟수
+
+    Returns:
+        func의 반환값
+    """
+    for attempt in range(max_attempts):
+        try:
+            if limiter is None:
+                result = func(*args, **kwargs)
+            else:
+                with limiter:
+                    result = func(*args, **kwargs)
+                limiter.on_success()
+            return result
+        except Exception as e:
+            if not is_retryable(e) or attempt == max_attempts - 1:
+                _count('failures', op)
+                raise
+            if is_throttle(e):
+                _count('throttles', op)
+                if limiter is not None:
+                    limiter.on_throttle()
+            _count('retries', op)
+            time.sleep(backoff_delay(attempt))
+
+
+def print_retry_report():
+    """재시도/스로틀/동시성 통계 출력 (아무 일도 없었으면 출력 안 함)"""
+    with _stats_lock:
+        retries = dict(STATS['retries'])
+        throttles = dict(STATS['throttles'])
+        failures = dict(STATS['failures'])
+        timeline = list(STATS['concurrency'])
+
+    if not (retries or throttles or failures or len(timeline) > 1):
+        return
+
+    print(f"\n🔁 재시도: {sum(retries.values())}회 {retries or ''}")
+    print(f"🚦 스로틀(429/503): {sum(throttles.values())}회 {throttles or ''}")
+    if failures:
+        print(f"❌ 재시도 후 실패: {sum(failures.values())}회 {failures}")
+    if len(timeline) > 1:
+        steps = ', '.join(f"{elapsed:.0f}s→{limit}" for elapsed, limit in timeline)
+        print(f"📈 동시성 변화: {steps}")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+로컬 파일과 Firebase Storage 객체를 내용 해시로 비교하는 동기화 모듈
+
+파일 이름만 비교하면 바이트가 같은 파일도 매번 다시 업로드하게 되므로,
+로컬 파일의 MD5(없으면 CRC32C)를 블롭에 저장된 해시와 비교해서
+새 파일이나 바뀐 파일만 업로드 대상으로 고른다.
+
+사용법:
+    from bucket_index import load_objects
+    from storage_sync import plan_sync
+
+    remote_objects = load_objects(bucket, 'images/')
+    to_upload, skipped = plan_sync(jobs, remote_objects)
+"""
+
+import base64
+import hashlib
+import os
+
+# 해시 계산 시 한 번에 읽는 크기
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_md5_base64(path):
+    """파일의 MD5를 GCS md5Hash 형식(base64)으로 반환"""
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            md5.update(chunk)
+    return base64.b64encode(md5.digest()).decode('ascii')
+
+
+def file_crc32c_base64(path):
+    """파일의 CRC32C를 GCS crc32c 형식(base64)으로 반환 (google-crc32c 없으면 None)"""
+    try:
+        import google_crc32c
+    except ImportError:
+        return None
+
+    checksum = google_crc32c.Checksum()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            checksum.update(chunk)
+    return base64.b64encode(checksum.digest()).decode('ascii')
+
+
+def is_unchanged(local_path, remote):
+    """로컬 파일이 원격 객체와 바이트 단위로 같은지 확인"""
+    if remote is None:
+        return False
+    if remote.get('size') is not None and remote['size'] != os.path.getsize(local_path):
+        return False
+
+    # 일반 업로드는 md5Hash가 있고, composite 객체는 crc32c만 있다
+    if remote.get('md5'):
+        return file_md5_base64(local_path) == remote['md5']
+    if remote.get('crc32c'):
+        return file_crc32c_base64(local_path) == remote['crc32c']
+    return False
+
+
+def plan_sync(jobs, remote_objects, force=False):
+    """
+    업로드 목록을 새 파일/변경 파일과 변경 없는 파일로 나누기
+
+    Args:
+        jobs: (local_path, remote_path) 튜플 리스트
+        remote_objects: bucket_index.load_objects() 결과
+        force: True면 해시가 같아도 모두 업로드
+
+    Returns:
+        (to_upload, skipped) 튜플. 둘 다 (local_path, remote_path) 리스트
+    """
+    to_upload = []
+    skipped = []
+    for local_path, remote_path in jobs:
+        if not force and is_unchanged(local_path, remote_objects.get(remote_path)):
+            skipped.append((local_path, remote_path))
+        else:
+            to_upload.append((local_path, remote_path))
+    return to_upload, skipped
+
+
+def print_sync_summary(to_upload, skipped):
+    """동기화 계획 요약 출력"""
+    upload_bytes = sum(os.path.getsize(local_path) for local_path, _ in to_upload)
+    skipped_bytes = sum(os.path.getsize(local_path) for local_path, _ in skipped)
+    print(f"\n🔍 동기화: 업로드 {len(to_upload)}개 ({upload_bytes / 1024 / 1024:.2f}MB), "
+          f"변경 없음 {len(skipped)}개 ({skipped_bytes / 1024 / 1024:.2f}MB 건너뜀)")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+check_urls HEAD 검사 회귀 테스트 (로컬 스텁 HTTP/1.1 서버, 외부 네트워크 없음)
+
+사용법:
+    python -m pytest -q test_check_urls.py
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import asset_catalog
+from bucket_index import open_index
+from check_urls import _keep_alive, _read_response, check_urls, expected_objects
+
+BUCKET = 'fake'
+
+
+def _md5(data):
+    return base64.b64encode(hashlib.md5(data).digest()).decode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """server.objects {경로: bytes}에 있으면 GCS처럼 헤더만 응답, 없으면 404"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_HEAD(self):
+        self.server.connections.add(self.client_address)
+        data = self.server.objects.get(urlsplit(self.path).path)
+        if data is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(data)))
+        # GCS처럼 x-goog-hash를 두 줄로 보낸다
+        self.send_header('X-Goog-Hash', 'crc32c=AAAAAA==')
+        self.send_header('X-Goog-Hash', f"md5={_md5(data)}")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReadResponseTest(unittest.TestCase):
+    def parse(self, raw):
+        async def run():
+            reader = asyncio.StreamReader()
+            reader.feed_data(raw)
+            reader.feed_eof()
+            return await _read_response(reader)
+        return asyncio.run(run())
+
+    def test_skips_interim_response_and_joins_repeated_headers(self):
+        version, status, headers = self.parse(
+            b"HTTP/1.1 100 Continue\r\n\r\n"
+            b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n"
+            b"X-Goog-Hash: crc32c=abc=\r\nX-Goog-Hash: md5=def==\r\n\r\n")
+
+        self.assertEqual((version, status), ('HTTP/1.1', 200))
+        self.assertEqual(headers['content-length'], '5')
+        self.assertEqual(headers['x-goog-hash'], 'crc32c=abc=, md5=def==')
+
+    def test_keep_alive_defaults_by_version(self):
+        self.assertTrue(_keep_alive('HTTP/1.1', {}))
+        self.assertFalse(_keep_alive('HTTP/1.1', {'connection': 'close'}))
+        self.assertFalse(_keep_alive('HTTP/1.0', {}))
+        self.assertTrue(_keep_alive('HTTP/1.0', {'connection': 'keep-alive'}))
+
+
+class CheckUrlsTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.server.daemon_threads = True
+        self.server.connections = set()
+        self.server.objects = {}
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host = f"127.0.0.1:{self.server.server_address[1]}"
+
+        # 스텁 URL도 url_to_object()가 객체 경로로 바꾸도록
+        self.public_host = asset_catalog.PUBLIC_HOST
+        asset_catalog.PUBLIC_HOST = host
+        self.base = f"http://{host}/{BUCKET}/"
+
+        self.root = tempfile.mkdtemp()
+        self.index_path = os.path.join(self.root, 'index.sqlite3')
+
+    def tearDown(self):
+        asset_catalog.PUBLIC_HOST = self.public_host
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.root)
+
+    def add(self, name, indexed, served):
+        """인덱스에는 indexed, 스텁 서버에는 served 내용으로 객체 추가 (None이면 없음)"""
+        if indexed is not None:
+            conn = open_index(self.index_path)
+            with conn:
+                conn.execute('INSERT INTO objects (name, size, md5) VALUES (?, ?, ?)',
+                             (name, len(indexed), _md5(indexed)))
+            conn.close()
+        if served is not None:
+            self.server.objects[f"/{BUCKET}/{name}"] = served
+        return self.base + name
+
+    def run_check(self, urls, per_host=2):
+        expected = expected_objects(urls, self.index_path)
+        return asyncio.run(check_urls(urls, expected, concurrency=8, per_host=per_host, timeout=5))
+
+    def test_detects_size_md5_and_missing_objects(self):
+        ok = self.add('images/ok.png', b'PNGDATA', b'PNGDATA')
+        resized = self.add('images/size.png', b'PNGDATA', b'PNGDATA-LONGER')
+        changed = self.add('images/md5.png', b'PNGDATA', b'OTHERS!')
+        missing = self.add('images/gone.png', b'PNGDATA', None)
+
+        results, _ = self.run_check([ok, resized, changed, missing])
+
+        self.assertEqual(results[ok]['problems'], [])
+        self.assertTrue(results[ok]['indexed'])
+        self.assertEqual(results[ok]['bytes'], 7)
+        self.assertEqual([p.split()[0] for p in results[resized]['problems']], ['size', 'md5'])
+        self.assertEqual([p.split()[0] for p in results[changed]['problems']], ['md5'])
+        self.assertEqual(results[missing]['status'], 404)
+        self.assertEqual(results[missing]['problems'], ['status 404'])
+
+    def test_reuses_keep_alive_connections(self):
+        self.add('images/ok.png', b'PNGDATA', b'PNGDATA')
+        # 쿼리만 다른 URL 여러 개 (같은 객체, 같은 호스트)
+        urls = [f"{self.base}images/ok.png?v={n}" for n in range(20)]
+
+        results, connections = self.run_check(urls, per_host=2)
+
+        self.assertTrue(all(result['problems'] == [] for result in results.values()))
+        self.assertLessEqual(connections['opened'], 2)
+        self.assertEqual(connections['opened'] + connections['reused'], len(urls))
+        self.assertEqual(len(self.server.connections), connections['opened'])
+
+
+if __name__ == '__main__':
+    unittest.main()
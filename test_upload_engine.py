@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+upload_engine 업로드/서버 측 복사 회귀 테스트 (가짜 버킷, 네트워크 없음)
+
+사용법:
+    python -m pytest -q test_upload_engine.py
+"""
+
+import base64
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+
+import storage_retry
+from storage_retry import AdaptiveLimiter
+from upload_engine import copy_one, upload_files
+
+
+def _md5(data):
+    return base64.b64encode(hashlib.md5(data).digest()).decode()
+
+
+class PreconditionFailed(Exception):
+    code = 412
+
+
+class TooManyRequests(Exception):
+    code = 429
+
+
+class FakeAcl:
+    def save_predefined(self, predefined):
+        pass
+
+
+class FakeBlob:
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        self.acl = FakeAcl()
+        self.cache_control = None
+        self.content_type = None
+        self.md5_hash = None
+        self.crc32c = None
+        self.generation = None
+        self.updated = None
+
+    @property
+    def public_url(self):
+        return f"https://storage.googleapis.com/fake/{self.name}"
+
+    def _store(self, data):
+        self.generation = self.bucket.store(self.name, data)
+        self.md5_hash = _md5(data)
+
+    def upload_from_filename(self, filename, content_type=None, predefined_acl=None):
+        with open(filename, 'rb') as f:
+            self._store(f.read())
+
+    def rewrite(self, source, token=None, if_source_generation_match=None):
+        data, generation = self.bucket.objects[source.name]
+        if if_source_generation_match is not None and generation != if_source_generation_match:
+            raise PreconditionFailed(f"412 {source.name} generation {generation}")
+        self._store(data)
+        return None, len(data), len(data)
+
+
+class ThrottledBlob(FakeBlob):
+    """처음 throttles번의 rewrite는 429로 실패"""
+
+    throttles = 0
+
+    def rewrite(self, source, **kwargs):
+        if ThrottledBlob.throttles:
+            ThrottledBlob.throttles -= 1
+            raise TooManyRequests('429 rate limit')
+        return super().rewrite(source, **kwargs)
+
+
+class FakeBucket:
+    """{이름: (바이트, generation)}만 가진 버킷"""
+
+    def __init__(self, objects=None):
+        self.objects = {}
+        self.generation = 0
+        for name, data in (objects or {}).items():
+            self.store(name, data)
+
+    def store(self, name, data):
+        self.generation += 1
+        self.objects[name] = (data, self.generation)
+        return self.generation
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+    def index(self):
+        """bucket_index.get_objects()와 같은 형식"""
+        return {name: {'size': len(data), 'md5': _md5(data), 'crc32c': None,
+                       'generation': generation, 'updated': None}
+                for name, (data, generation) in self.objects.items()}
+
+
+class UploadFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def local(self, name, data):
+        path = os.path.join(self.root, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def content(self, bucket, name):
+        return bucket.objects[name][0]
+
+    def test_source_overwritten_in_same_run_is_not_copied(self):
+        # 로컬 a.jpg가 버킷 b.jpg의 예전 내용, b.jpg는 새 내용
+        bucket = FakeBucket({'images/b.jpg': b'OLD_B'})
+        remote_objects = bucket.index()
+        jobs = [(self.local('a.jpg', b'OLD_B'), 'images/a.jpg'),
+                (self.local('b.jpg', b'NEW_B'), 'images/b.jpg')]
+
+        results = upload_files(bucket, jobs, workers=2, on_result=None,
+                               remote_objects=remote_objects)
+
+        self.assertEqual([r['error'] for r in results], [None, None])
+        self.assertEqual(self.content(bucket, 'images/a.jpg'), b'OLD_B')
+        self.assertEqual(self.content(bucket, 'images/b.jpg'), b'NEW_B')
+
+    def test_stale_index_source_fails_instead_of_copying(self):
+        bucket = FakeBucket({'images/c.jpg': b'X'})
+        remote_objects = bucket.index()
+        # 인덱스를 읽은 뒤 다른 곳에서 c.jpg를 덮어씀
+        bucket.store('images/c.jpg', b'Y')
+        jobs = [(self.local('a.jpg', b'X'), 'images/a.jpg')]
+
+        results = upload_files(bucket, jobs, on_result=None, remote_objects=remote_objects)
+
+        self.assertIsNotNone(results[0]['error'])
+        self.assertNotIn('images/a.jpg', bucket.objects)
+
+    def test_copy_with_unexpected_content_is_reported(self):
+        bucket = FakeBucket({'images/c.jpg': b'Y'})
+        remote_objects = bucket.index()
+        # generation 없는 인덱스 항목이 다른 내용을 가리킴
+        remote_objects['images/c.jpg'].update(md5=_md5(b'X'), generation=None)
+        jobs = [(self.local('a.jpg', b'X'), 'images/a.jpg')]
+
+        results = upload_files(bucket, jobs, on_result=None, remote_objects=remote_objects)
+
+        self.assertIn('md5', results[0]['error'])
+
+    def test_duplicate_local_files_upload_once(self):
+        bucket = FakeBucket()
+        jobs = [(self.local('a.jpg', b'SAME'), 'images/a.jpg'),
+                (self.local('b.jpg', b'SAME'), 'images/b.jpg')]
+
+        results = upload_files(bucket, jobs, workers=2, on_result=None)
+
+        self.assertEqual([r['error'] for r in results], [None, None])
+        self.assertEqual([r['copied_from'] for r in results], [None, 'images/a.jpg'])
+        self.assertEqual(self.content(bucket, 'images/b.jpg'), b'SAME')
+
+
+class CopyLimiterTest(unittest.TestCase):
+    def test_copy_throttle_reduces_concurrency(self):
+        bucket = FakeBucket({'images/s.jpg': b'S'})
+        bucket.blob = lambda name: ThrottledBlob(bucket, name)
+        ThrottledBlob.throttles = 1
+        path = tempfile.mktemp()
+        with open(path, 'wb') as f:
+            f.write(b'S')
+        limiter = AdaptiveLimiter(8)
+        backoff_delay = storage_retry.backoff_delay
+        storage_retry.backoff_delay = lambda attempt: 0
+        try:
+            result = copy_one(bucket, 'images/s.jpg', path, 'images/d.jpg', limiter)
+        finally:
+            storage_retry.backoff_delay = backoff_delay
+            os.remove(path)
+
+        self.assertIsNone(result['error'])
+        self.assertLess(limiter.limit, 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
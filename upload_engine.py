@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Firebase Storage 병렬 업로드 엔진
+
+upload_images.py, upload_new_images.py, upload_structured_images.py,
+upload_single_image.py 가 공통으로 사용하는 업로드 모듈.
+파일 하나씩 순차로 올리면 왕복 지연시간에 묶이므로, 스레드 풀로
+여러 파일을 동시에 업로드하고 파일별 결과를 돌려준다.
+
+사용법:
+    from upload_engine import upload_files, print_upload_summary
+
+    jobs = [(Path('assets/images/ui/continue_to.png'), 'images/ui/continue_to.png')]
+    results = upload_files(bucket, jobs, workers=8)
+    print_upload_summary(results)
+
+같은 바이트의 파일이 여러 이름으로 올라가는 경우(플레이스홀더 변형 등)는
+한 번만 업로드하고 나머지는 서버 측 복사(rewrite)로 만든다.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from composite_upload import COMPOSITE_THRESHOLD, DEFAULT_PARTS, composite_upload
+from resumable_upload import DEFAULT_CHUNK_SIZE, RESUMABLE_THRESHOLD, resumable_upload
+from storage_metadata import apply_metadata
+from storage_retry import AdaptiveLimiter, call_with_retry, print_retry_report
+from storage_sync import file_md5_base64
+
+# 기본 동시 업로드 수
+DEFAULT_WORKERS = 8
+
+# 업로드 요청에 함께 보내는 ACL (make_public() 왕복을 따로 하지 않음)
+PUBLIC_ACL = 'publicRead'
+
+
+def _new_result(local_path, remote_path):
+    """결과 dict 기본값"""
+    return {
+        'local_path': str(local_path),
+        'remote_path': remote_path,
+        'size': os.path.getsize(local_path),
+        'url': None,
+        'error': None,
+        'elapsed': 0.0,
+        'md5': None,
+        'crc32c': None,
+        'generation': None,
+        'updated': None,
+        'copied_from': None,
+    }
+
+
+def _record_blob(result, blob):
+    """업로드/복사 응답의 메타데이터를 결과에 기록 (bucket_index에 바로 반영할 수 있도록)"""
+    result['url'] = blob.public_url
+    result['md5'] = blob.md5_hash
+    result['crc32c'] = blob.crc32c
+    result['generation'] = blob.generation
+    result['updated'] = blob.updated.isoformat() if blob.updated else None
+
+
+def upload_one(bucket, local_path, remote_path, chunk_size=DEFAULT_CHUNK_SIZE,
+               composite_threshold=COMPOSITE_THRESHOLD, composite_parts=DEFAULT_PARTS,
+               limiter=None):
+    """
+    파일 하나를 업로드하고 결과를 dict로 반환
+
+    RESUMABLE_THRESHOLD 이상인 파일은 체크포인트를 남기는 청크 업로드를 사용해서
+    중간에 끊겨도 다음 실행에서 이어서 올린다. composite_threshold 이상인 파일은
+    구간으로 나눠 병렬 업로드한 뒤 서버에서 합친다. 429/5xx와 연결 오류는
+    storage_retry로 백오프하며 다시 시도한다 (resumable 업로드는 커밋된
+    위치부터 이어서 시도). Cache-Control/Content-Type은 storage_metadata 정책을
+    업로드 요청에 함께 보낸다.
+
+    Args:
+        bucket: Firebase Storage 버킷
+        local_path: 로컬 파일 경로
+        remote_path: Firebase Storage에 저장될 경로
+        chunk_size: resumable 업로드 청크 크기
+        composite_threshold: composite 업로드를 쓰는 최소 크기 (None이면 사용 안 함)
+        composite_parts: composite 업로드 분할 수
+        limiter: 동시 요청 수를 조절하는 AdaptiveLimiter
+
+    Returns:
+        {'local_path', 'remote_path', 'size', 'url', 'error', 'elapsed',
+         'md5', 'crc32c', 'generation', 'updated', 'copied_from'}
+    """
+    started = time.time()
+    result = _new_result(local_path, remote_path)
+    try:
+        if composite_threshold and result['size'] >= composite_threshold:
+            # 구간 업로드마다 재시도와 동시성 제한이 따로 적용된다
+            blob = composite_upload(bucket, local_path, remote_path, parts=composite_parts,
+                                    predefined_acl=PUBLIC_ACL, limiter=limiter)
+        elif result['size'] >= RESUMABLE_THRESHOLD:
+            blob = call_with_retry(resumable_upload, bucket, local_path, remote_path,
+                                   chunk_size=chunk_size, predefined_acl=PUBLIC_ACL,
+                                   op='upload', limiter=limiter)
+        else:
+            blob = bucket.blob(remote_path)
+            metadata = apply_metadata(blob, remote_path)
+            call_with_retry(blob.upload_from_filename, str(local_path),
+                            content_type=metadata['content_type'],
+                            predefined_acl=PUBLIC_ACL, op='upload', limiter=limiter)
+        _record_blob(result, blob)
+    except Exception as e:
+        result['error'] = str(e)
+    result['elapsed'] = time.time() - started
+    return result
+
+
+def copy_object(bucket, source_path, dest_path, source_generation=None, limiter=None):
+    """
+    버킷 안에서 객체를 서버 측 복사 (바이트가 이 컴퓨터를 거치지 않음)
+
+    큰 객체는 rewrite가 여러 번에 나눠 끝나므로 토큰이 없어질 때까지 반복한다.
+    source_generation을 주면 원본이 그 사이 덮어써졌을 때 복사하지 않고
+    실패한다 (412 Precondition Failed). limiter를 주면 rewrite/ACL 요청의 429/503이
+    동시 요청 수를 줄인다.
+
+    Returns:
+        복사된 대상 블롭
+    """
+    source = bucket.blob(source_path)
+    dest = bucket.blob(dest_path)
+    # 원본 메타데이터 대신 대상 경로의 정책 값으로 저장
+    apply_metadata(dest, dest_path)
+    token, _, _ = call_with_retry(dest.rewrite, source, if_source_generation_match=source_generation,
+                                  op='copy', limiter=limiter)
+    while token is not None:
+        token, _, _ = call_with_retry(dest.rewrite, source, token=token,
+                                      if_source_generation_match=source_generation,
+                                      op='copy', limiter=limiter)
+    call_with_retry(dest.acl.save_predefined, PUBLIC_ACL, op='acl', limiter=limiter)
+    return dest
+
+
+def copy_one(bucket, source_path, local_path, dest_path, limiter=None, source_generation=None):
+    """
+    copy_object()를 실행하고 upload_one()과 같은 형식의 결과 반환
+
+    복사된 객체의 md5가 로컬 파일과 다르면 (원본이 예상과 다른 내용이었으면) 실패로 기록한다.
+    """
+    started = time.time()
+    result = _new_result(local_path, dest_path)
+    result['copied_from'] = source_path
+    try:
+        # 동시성 제한과 스로틀 감지는 call_with_retry가 요청마다 limiter로 처리
+        _record_blob(result, copy_object(bucket, source_path, dest_path, source_generation,
+                                         limiter))
+        expected_md5 = file_md5_base64(local_path)
+        if result['md5'] != expected_md5:
+            result['error'] = (f"복사 결과 md5 불일치 ({source_path}): "
+                               f"{result['md5']} != 로컬 {expected_md5}")
+    except Exception as e:
+        result['error'] = str(e)
+    result['elapsed'] = time.time() - started
+    return result
+
+
+def dedupe_jobs(jobs, remote_objects=None):
+    """
+    내용이 같은 로컬 파일을 찾아 업로드 한 번 + 서버 측 복사로 바꾸기
+
+    Args:
+        jobs: (local_path, remote_path) 튜플 리스트
+        remote_objects: bucket_index 객체 목록. 주어지면 이미 버킷에 있는
+            같은 내용의 객체도 복사 원본으로 사용 (이번 jobs의 대상 경로는 제외:
+            1단계 업로드에서 덮어써질 수 있음)
+
+    Returns:
+        (uploads, copies) 튜플
+        uploads: 실제로 업로드할 (local_path, remote_path) 리스트
+        copies: (source_remote_path, local_path, remote_path, source_generation) 리스트.
+            source_generation은 인덱스의 원본 generation (이번에 업로드하는 원본이면 None)
+    """
+    jobs = list(jobs)
+    destinations = {remote_path for _, remote_path in jobs}
+    sources = {}
+    for name, info in (remote_objects or {}).items():
+        if info.get('md5') and name not in destinations:
+            sources.setdefault(info['md5'], (name, info.get('generation')))
+
+    uploads = []
+    copies = []
+    for local_path, remote_path in jobs:
+        md5 = file_md5_base64(local_path)
+        source = sources.get(md5)
+        if source is None:
+            uploads.append((local_path, remote_path))
+            sources[md5] = (remote_path, None)
+        else:
+            copies.append((source[0], local_path, remote_path, source[1]))
+    return uploads, copies
+
+
+def _run_pool(tasks, workers, on_result):
+    """(index, 함수, 인자) 작업들을 스레드 풀로 실행해 {index: 결과} 반환"""
+    results = {}
+    if not tasks:
+        return results
+
+    workers = max(1, min(workers, len(tasks)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(func, *args): index for index, func, args in tasks}
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            if on_result:
+                on_result(result)
+    return results
+
+
+def print_result(result):
+    """업로드 결과 한 줄 출력 (기존 스크립트와 같은 형식)"""
+    name = os.path.basename(result['local_path'])
+    if result['error'] is not None:
+        print(f"❌ 업로드 실패 {result['local_path']}: {result['error']}")
+    elif result['copied_from']:
+        print(f"📋 서버 복사: {result['copied_from']} -> {result['remote_path']} ({result['elapsed']:.1f}s)")
+    else:
+        print(f"✅ 업로드: {name} -> {result['remote_path']} ({result['elapsed']:.1f}s)")
+
+
+def upload_files(bucket, jobs, workers=DEFAULT_WORKERS, on_result=print_result,
+                 dedupe=True, remote_objects=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                 composite_threshold=COMPOSITE_THRESHOLD, composite_parts=DEFAULT_PARTS):
+    """
+    여러 파일을 스레드 풀로 동시에 업로드
+
+    Args:
+        bucket: Firebase Storage 버킷
+        jobs: (local_path, remote_path) 튜플 리스트
+        workers: 동시 업로드 수
+        on_result: 파일 하나가 끝날 때마다 호출되는 콜백 (None이면 출력 안 함)
+        dedupe: 내용이 같은 파일은 한 번만 업로드하고 나머지는 서버 측 복사
+        remote_objects: dedupe 시 복사 원본으로 쓸 수 있는 기존 객체 목록
+        chunk_size: 큰 파일의 resumable 업로드 청크 크기
+        composite_threshold: composite 업로드를 쓰는 최소 크기 (None이면 사용 안 함)
+        composite_parts: composite 업로드 분할 수
+
+    Returns:
+        jobs 순서와 같은 순서의 결과 dict 리스트
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+
+    if dedupe:
+        uploads, copies = dedupe_jobs(jobs, remote_objects)
+    else:
+        uploads, copies = jobs, []
+    index_of = {remote_path: index for index, (_, remote_path) in enumerate(jobs)}
+
+    # 스레드는 workers개까지 두고, 실제 동시 요청 수는 429/503에 따라 조절
+    limiter = AdaptiveLimiter(workers)
+
+    # 1단계: 실제 업로드
+    results = _run_pool(
+        [(index_of[remote_path], upload_one,
+          (bucket, local_path, remote_path, chunk_size, composite_threshold, composite_parts,
+           limiter))
+         for local_path, remote_path in uploads],
+        workers, on_result)
+
+    # 2단계: 원본이 준비된 중복 파일은 서버 측 복사
+    failed_sources = {r['remote_path'] for r in results.values() if r['error'] is not None}
+    copy_tasks = []
+    generations = {r['remote_path']: r['generation'] for r in results.values()}
+    for source_path, local_path, remote_path, source_generation in copies:
+        if source_path in failed_sources:
+            result = _new_result(local_path, remote_path)
+            result['copied_from'] = source_path
+            result['error'] = f"복사 원본 업로드 실패: {source_path}"
+            results[index_of[remote_path]] = result
+            if on_result:
+                on_result(result)
+        else:
+            # 이번에 올린 원본은 업로드 응답의 generation으로 고정
+            if source_generation is None:
+                source_generation = generations.get(source_path)
+            copy_tasks.append(
+                (index_of[remote_path], copy_one,
+                 (bucket, source_path, local_path, remote_path, limiter, source_generation)))
+    results.update(_run_pool(copy_tasks, workers, on_result))
+
+    return [results[index] for index in range(len(jobs))]
+
+
+def print_upload_summary(results, wall_time=None):
+    """업로드 결과 요약 출력"""
+    succeeded = [r for r in results if r['error'] is None]
+    failed = [r for r in results if r['error'] is not None]
+    copied = [r for r in succeeded if r['copied_from']]
+    uploaded_bytes = sum(r['size'] for r in succeeded if not r['copied_from'])
+    copied_bytes = sum(r['size'] for r in copied)
+
+    print(f"\n📊 업로드 결과: 성공 {len(succeeded)}개, 실패 {len(failed)}개")
+    print(f"📦 전송량: {uploaded_bytes / 1024 / 1024:.2f}MB")
+    if copied:
+        print(f"📋 서버 측 복사: {len(copied)}개 ({copied_bytes / 1024 / 1024:.2f}MB 전송 절약)")
+    if wall_time:
+        print(f"⏱️  소요 시간: {wall_time:.1f}s ({uploaded_bytes / 1024 / 1024 / wall_time:.2f}MB/s)")
+    for r in failed:
+        print(f"   ❌ {r['local_path']}: {r['error']}")
+    print_retry_report()
@@ -16,9 +16,15 @@ Firebase Storage에 이미지를 업로드하는 스크립트
 
 import os
 import sys
+import time
+import argparse
 from pathlib import Path
 import firebase_admin
 from firebase_admin import credentials, storage
+from upload_engine import DEFAULT_WORKERS, DEFAULT_CHUNK_SIZE, upload_files, print_upload_summary
+from bucket_index import load_objects
+from upload_journal import record_throughput
+from upload_plan import build_plan, print_plan
 
 # Firebase Admin SDK 초기화
 def init_firebase():
@@ -40,23 +46,16 @@ def init_firebase():
         print(f"❌ Firebase 초기화 실패: {e}")
         sys.exit(1)
 
-def upload_image(bucket, local_path, remote_path):
-    """이미지를 Firebase Storage에 업로드"""
-    try:
-        blob = bucket.blob(remote_path)
-        blob.upload_from_filename(local_path)
-        
-        # 공개 읽기 권한 설정
-        blob.make_public()
-        
-        print(f"✅ 업로드 완료: {local_path} -> {remote_path}")
-        print(f"   URL: {blob.public_url}")
-        return blob.public_url
-    except Exception as e:
-        print(f"❌ 업로드 실패 {local_path}: {e}")
-        return None
-
 def main():
+    parser = argparse.ArgumentParser(description='Firebase Storage 이미지 업로드')
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'동시 업로드 수 (기본값: {DEFAULT_WORKERS})')
+    parser.add_argument('--chunk-size', type=float, default=DEFAULT_CHUNK_SIZE / 1024 / 1024,
+                        help=f'큰 파일 청크 업로드 크기 MB (기본값: {DEFAULT_CHUNK_SIZE // 1024 // 1024})')
+    parser.add_argument('--plan', action='store_true',
+                        help='전송 없이 추가/변경 대상과 예상 소요 시간만 출력')
+    args = parser.parse_args()
+
     print("🚀 Firebase Storage 이미지 업로드 시작")
     
     # Firebase 초기화
@@ -85,6 +84,7 @@ def main():
     
     uploaded_urls = {}
     total_size = 0
+    jobs = []
     
     print(f"\n📁 {len(image_files)}개 이미지 업로드 중...")
     
@@ -100,12 +100,26 @@ def main():
         total_size += file_size
         print(f"\n📷 {image_file} ({file_size / 1024 / 1024:.2f}MB)")
         
-        # Firebase Storage에 업로드
+        # 업로드 목록에 추가
         remote_path = f"images/{image_file}"
-        url = upload_image(bucket, str(local_path), remote_path)
-        
-        if url:
-            uploaded_urls[image_file.split('.')[0]] = url
+        jobs.append((local_path, remote_path))
+    
+    if args.plan:
+        plan = build_plan(jobs, load_objects(bucket, 'images/'))
+        print_plan(plan, 'upload_images')
+        return
+    
+    # Firebase Storage에 병렬 업로드
+    started = time.time()
+    results = upload_files(bucket, jobs, workers=args.workers,
+                           chunk_size=int(args.chunk_size * 1024 * 1024))
+    wall_time = time.time() - started
+    print_upload_summary(results, wall_time)
+    record_throughput('upload_images', results, wall_time)
+    
+    for (local_path, _), result in zip(jobs, results):
+        if result['url']:
+            uploaded_urls[local_path.stem] = result['url']
     
     print(f"\n🎉 업로드 완료!")
     print(f"📊 총 용량: {total_size / 1024 / 1024:.2f}MB")
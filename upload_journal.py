@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+중단돼도 이어서 실행할 수 있는 업로드 작업 저널 (SQLite)
+
+업로드 스크립트가 중간에 죽으면 무엇이 끝났는지 기록이 남지 않고,
+structured_image_urls.json 같은 설정 파일은 맨 마지막에만 쓰인다.
+여기서는 실행(run)마다 파일별 상태를 저널에 기록한다.
+
+    planned    업로드 목록에 들어감
+    uploading  업로드 요청을 보냄
+    published  업로드 완료 (공개 ACL은 업로드 요청에 함께 적용됨)
+    recorded   설정(manifest) 파일에 기록됨
+    failed     업로드 실패 (다음 실행에서 다시 시도)
+
+다시 실행하면 끝나지 않은 run을 이어받아서, 로컬 파일(크기, 수정 시각)이
+바뀌지 않은 published/recorded 항목은 건너뛴다. manifest는 파일 하나가
+끝날 때마다 저널 내용으로 다시 쓴다.
+
+실행마다 전송한 바이트/파일 수와 소요 시간도 기록해서, --plan이
+예상 소요 시간을 계산할 때 사용한다.
+
+사용법:
+    python upload_journal.py status
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+
+# 저널 파일 위치
+DEFAULT_JOURNAL_PATH = '.upload_journal.sqlite3'
+
+DONE_STATES = ('published', 'recorded')
+
+# 처리량 추정에 쓰는 최근 실행 수
+THROUGHPUT_HISTORY = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    script TEXT NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    run_id INTEGER NOT NULL,
+    remote_path TEXT NOT NULL,
+    local_path TEXT,
+    folder TEXT,
+    name TEXT,
+    size INTEGER,
+    mtime REAL,
+    state TEXT,
+    url TEXT,
+    error TEXT,
+    updated_at REAL,
+    PRIMARY KEY (run_id, remote_path)
+);
+CREATE TABLE IF NOT EXISTS throughput (
+    script TEXT NOT NULL,
+    files INTEGER,
+    bytes INTEGER,
+    seconds REAL,
+    recorded_at REAL
+);
+"""
+
+
+def open_journal(path=DEFAULT_JOURNAL_PATH):
+    """저널 파일을 열고 (없으면 생성) sqlite3 연결 반환"""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def start_run(conn, script):
+    """
+    script의 끝나지 않은 run이 있으면 이어받고, 없으면 새로 시작
+
+    Returns:
+        (run_id, 이어받았는지 여부)
+    """
+    row = conn.execute(
+        'SELECT id FROM runs WHERE script = ? AND finished_at IS NULL ORDER BY id DESC LIMIT 1',
+        (script,)).fetchone()
+    if row:
+        return row['id'], True
+    with conn:
+        cursor = conn.execute(
+            'INSERT INTO runs (script, started_at) VALUES (?, ?)', (script, time.time()))
+    return cursor.lastrowid, False
+
+
+def finish_run(conn, run_id):
+    """run 완료 표시"""
+    with conn:
+        conn.execute('UPDATE runs SET finished_at = ? WHERE id = ?', (time.time(), run_id))
+
+
+def plan_jobs(conn, run_id, entries):
+    """
+    업로드 목록을 저널에 planned로 기록하고, 이미 끝난 항목은 걸러내기
+
+    Args:
+        entries: (local_path, remote_path, folder, name) 튜플 리스트
+
+    Returns:
+        아직 끝나지 않은 entries 리스트
+    """
+    pending = []
+    now = time.time()
+    with conn:
+        for local_path, remote_path, folder, name in entries:
+            stat = os.stat(local_path)
+            row = conn.execute(
+                'SELECT state, size, mtime FROM jobs WHERE run_id = ? AND remote_path = ?',
+                (run_id, remote_path)).fetchone()
+            if (row and row['state'] in DONE_STATES
+                    and row['size'] == stat.st_size and row['mtime'] == stat.st_mtime):
+                continue
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO jobs
+                    (run_id, remote_path, local_path, folder, name, size, mtime, state, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 'planned', ?)
+                """,
+                (run_id, remote_path, str(local_path), folder, name,
+                 stat.st_size, stat.st_mtime, now))
+            pending.append((local_path, remote_path, folder, name))
+    return pending
+
+
+def set_state(conn, run_id, remote_paths, state, url=None, error=None):
+    """여러 항목의 상태를 한 번에 변경"""
+    now = time.time()
+    with conn:
+        conn.executemany(
+            """
+            UPDATE jobs SET state = ?, url = COALESCE(?, url), error = ?, updated_at = ?
+            WHERE run_id = ? AND remote_path = ?
+            """,
+            [(state, url, error, now, run_id, remote_path) for remote_path in remote_paths])
+
+
+def record_result(conn, run_id, result):
+    """upload_engine 결과 하나를 저널에 반영"""
+    if result['error'] is None:
+        set_state(conn, run_id, [result['remote_path']], 'published', url=result['url'])
+    else:
+        set_state(conn, run_id, [result['remote_path']], 'failed', error=result['error'])
+
+
+def write_manifest(conn, run_id, config_path):
+    """
+    저널의 published/recorded 항목으로 {folder: {name: url}} 설정 파일 쓰기
+
+    임시 파일에 쓴 뒤 교체해서 중간에 죽어도 설정 파일이 깨지지 않게 하고,
+    쓴 항목은 recorded로 표시한다.
+    """
+    rows = conn.execute(
+        """
+        SELECT remote_path, folder, name, url FROM jobs
+        WHERE run_id = ? AND state IN ('published', 'recorded') AND url IS NOT NULL
+        ORDER BY folder, name
+        """, (run_id,)).fetchall()
+
+    manifest = {}
+    for row in rows:
+        manifest.setdefault(row['folder'], {})[row['name']] = row['url']
+
+    temp_path = f"{config_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, config_path)
+
+    set_state(conn, run_id, [row['remote_path'] for row in rows], 'recorded')
+    return manifest
+
+
+def count_states(conn, run_id):
+    """run의 상태별 항목 수"""
+    rows = conn.execute(
+        'SELECT state, COUNT(*) AS n FROM jobs WHERE run_id = ? GROUP BY state', (run_id,))
+    return {row['state']: row['n'] for row in rows}
+
+
+def record_throughput(script, results, wall_time, path=DEFAULT_JOURNAL_PATH):
+    """업로드 실행 하나의 처리량 기록 (실제 전송한 파일만, 서버 복사 제외)"""
+    uploaded = [r for r in results if r['error'] is None and not r.get('copied_from')]
+    if not uploaded or wall_time <= 0:
+        return
+    conn = open_journal(path)
+    try:
+        with conn:
+            conn.execute(
+                'INSERT INTO throughput (script, files, bytes, seconds, recorded_at) VALUES (?, ?, ?, ?, ?)',
+                (script, len(uploaded), sum(r['size'] for r in uploaded), wall_time, time.time()))
+    finally:
+        conn.close()
+
+
+def estimate_throughput(conn, script=None):
+    """
+    최근 실행 기록으로 처리량 추정 (script 기록이 없으면 모든 스크립트 기록 사용)
+
+    Returns:
+        {'bytes_per_second', 'files_per_second', 'runs'} 또는 기록이 없으면 None
+    """
+    queries = [('WHERE script = ?', (script,))] if script else []
+    queries.append(('', ()))
+    for where, params in queries:
+        rows = conn.execute(
+            f'SELECT files, bytes, seconds FROM throughput {where} ORDER BY recorded_at DESC LIMIT ?',
+            params + (THROUGHPUT_HISTORY,)).fetchall()
+        if rows:
+            seconds = sum(row['seconds'] for row in rows)
+            return {
+                'bytes_per_second': sum(row['bytes'] for row in rows) / seconds,
+                'files_per_second': sum(row['files'] for row in rows) / seconds,
+                'runs': len(rows),
+            }
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='업로드 작업 저널')
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL_PATH, help='저널 파일 경로')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('status', help='최근 run 상태 출력')
+    reset_parser = subparsers.add_parser('reset', help='끝나지 않은 run을 완료 처리 (다음 실행은 새로 시작)')
+    reset_parser.add_argument('script', help='스크립트 이름 (예: upload_structured_images)')
+    args = parser.parse_args()
+
+    conn = open_journal(args.journal)
+
+    if args.command == 'status':
+        runs = conn.execute('SELECT * FROM runs ORDER BY id DESC LIMIT 10').fetchall()
+        for run in runs:
+            state = '완료' if run['finished_at'] else '진행 중'
+            started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(run['started_at']))
+            print(f"#{run['id']} {run['script']} ({started}, {state}): {count_states(conn, run['id'])}")
+
+    elif args.command == 'reset':
+        with conn:
+            cursor = conn.execute(
+                'UPDATE runs SET finished_at = ? WHERE script = ? AND finished_at IS NULL',
+                (time.time(), args.script))
+        print(f"✅ {cursor.rowcount}개 run 완료 처리")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 import firebase_admin
 from firebase_admin import credentials, storage
 import os
-import shutil
+from bucket_index import load_objects, record_results
+from storage_sync import is_unchanged
+from upload_engine import upload_one, copy_one, print_result
 
 try:
     # Firebase 초기화
@@ -12,38 +14,42 @@ try:
 
     bucket = storage.bucket()
 
-    # 기존 login_bg.png를 login1.png ~ login4.png로 복사해서 업로드
+    # 기존 login_bg.png를 login1.png ~ login4.png로 서버 측 복사
     base_image_path = 'assets/images/backgrounds/login_bg.png'
-    
+    base_remote_path = 'images/backgrounds/login_bg.png'
+
     if not os.path.exists(base_image_path):
         print(f"Base image not found: {base_image_path}")
         exit(1)
 
-    # login1.png ~ login4.png 생성 및 업로드
+    results = []
+
+    # 원본이 버킷에 없거나 내용이 다를 때만 한 번 업로드
+    remote_objects = load_objects(bucket, 'images/backgrounds/')
+    base_object = remote_objects.get(base_remote_path)
+    base_generation = base_object['generation'] if base_object else None
+    if not is_unchanged(base_image_path, base_object):
+        result = upload_one(bucket, base_image_path, base_remote_path)
+        print_result(result)
+        results.append(result)
+        if result['error'] is not None:
+            exit(1)
+        base_generation = result['generation']
+
+    # login1.png ~ login4.png는 바이트 전송 없이 버킷 안에서 복사
     for i in range(1, 5):
-        # 임시 파일 생성
-        temp_file = f'temp_login{i}.png'
-        shutil.copy2(base_image_path, temp_file)
-        
-        try:
-            # Firebase Storage에 업로드
-            blob = bucket.blob(f'images/backgrounds/login{i}.png')
-            blob.upload_from_filename(temp_file)
-            
-            # 공개 접근 가능하도록 설정
-            blob.make_public()
-            
-            print(f'Successfully uploaded login{i}.png')
-            print(f'URL: {blob.public_url}')
-            
-        except Exception as e:
-            print(f'Failed to upload login{i}.png: {e}')
-        finally:
-            # 임시 파일 삭제
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+        result = copy_one(bucket, base_remote_path, base_image_path,
+                          f'images/backgrounds/login{i}.png', source_generation=base_generation)
+        results.append(result)
+
+        if result['error'] is None:
+            print(f'Successfully copied login{i}.png')
+            print(f"URL: {result['url']}")
+        else:
+            print(f"Failed to copy login{i}.png: {result['error']}")
 
+    record_results(results)
     print('Upload completed!')
 
 except Exception as e:
-    print(f'에러: {e}') 
\ No newline at end of file
+    print(f'에러: {e}')
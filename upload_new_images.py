@@ -5,15 +5,24 @@
 사용법:
 1. assets/images/ 폴더에 새 이미지 추가
 2. python upload_new_images.py
-3. 출력된 코드를 image_service.dart에 복사
+3. 생성된 lib/constants/storage_images.dart를 함께 커밋 (앱이 URL을 바로 찾음)
 """
 
 import os
 import sys
+import time
+import argparse
 from pathlib import Path
 import firebase_admin
 from firebase_admin import credentials, storage
-import json
+from upload_engine import DEFAULT_WORKERS, DEFAULT_CHUNK_SIZE, upload_files, print_upload_summary
+from bucket_index import DEFAULT_MAX_AGE, load_objects, record_results
+from storage_sync import is_unchanged, print_sync_summary
+from upload_journal import record_throughput
+from upload_plan import build_plan, print_plan
+from asset_manifest import print_update, rewrite_fingerprinted_urls, update_manifests
+from dart_image_constants import write_dart_constants
+from fingerprint import fingerprint_path, logical_name
 
 # Firebase Admin SDK 초기화
 def init_firebase():
@@ -37,28 +46,14 @@ def init_firebase():
     
     return storage.bucket()
 
-def get_existing_images(bucket):
-    """Firebase Storage에 이미 있는 이미지 목록 가져오기"""
+def get_existing_images(remote_objects):
+    """Firebase Storage에 이미 있는 이미지 목록 가져오기 (내용 해시를 뺀 논리 이름 기준)"""
     existing = set()
-    blobs = bucket.list_blobs(prefix='images/')
-    for blob in blobs:
-        filename = blob.name.replace('images/', '').replace('.png', '').replace('.jpg', '').replace('.jpeg', '')
+    for name in remote_objects:
+        filename = logical_name(name).replace('images/', '').replace('.png', '').replace('.jpg', '').replace('.jpeg', '')
         existing.add(filename)
     return existing
 
-def upload_image(bucket, local_path, remote_path):
-    """이미지를 Firebase Storage에 업로드"""
-    try:
-        blob = bucket.blob(remote_path)
-        blob.upload_from_filename(local_path)
-        blob.make_public()
-        
-        print(f"✅ 업로드: {local_path.name} -> {remote_path}")
-        return blob.public_url
-    except Exception as e:
-        print(f"❌ 업로드 실패 {local_path}: {e}")
-        return None
-
 def scan_local_images():
     """로컬 이미지 폴더 스캔"""
     images_dir = Path("assets/images")
@@ -67,7 +62,7 @@ def scan_local_images():
         return []
     
     # 지원하는 이미지 확장자
-    extensions = ['.png', '.jpg', '.jpeg', '.gif', '.webp']
+    extensions = ['.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif']
     images = []
     
     for ext in extensions:
@@ -75,30 +70,30 @@ def scan_local_images():
     
     return images
 
-def generate_dart_code(all_urls):
-    """Dart 코드 생성"""
-    print("\n🔧 image_service.dart 업데이트용 코드:")
-    print("=" * 80)
-    print("static const Map<String, String> _imageUrls = {")
-    for name, url in sorted(all_urls.items()):
-        print(f"  '{name}': '{url}',")
-    print("};")
-
-def save_config(all_urls):
-    """이미지 URL 설정을 JSON 파일로 저장"""
-    config_path = Path("image_urls.json")
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(all_urls, f, indent=2, ensure_ascii=False)
-    print(f"\n💾 설정 저장됨: {config_path}")
-
 def main():
+    parser = argparse.ArgumentParser(description='새 이미지 Firebase Storage 업로드')
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'동시 업로드 수 (기본값: {DEFAULT_WORKERS})')
+    parser.add_argument('--chunk-size', type=float, default=DEFAULT_CHUNK_SIZE / 1024 / 1024,
+                        help=f'큰 파일 청크 업로드 크기 MB (기본값: {DEFAULT_CHUNK_SIZE // 1024 // 1024})')
+    parser.add_argument('--force', action='store_true',
+                        help='해시가 같은 파일도 모두 다시 업로드')
+    parser.add_argument('--refresh', action='store_true',
+                        help=f'로컬 버킷 인덱스를 무조건 갱신 (기본: {DEFAULT_MAX_AGE}초 지나면 갱신)')
+    parser.add_argument('--plan', action='store_true',
+                        help='전송 없이 추가/변경/정리 대상과 예상 소요 시간만 출력')
+    parser.add_argument('--fingerprint', action='store_true',
+                        help='이름에 내용 해시를 넣어 새 객체로 업로드 (1년 immutable 캐시, 예전 객체는 storage_admin.py gc)')
+    args = parser.parse_args()
+
     print("🚀 새로운 이미지 업로드 시작")
     
     # Firebase 초기화
     bucket = init_firebase()
     
-    # 기존 이미지 확인
-    existing_images = get_existing_images(bucket)
+    # 기존 이미지 확인 (크기, 해시 포함)
+    remote_objects = load_objects(bucket, 'images/', max_age=0 if args.refresh else DEFAULT_MAX_AGE)
+    existing_images = get_existing_images(remote_objects)
     print(f"📦 기존 이미지: {len(existing_images)}개")
     
     # 로컬 이미지 스캔
@@ -109,9 +104,21 @@ def main():
         print("❌ 업로드할 이미지가 없습니다.")
         return
     
+    if args.plan:
+        # images/ 바로 아래 객체만 이 스크립트가 관리 (하위 폴더는 upload_structured_images.py)
+        plan = build_plan([(path, fingerprint_path(f"images/{path.name}", path) if args.fingerprint
+                                  else f"images/{path.name}") for path in local_images],
+                          remote_objects, force=args.force,
+                          prune_filter=lambda name: name.count('/') == 1)
+        print_plan(plan, 'upload_new_images')
+        return
+    
     new_uploads = []
     all_urls = {}
     total_size = 0
+    jobs = []
+    job_info = []
+    skipped = []
     
     for image_path in local_images:
         # 확장자 제거한 이름
@@ -121,18 +128,46 @@ def main():
         file_size = image_path.stat().st_size
         total_size += file_size
         
-        # 새 이미지인지 확인
+        remote_path = f"images/{image_path.name}"
+        if args.fingerprint:
+            remote_path = fingerprint_path(remote_path, image_path)
+        
+        # 새 이미지인지, 내용이 바뀌었는지 확인 (--fingerprint면 해시 이름 객체와 비교)
         is_new = image_name not in existing_images
-        status = "🆕 새 이미지" if is_new else "🔄 업데이트"
+        if is_new:
+            status = "🆕 새 이미지"
+        elif not args.force and is_unchanged(image_path, remote_objects.get(remote_path)):
+            status = "⏭️  변경 없음"
+        else:
+            status = "🔄 업데이트"
         
         print(f"\n{status}: {image_path.name} ({file_size / 1024 / 1024:.2f}MB)")
         
-        # 업로드
-        remote_path = f"images/{image_path.name}"
-        url = upload_image(bucket, image_path, remote_path)
+        if status == "⏭️  변경 없음":
+            skipped.append((image_path, remote_path))
+            all_urls[image_name] = bucket.blob(remote_path).public_url
+            continue
         
-        if url:
-            all_urls[image_name] = url
+        # 업로드 목록에 추가
+        jobs.append((image_path, remote_path))
+        job_info.append((image_name, is_new))
+    
+    print_sync_summary(jobs, skipped)
+    
+    # 병렬 업로드
+    print(f"\n📤 {len(jobs)}개 파일 업로드 중 (동시 {args.workers}개)...")
+    started = time.time()
+    results = upload_files(bucket, jobs, workers=args.workers,
+                           chunk_size=int(args.chunk_size * 1024 * 1024),
+                           remote_objects=remote_objects)
+    wall_time = time.time() - started
+    print_upload_summary(results, wall_time)
+    record_throughput('upload_new_images', results, wall_time)
+    record_results(results)
+    
+    for (image_name, is_new), result in zip(job_info, results):
+        if result['url']:
+            all_urls[image_name] = result['url']
             if is_new:
                 new_uploads.append(image_name)
     
@@ -146,14 +181,19 @@ def main():
         for name in new_uploads:
             print(f"  - {name}")
     
-    # Dart 코드 생성
-    generate_dart_code(all_urls)
-    
-    # 설정 저장
-    save_config(all_urls)
+    # 갱신된 인덱스로 image_urls.json, 상세 manifest(바뀐 그룹만), Dart 상수 다시 만들기
+    print("\n📋 manifest 갱신 중...")
+    if args.fingerprint:
+        published = [remote_path for _, remote_path in skipped]
+        published += [result['remote_path'] for result in results if result['url']]
+        for path, count in rewrite_fingerprinted_urls(
+                {logical_name(remote_path): remote_path for remote_path in published}).items():
+            print(f"🔗 {path}: URL {count}개를 해시 객체로 교체")
+    print_update(update_manifests(bucket.name))
+    write_dart_constants(bucket.name)
     
     print(f"\n📝 다음 단계:")
-    print(f"1. 위의 코드를 lib/services/image_service.dart의 _imageUrls에 복사")
+    print(f"1. 생성된 lib/constants/storage_images.dart를 함께 커밋")
     print(f"2. 새 이미지를 사용하는 코드에서 ImageService.getImageUrl('이미지명') 호출")
 
 if __name__ == "__main__":
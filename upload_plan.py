@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+업로드 계획(dry-run): 아무것도 전송하지 않고 버킷과의 차이를 계산
+
+업로드 스크립트의 --plan 옵션이 사용한다. 파일마다 추가/변경/변경 없음으로
+나누고, 로컬에는 없는데 버킷에만 남은 객체(prune 후보)를 찾는다.
+폴더별 바이트 합계와, 이전 실행에서 측정한 처리량으로 계산한 예상 소요
+시간을 출력해서 먼저 압축할지, 나눠서 올릴지 미리 판단할 수 있게 한다.
+
+사용법:
+    from upload_plan import build_plan, print_plan
+
+    plan = build_plan(jobs, remote_objects, prune_prefixes=['images/ui/'])
+    print_plan(plan, 'upload_structured_images')
+"""
+
+import os
+import posixpath
+
+from storage_sync import is_unchanged
+from upload_journal import estimate_throughput, open_journal
+
+ACTIONS = ('add', 'change', 'skip', 'prune')
+
+ACTION_NAMES = {
+    'add': '추가',
+    'change': '변경',
+    'skip': '변경 없음',
+    'prune': '정리 후보',
+}
+
+ACTION_ICONS = {
+    'add': '🆕',
+    'change': '🔄',
+    'skip': '⏭️ ',
+    'prune': '🗑️ ',
+}
+
+
+def build_plan(jobs, remote_objects, prune_prefixes=(), prune_filter=None, force=False):
+    """
+    업로드 목록과 원격 객체 목록을 비교해서 계획 만들기
+
+    Args:
+        jobs: (local_path, remote_path) 튜플 리스트
+        remote_objects: bucket_index.load_objects() 결과
+        prune_prefixes: 이 prefix 아래에서 로컬에 없는 객체를 prune 후보로 표시
+        prune_filter: prefix 대신 쓸 수 있는 판별 함수 (remote_path -> bool)
+        force: True면 변경 없는 파일도 change로 분류
+
+    Returns:
+        {'add'|'change'|'skip'|'prune': [(local_path, remote_path, size), ...]}
+    """
+    plan = {action: [] for action in ACTIONS}
+    local_paths = set()
+
+    for local_path, remote_path in jobs:
+        local_paths.add(remote_path)
+        size = os.path.getsize(local_path)
+        remote = remote_objects.get(remote_path)
+        if remote is None:
+            action = 'add'
+        elif not force and is_unchanged(local_path, remote):
+            action = 'skip'
+        else:
+            action = 'change'
+        plan[action].append((local_path, remote_path, size))
+
+    for remote_path, info in remote_objects.items():
+        if remote_path in local_paths:
+            continue
+        in_scope = any(remote_path.startswith(prefix) for prefix in prune_prefixes)
+        if prune_filter is not None:
+            in_scope = in_scope or prune_filter(remote_path)
+        if in_scope:
+            plan['prune'].append((None, remote_path, info.get('size') or 0))
+
+    return plan
+
+
+def transfer_totals(plan):
+    """실제로 전송할 파일 수와 바이트 (add + change)"""
+    entries = plan['add'] + plan['change']
+    return len(entries), sum(size for _, _, size in entries)
+
+
+def estimate_seconds(files, total_bytes, throughput):
+    """
+    측정된 처리량으로 예상 소요 시간 계산
+
+    작은 파일이 많으면 파일당 왕복 시간이, 큰 파일이 많으면 대역폭이
+    병목이므로 두 추정치 중 큰 값을 사용한다.
+    """
+    if not throughput or not files:
+        return None
+    by_bytes = total_bytes / throughput['bytes_per_second'] if throughput['bytes_per_second'] else 0
+    by_files = files / throughput['files_per_second'] if throughput['files_per_second'] else 0
+    return max(by_bytes, by_files)
+
+
+def print_plan(plan, script, show_files=True):
+    """계획 출력 (폴더별 바이트 합계, 예상 소요 시간 포함)"""
+    print("\n📝 업로드 계획 (전송 없음)")
+    print("=" * 80)
+
+    if show_files:
+        for action in ACTIONS:
+            for _, remote_path, size in plan[action]:
+                print(f"  {ACTION_ICONS[action]} {ACTION_NAMES[action]}: {remote_path} ({size / 1024 / 1024:.2f}MB)")
+
+    # 폴더별 합계
+    folders = {}
+    for action in ACTIONS:
+        for _, remote_path, size in plan[action]:
+            folder = posixpath.dirname(remote_path) or '/'
+            totals = folders.setdefault(folder, {a: [0, 0] for a in ACTIONS})
+            totals[action][0] += 1
+            totals[action][1] += size
+
+    print("\n📂 폴더별 합계:")
+    for folder, totals in sorted(folders.items()):
+        parts = [
+            f"{ACTION_NAMES[action]} {count}개/{size / 1024 / 1024:.2f}MB"
+            for action, (count, size) in totals.items() if count
+        ]
+        print(f"   └── {folder}: " + ', '.join(parts))
+
+    print("\n📊 전체:")
+    for action in ACTIONS:
+        count = len(plan[action])
+        size = sum(s for _, _, s in plan[action])
+        print(f"   {ACTION_ICONS[action]} {ACTION_NAMES[action]}: {count}개 ({size / 1024 / 1024:.2f}MB)")
+
+    files, total_bytes = transfer_totals(plan)
+    conn = open_journal()
+    try:
+        throughput = estimate_throughput(conn, script)
+    finally:
+        conn.close()
+    seconds = estimate_seconds(files, total_bytes, throughput)
+    if seconds is None:
+        if files:
+            print("\n⏱️  예상 소요 시간: 측정 기록 없음 (한 번 업로드하면 다음부터 추정)")
+    else:
+        print(f"\n⏱️  예상 소요 시간: {seconds:.0f}s "
+              f"({throughput['bytes_per_second'] / 1024 / 1024:.2f}MB/s, "
+              f"{throughput['files_per_second']:.1f}개/s, 최근 {throughput['runs']}회 측정 기준)")
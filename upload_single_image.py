@@ -6,7 +6,13 @@
 import firebase_admin
 from firebase_admin import credentials, storage
 import os
+import time
 import argparse
+from upload_engine import (DEFAULT_WORKERS, DEFAULT_CHUNK_SIZE, COMPOSITE_THRESHOLD, DEFAULT_PARTS,
+                           upload_files, print_upload_summary)
+from bucket_index import load_objects
+from upload_journal import record_throughput
+from upload_plan import build_plan, print_plan
 
 def initialize_firebase():
     """Firebase 초기화"""
@@ -26,49 +32,103 @@ def upload_image(local_path, storage_path):
         local_path: 로컬 이미지 파일 경로
         storage_path: Firebase Storage에 저장될 경로
     """
+    urls = upload_images([(local_path, storage_path)])
+    return urls[0]
+
+def upload_images(jobs, workers=DEFAULT_WORKERS, chunk_size=DEFAULT_CHUNK_SIZE,
+                  composite_threshold=COMPOSITE_THRESHOLD, composite_parts=DEFAULT_PARTS):
+    """
+    여러 이미지를 Firebase Storage에 병렬 업로드
+    
+    Args:
+        jobs: (로컬 경로, Storage 경로) 튜플 리스트
+        workers: 동시 업로드 수
+        chunk_size: 큰 파일의 resumable 업로드 청크 크기
+        composite_threshold: 이 크기 이상이면 구간 병렬 업로드 후 서버에서 합치기
+        composite_parts: composite 업로드 분할 수
+    
+    Returns:
+        jobs 순서와 같은 순서의 공개 URL 리스트 (실패 시 None)
+    """
     try:
         bucket = initialize_firebase()
-        
-        print(f"📤 업로드 시작: {local_path} -> {storage_path}")
-        
-        # 파일을 Firebase Storage에 업로드
-        blob = bucket.blob(storage_path)
-        blob.upload_from_filename(local_path)
-        
-        # 공개 URL 생성
-        blob.make_public()
-        public_url = blob.public_url
-        
-        print(f"✅ 업로드 완료!")
-        print(f"📍 Storage 경로: {storage_path}")
-        print(f"🌐 공개 URL: {public_url}")
-        
-        return public_url
-        
     except Exception as e:
         print(f"❌ 업로드 실패: {e}")
-        return None
+        return [None] * len(jobs)
+    
+    for local_path, storage_path in jobs:
+        print(f"📤 업로드 시작: {local_path} -> {storage_path}")
+    
+    started = time.time()
+    results = upload_files(bucket, jobs, workers=workers, chunk_size=chunk_size,
+                           composite_threshold=composite_threshold,
+                           composite_parts=composite_parts)
+    
+    for result in results:
+        if result['url']:
+            print(f"📍 Storage 경로: {result['remote_path']}")
+            print(f"🌐 공개 URL: {result['url']}")
+    
+    wall_time = time.time() - started
+    if len(results) > 1:
+        print_upload_summary(results, wall_time)
+    record_throughput('upload_single_image', results, wall_time)
+    
+    return [result['url'] for result in results]
+
+def plan_images(jobs):
+    """업로드하지 않고 계획만 출력"""
+    bucket = initialize_firebase()
+    remote_objects = {}
+    for _, storage_path in jobs:
+        # 대상 경로 하나만 조회 (prefix = 정확한 객체 이름)
+        remote_objects.update(load_objects(bucket, storage_path))
+    print_plan(build_plan(jobs, remote_objects), 'upload_single_image')
 
 def main():
     parser = argparse.ArgumentParser(description='단일 이미지 Firebase Storage 업로드')
-    parser.add_argument('input', help='업로드할 이미지 파일 경로')
-    parser.add_argument('-p', '--path', help='Firebase Storage 경로 (기본값: backgrounds/파일명)')
+    parser.add_argument('input', nargs='+', help='업로드할 이미지 파일 경로 (여러 개 가능)')
+    parser.add_argument('-p', '--path', help='Firebase Storage 경로 (기본값: backgrounds/파일명, 파일 하나일 때만 사용)')
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'동시 업로드 수 (기본값: {DEFAULT_WORKERS})')
+    parser.add_argument('--chunk-size', type=float, default=DEFAULT_CHUNK_SIZE / 1024 / 1024,
+                        help=f'큰 파일 청크 업로드 크기 MB (기본값: {DEFAULT_CHUNK_SIZE // 1024 // 1024})')
+    parser.add_argument('--parts', type=int, default=DEFAULT_PARTS,
+                        help=f'큰 파일 병렬 composite 업로드 분할 수 (기본값: {DEFAULT_PARTS}, 최대 32)')
+    parser.add_argument('--composite-threshold', type=float, default=COMPOSITE_THRESHOLD / 1024 / 1024,
+                        help=f'composite 업로드를 쓰는 최소 크기 MB (기본값: {COMPOSITE_THRESHOLD // 1024 // 1024}, 0이면 사용 안 함)')
+    parser.add_argument('--plan', action='store_true',
+                        help='전송 없이 추가/변경 대상과 예상 소요 시간만 출력')
     
     args = parser.parse_args()
     
-    if not os.path.exists(args.input):
-        print(f"❌ 입력 파일을 찾을 수 없습니다: {args.input}")
+    if args.path and len(args.input) > 1:
+        print("❌ --path는 파일 하나를 업로드할 때만 사용할 수 있습니다.")
         return
     
-    # Storage 경로 설정
-    if args.path:
-        storage_path = args.path
-    else:
-        filename = os.path.basename(args.input)
-        storage_path = f"backgrounds/{filename}"
+    jobs = []
+    for input_path in args.input:
+        if not os.path.exists(input_path):
+            print(f"❌ 입력 파일을 찾을 수 없습니다: {input_path}")
+            return
+        
+        # Storage 경로 설정
+        if args.path:
+            storage_path = args.path
+        else:
+            filename = os.path.basename(input_path)
+            storage_path = f"backgrounds/{filename}"
+        jobs.append((input_path, storage_path))
+    
+    if args.plan:
+        plan_images(jobs)
+        return
     
     # 업로드 실행
-    upload_image(args.input, storage_path)
+    upload_images(jobs, workers=args.workers,
+                  chunk_size=int(args.chunk_size * 1024 * 1024),
+                  composite_threshold=int(args.composite_threshold * 1024 * 1024),
+                  composite_parts=args.parts)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main() 
@@ -12,15 +12,27 @@ assets/images/
 사용법:
 1. assets/images/ 하위 폴더에 이미지 추가
 2. python upload_structured_images.py
-3. 출력된 코드를 image_service.dart에 복사
+3. 생성된 lib/constants/storage_images.dart를 함께 커밋 (앱이 URL을 바로 찾음)
 """
 
 import os
 import sys
+import time
+import argparse
 from pathlib import Path
 import firebase_admin
 from firebase_admin import credentials, storage
-import json
+from upload_engine import (DEFAULT_WORKERS, DEFAULT_CHUNK_SIZE, upload_files, print_result,
+                           print_upload_summary)
+from upload_journal import (open_journal, start_run, finish_run, plan_jobs, set_state,
+                            record_result, write_manifest, record_throughput)
+from upload_plan import build_plan, print_plan
+from bucket_index import DEFAULT_MAX_AGE, load_objects, record_results
+from storage_sync import plan_sync, print_sync_summary
+from asset_manifest import (STRUCTURED_CONFIG_PATH, print_update, rewrite_fingerprinted_urls,
+                            update_manifests)
+from dart_image_constants import write_dart_constants
+from fingerprint import fingerprint_path, logical_name
 
 # Firebase Admin SDK 초기화
 def init_firebase():
@@ -44,16 +56,15 @@ def init_firebase():
     
     return storage.bucket()
 
-def get_existing_images(bucket):
+def get_existing_images(remote_objects):
     """Firebase Storage에 이미 있는 이미지 목록 가져오기 (폴더 구조 포함)"""
     existing = {}
     
-    # 모든 블롭을 스캔
-    blobs = bucket.list_blobs()
-    for blob in blobs:
-        if blob.name.startswith('images/'):
+    # images/ 아래 블롭 목록을 폴더별로 정리
+    for name in remote_objects:
+        if name.startswith('images/'):
             # 폴더 구조 파싱: images/backgrounds/login_bg.png
-            parts = blob.name.split('/')
+            parts = name.split('/')
             if len(parts) >= 3:
                 folder = parts[1]  # backgrounds, icons, ui 등
                 filename = parts[2].split('.')[0]  # 확장자 제거
@@ -64,19 +75,6 @@ def get_existing_images(bucket):
     
     return existing
 
-def upload_image(bucket, local_path, remote_path):
-    """이미지를 Firebase Storage에 업로드"""
-    try:
-        blob = bucket.blob(remote_path)
-        blob.upload_from_filename(local_path)
-        blob.make_public()
-        
-        print(f"✅ 업로드: {local_path.name} -> {remote_path}")
-        return blob.public_url
-    except Exception as e:
-        print(f"❌ 업로드 실패 {local_path}: {e}")
-        return None
-
 def scan_structured_images():
     """폴더 구조를 스캔해서 이미지 목록 반환"""
     images_dir = Path("assets/images")
@@ -85,7 +83,7 @@ def scan_structured_images():
         return {}
     
     # 지원하는 이미지 확장자
-    extensions = ['.png', '.jpg', '.jpeg', '.gif', '.webp']
+    extensions = ['.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif']
     structured_images = {}
     
     # 하위 폴더들 스캔
@@ -101,46 +99,32 @@ def scan_structured_images():
     
     return structured_images
 
-def generate_dart_code(all_urls_by_folder):
-    """폴더별로 정리된 Dart 코드 생성"""
-    print("\n🔧 image_service.dart 업데이트용 코드:")
-    print("=" * 80)
-    print("static const Map<String, String> _imageUrls = {")
-    
-    # 폴더별로 정리해서 출력
-    for folder, urls in sorted(all_urls_by_folder.items()):
-        print(f"  // {folder} 폴더")
-        for name, url in sorted(urls.items()):
-            print(f"  '{name}': '{url}',")
-        print()
-    
-    print("};")
-    
-    # 폴더별 헬퍼 메서드도 생성
-    print("\n// 폴더별 헬퍼 메서드 (선택사항)")
-    print("=" * 50)
-    for folder in sorted(all_urls_by_folder.keys()):
-        method_name = f"get{folder.capitalize()}ImageUrl"
-        print(f"static Future<String> {method_name}(String imageName) async {{")
-        print(f"  return getImageUrl(imageName);")
-        print(f"}}")
-        print()
-
-def save_structured_config(all_urls_by_folder):
-    """폴더 구조를 유지한 설정 저장"""
-    config_path = Path("structured_image_urls.json")
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(all_urls_by_folder, f, indent=2, ensure_ascii=False)
-    print(f"\n💾 구조화된 설정 저장됨: {config_path}")
+CONFIG_PATH = Path("structured_image_urls.json")
 
 def main():
+    parser = argparse.ArgumentParser(description='구조화된 이미지 Firebase Storage 업로드')
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'동시 업로드 수 (기본값: {DEFAULT_WORKERS})')
+    parser.add_argument('--chunk-size', type=float, default=DEFAULT_CHUNK_SIZE / 1024 / 1024,
+                        help=f'큰 파일 청크 업로드 크기 MB (기본값: {DEFAULT_CHUNK_SIZE // 1024 // 1024})')
+    parser.add_argument('--force', action='store_true',
+                        help='해시가 같은 파일도 모두 다시 업로드')
+    parser.add_argument('--refresh', action='store_true',
+                        help=f'로컬 버킷 인덱스를 무조건 갱신 (기본: {DEFAULT_MAX_AGE}초 지나면 갱신)')
+    parser.add_argument('--plan', action='store_true',
+                        help='전송 없이 추가/변경/정리 대상과 예상 소요 시간만 출력')
+    parser.add_argument('--fingerprint', action='store_true',
+                        help='이름에 내용 해시를 넣어 새 객체로 업로드 (1년 immutable 캐시, 예전 객체는 storage_admin.py gc)')
+    args = parser.parse_args()
+
     print("🚀 구조화된 이미지 업로드 시작")
     
     # Firebase 초기화
     bucket = init_firebase()
     
-    # 기존 이미지 확인
-    existing_images = get_existing_images(bucket)
+    # 기존 이미지 확인 (크기, 해시 포함)
+    remote_objects = load_objects(bucket, 'images/', max_age=0 if args.refresh else DEFAULT_MAX_AGE)
+    existing_images = get_existing_images(remote_objects)
     total_existing = sum(len(images) for images in existing_images.values())
     print(f"📦 기존 이미지: {total_existing}개")
     for folder, images in existing_images.items():
@@ -157,15 +141,15 @@ def main():
         print("❌ 업로드할 이미지가 없습니다.")
         return
     
-    all_urls_by_folder = {}
     new_uploads_by_folder = {}
     total_size = 0
+    jobs = []
+    job_info = []
     
-    # 폴더별로 처리
+    # 폴더별로 업로드 목록 작성
     for folder_name, image_paths in structured_images.items():
         print(f"\n📂 {folder_name} 폴더 처리 중...")
         
-        all_urls_by_folder[folder_name] = {}
         new_uploads_by_folder[folder_name] = []
         
         for image_path in image_paths:
@@ -179,18 +163,94 @@ def main():
             # 새 이미지인지 확인
             existing_in_folder = existing_images.get(folder_name, set())
             is_new = image_name not in existing_in_folder
-            status = "🆕 새 이미지" if is_new else "🔄 업데이트"
-            
-            print(f"  {status}: {image_path.name} ({file_size / 1024 / 1024:.2f}MB)")
             
             # 업로드 (폴더 구조 유지)
             remote_path = f"images/{folder_name}/{image_path.name}"
-            url = upload_image(bucket, image_path, remote_path)
-            
-            if url:
-                all_urls_by_folder[folder_name][image_name] = url
-                if is_new:
-                    new_uploads_by_folder[folder_name].append(image_name)
+            if args.fingerprint:
+                remote_path = fingerprint_path(remote_path, image_path)
+            jobs.append((image_path, remote_path))
+            job_info.append((folder_name, image_name, is_new))
+    
+    if args.plan:
+        plan = build_plan(jobs, remote_objects, force=args.force,
+                          prune_prefixes=[f"images/{folder}/" for folder in structured_images])
+        print_plan(plan, 'upload_structured_images')
+        return
+    
+    # 저널: 이전 실행이 중간에 멈췄으면 끝난 파일은 건너뛰고 이어서 진행
+    journal = open_journal()
+    run_id, resumed = start_run(journal, 'upload_structured_images')
+    pending = plan_jobs(journal, run_id, [
+        (image_path, remote_path, folder_name, image_name)
+        for (image_path, remote_path), (folder_name, image_name, _) in zip(jobs, job_info)
+    ])
+    pending_paths = {remote_path for _, remote_path, _, _ in pending}
+    if resumed:
+        print(f"\n↪️  이전 실행 #{run_id} 이어서 진행: {len(jobs) - len(pending)}개 이미 완료")
+    
+    # 해시가 같은 파일은 건너뛰기
+    to_upload, skipped = plan_sync([(local_path, remote_path) for local_path, remote_path, _, _ in pending],
+                                   remote_objects, force=args.force)
+    skipped_paths = {remote_path for _, remote_path in skipped}
+    for (image_path, remote_path), (folder_name, image_name, is_new) in zip(jobs, job_info):
+        if remote_path not in pending_paths:
+            status = "✔️  이미 완료"
+        elif is_new:
+            status = "🆕 새 이미지"
+        elif remote_path in skipped_paths:
+            status = "⏭️  변경 없음"
+        else:
+            status = "🔄 업데이트"
+        print(f"  {status}: {folder_name}/{image_path.name} ({image_path.stat().st_size / 1024 / 1024:.2f}MB)")
+    print_sync_summary(to_upload, skipped)
+    
+    # 변경 없는 파일은 바로 published (URL만 기록)
+    for _, remote_path in skipped:
+        set_state(journal, run_id, [remote_path], 'published', url=bucket.blob(remote_path).public_url)
+    write_manifest(journal, run_id, CONFIG_PATH)
+    
+    # 파일 하나가 끝날 때마다 저널과 설정 파일에 반영
+    def on_result(result):
+        print_result(result)
+        record_result(journal, run_id, result)
+        if result['error'] is None:
+            write_manifest(journal, run_id, CONFIG_PATH)
+    
+    # 병렬 업로드
+    set_state(journal, run_id, [remote_path for _, remote_path in to_upload], 'uploading')
+    print(f"\n📤 {len(to_upload)}개 파일 업로드 중 (동시 {args.workers}개)...")
+    started = time.time()
+    results = upload_files(bucket, to_upload, workers=args.workers,
+                           chunk_size=int(args.chunk_size * 1024 * 1024),
+                           remote_objects=remote_objects, on_result=on_result)
+    wall_time = time.time() - started
+    print_upload_summary(results, wall_time)
+    record_throughput('upload_structured_images', results, wall_time)
+    record_results(results)
+    
+    all_urls_by_folder = write_manifest(journal, run_id, CONFIG_PATH)
+    failed = [result for result in results if result['error'] is not None]
+    if failed:
+        print(f"\n⚠️  실패 {len(failed)}개: 다시 실행하면 실패한 파일만 이어서 업로드합니다.")
+    else:
+        finish_run(journal, run_id)
+    journal.close()
+    
+    # 갱신된 인덱스로 상세 manifest(바뀐 그룹만), Dart 상수 다시 만들기
+    # structured_image_urls.json은 위의 실행 기록(journal)이 유일하게 쓴다 (이어서 업로드할 때 기준)
+    print("\n📋 manifest 갱신 중...")
+    if args.fingerprint:
+        published = [remote_path for _, remote_path in skipped]
+        published += [result['remote_path'] for result in results if result['error'] is None]
+        for path, count in rewrite_fingerprinted_urls(
+                {logical_name(remote_path): remote_path for remote_path in published}).items():
+            print(f"🔗 {path}: URL {count}개를 해시 객체로 교체")
+    print_update(update_manifests(bucket.name, skip_configs=(STRUCTURED_CONFIG_PATH,)))
+    write_dart_constants(bucket.name)
+    
+    for folder_name, image_name, is_new in job_info:
+        if is_new and image_name in all_urls_by_folder.get(folder_name, {}):
+            new_uploads_by_folder[folder_name].append(image_name)
     
     # 결과 출력
     total_new = sum(len(new_list) for new_list in new_uploads_by_folder.values())
@@ -208,16 +268,12 @@ def main():
             for name in new_images:
                 print(f"  - {name}")
     
-    # Dart 코드 생성
-    generate_dart_code(all_urls_by_folder)
-    
-    # 설정 저장
-    save_structured_config(all_urls_by_folder)
+    print(f"\n💾 구조화된 설정 저장됨: {CONFIG_PATH}")
     
     print(f"\n📝 사용법:")
-    print(f"1. 위의 코드를 lib/services/image_service.dart의 _imageUrls에 복사")
+    print(f"1. 생성된 lib/constants/storage_images.dart를 함께 커밋")
     print(f"2. 코드에서 사용: ImageService.getImageUrl('login_bg')")
-    print(f"3. 또는 폴더별 메서드: getBackgroundsImageUrl('login_bg')")
+    print(f"3. 또는 폴더별 상수: StorageImages.folders['images/backgrounds']?['login_bg']")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file